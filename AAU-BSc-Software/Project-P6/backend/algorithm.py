@@ -1,68 +1,135 @@
 import math
+import time
+import numpy as np
 import shapely
 import datetime
 from shapely.geometry import Polygon
 from shapely.affinity import rotate
 from shapely import ops
-from geo_utils import create_local_projection, calculate_grid_size
+from geo_utils import create_area_projection, calculate_grid_size
+from local_search import improve_tour, PointDistances
+from distance_matrix import build_distance_matrix, local_distance_matrix, find_nearest_index, nearest_neighbor_tour
+from tsp_pool import multi_start_tour
+from flight_time import get_flight_time_model, DEFAULT_ALTITUDE
+from sorties import split_sorties
+from no_fly import ZONE_CLEARANCE, get_no_fly_zones, insert_detours
+from plan import Plan
+
+#############################
+# Path Settings
+#############################
+
+PATH_MODES = ("tsp", "sweep", "auto")
+SWEEP_CONVEXITY_THRESHOLD = 0.9 # Polygon area / convex hull area above which "auto" uses the sweep path
 
 #############################
 # Algorithm functionality
 #############################
 
-def grid_based_algorithm(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None):
+def grid_based_algorithm(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None,
+                         time_budget=None, progress_callback=None, starts=1, rotation=0,
+                         orientation_objective="cells", overlap_raster=False, path_mode="tsp", cost_model=None,
+                         sortie_time_budget=None, holes=None, exclusion_zones=None):
     """
     Main modular function to calculate grid and flight path.
+    time_budget (seconds), progress_callback and starts are passed on to the TSP solver.
+    rotation is the grid heading in degrees, or "auto" to search for the heading that minimizes
+    orientation_objective ("cells" or "tour"). overlap_raster adds the overlapped fraction to every grid.
+    path_mode is "tsp", "sweep" (boustrophedon over the grid rows) or "auto", which sweeps convex
+    fields and solves the TSP otherwise. cost_model (FlightCostModel) makes the TSP minimize flight time.
+    With sortie_time_budget (seconds per battery) the plan also lists the return-to-launch sorties the
+    tour is split into. holes and exclusion_zones are lists of (lat, lon) rings left out of the search;
+    the tour routes around exclusion zones through "detour" waypoints.
     """
+    if path_mode not in PATH_MODES:
+        raise ValueError(f"Unknown path mode '{path_mode}', expected one of {PATH_MODES}")
+
+    if rotation == "auto":
+        # Imported here since the orientation search itself plans grids with this module
+        from orientation import find_best_orientation
+        rotation, _ = find_best_orientation(coordinates, altitude, overlap, coverage, objective=orientation_objective)
 
     # Calculate grid placement
     grid_data, polygon_area, not_searched_area, extra_area = calculate_grid_placement(
-        coordinates, altitude, overlap, coverage
+        coordinates, altitude, overlap, coverage, rotation=rotation, overlap_raster=overlap_raster,
+        holes=holes, exclusion_zones=exclusion_zones
     )
+    # Zones and their visibility graph are cached per site, so replanning the same field reuses them
+    no_fly = get_no_fly_zones(exclusion_zones) if exclusion_zones else None
 
     tsp_start = start_point if start_point else drone_start_point
-    # Find the optimal path through the grids using TSP solver
-    optimized_grid_data, waypoints, path_metrics = optimize_tsp_path(grid_data, tsp_start)
+    if path_mode == "auto":
+        path_mode = "sweep" if polygon_convexity(coordinates) >= SWEEP_CONVEXITY_THRESHOLD else "tsp"
+    if path_mode == "sweep":
+        # Lawnmower path over the grid rows, near-optimal for convex fields
+        optimized_grid_data, waypoints, path_metrics = optimize_sweep_path(grid_data, tsp_start, altitude=altitude)
+    else:
+        # Find the optimal path through the grids using TSP solver
+        optimized_grid_data, waypoints, path_metrics = optimize_tsp_path(
+            grid_data, tsp_start, time_budget=time_budget, progress_callback=progress_callback, starts=starts,
+            cost_model=cost_model, altitude=altitude, no_fly=no_fly
+        )
+    if no_fly is not None:
+        # Fly around the zones on the legs that cross them; the TSP already costs legs by their detours,
+        # the sweep order does not. Without a start_point the drone flies from its launch point and back
+        waypoints = route_around_zones(
+            waypoints, path_metrics, no_fly, None if start_point else drone_start_point, altitude,
+            reprice=path_mode == "sweep"
+        )
 
-    return {
-        "grid_count": len(optimized_grid_data),
-        "grids": [{
-            "center": {"lat": grid["center"][0], "lon": grid["center"][1]},
-            "corners": [{"lat": corner[0], "lon": corner[1]} for corner in grid["corners"]]
-        } for grid in optimized_grid_data],
-        "path": waypoints,
-        "path_metrics": path_metrics,
-        "metadata": {
-            "altitude": altitude,
-            "overlap_percent": overlap,
-            "start_point": start_point,
-            "drone_start_point": drone_start_point,
-            "created_at": datetime.datetime.now().isoformat(),
-            "polygon_area": polygon_area,
-            "not_searched_area": not_searched_area,
-            "extra_area": extra_area,
-        }
-    }
+    plan = format_plan(optimized_grid_data, waypoints, path_metrics, {
+        "altitude": altitude,
+        "overlap_percent": overlap,
+        "rotation": rotation,
+        "path_mode": path_mode,
+        "start_point": start_point,
+        "drone_start_point": drone_start_point,
+        "created_at": datetime.datetime.now().isoformat(),
+        "polygon_area": polygon_area,
+        "not_searched_area": not_searched_area,
+        "extra_area": extra_area,
+    })
+    if sortie_time_budget is not None:
+        # Cut the tour into battery-sized sorties that take off and land at the drone
+        plan["sorties"] = split_sorties(
+            waypoints, drone_start_point if drone_start_point else start_point, sortie_time_budget, altitude,
+            no_fly=no_fly
+        )
+    return plan
+
+def format_plan(optimized_grid_data, waypoints, path_metrics, metadata):
+    """
+    Build the plan returned to the frontend: an array-backed Plan that reads like the plan dictionary
+    ({"grid_count", "grids", "path", "path_metrics", "metadata"}) and encodes compactly with to_wire().
+    """
+    return Plan.from_grid_data(optimized_grid_data, waypoints, path_metrics, metadata)
 
 #############################
 # Grid Calculator Functions
 #############################
 
-def calculate_grid_placement(coordinates, altitude, overlap_percent, coverage):
+def calculate_grid_placement(coordinates, altitude, overlap_percent, coverage, rotation=0, overlap_raster=False,
+                             holes=None, exclusion_zones=None):
     """
     Calculate optimal grid placement with improved efficiency.
+    rotation is the drone heading (degrees clockwise from north) the grid rows are aligned with.
+    With overlap_raster, every grid also reports the fraction of its footprint imaged by other grids.
+    holes (e.g. buildings) and exclusion_zones (no-fly areas) are lists of (lat, lon) rings that are not
+    searched; no grid center is placed within ZONE_CLEARANCE of an exclusion zone.
     """
-    # Calculate center of the area to create local projection
-    lats = [coord[0] for coord in coordinates]
-    lons = [coord[1] for coord in coordinates]
-    center_lat = sum(lats) / len(lats)
-    center_lon = sum(lons) / len(lons)
-    # Create local projection
-    to_local, to_wgs84 = create_local_projection(center_lat, center_lon)
-    # Transform geographic coordinates to local projection
-    local_coords = [to_local(lon, lat) for lat, lon in coordinates]
-    # Create polygon from local coordinates
-    polygon = Polygon(local_coords)
+    # Create local projection centered on the area (ellipsoidal for large areas)
+    projection = create_area_projection(coordinates)
+    # Create polygon from local coordinates, each ring projected in one vectorized call
+    polygon = Polygon(
+        project_ring(coordinates, projection), [project_ring(hole, projection) for hole in holes or []]
+    )
+    zones = shapely.get_parts(shapely.union_all(project_rings(exclusion_zones or [], projection)))
+    if rotation:
+        # Work in the grid frame, where the camera footprint is axis-aligned
+        polygon = rotate(polygon, rotation, origin=(0, 0))
+        zones = shapely.transform(zones, lambda points: rotate_points(points, rotation))
+    # The area to search: the polygon without its holes and the no-fly zones (merged, so disjoint)
+    polygon_area = polygon.area - float(shapely.area(shapely.intersection(zones, polygon)).sum())
     # Get bounding box
     minx, miny, maxx, maxy = polygon.bounds
     # Calculate grid size based on altitude
@@ -73,73 +140,210 @@ def calculate_grid_placement(coordinates, altitude, overlap_percent, coverage):
     # Calculate grid numbers
     num_x = math.ceil((maxx - minx) / step_x)
     num_y = math.ceil((maxy - miny) / step_y)
-    # Generate candidate grids
-    candidate_grids = []
+    # Generate all candidate grids as one array and compute their coverage in a single pass
+    centers, corners = generate_candidate_cells(minx, miny, num_x, num_y, step_x, step_y, grid_width, grid_height)
+    cells = shapely.polygons(corners)
+    intersects, intersection_areas, grid_areas = calculate_cell_coverage(polygon, cells)
+    flyable = np.ones(len(cells), dtype=bool)
+    if len(zones):
+        intersection_areas = intersection_areas - calculate_zone_overlap(polygon, zones, cells)
+        flyable = calculate_flyable_cells(zones, centers)
+    cov = intersection_areas / grid_areas
+    # Only include grids with significant coverage
     min_coverage_threshold = coverage
-    for i in range(num_y):
-        for j in range(num_x):
-            center_x = minx + j * step_x + grid_width / 2
-            center_y = miny + i * step_y + grid_height / 2
-            local_corners = [
-                (center_x - grid_width / 2, center_y - grid_height / 2),
-                (center_x + grid_width / 2, center_y - grid_height / 2),
-                (center_x + grid_width / 2, center_y + grid_height / 2),
-                (center_x - grid_width / 2, center_y + grid_height / 2)
-            ]
-            grid_polygon = Polygon(local_corners)
-            # Calculate intersection and coverage
-            if polygon.intersects(grid_polygon):
-                intersection = polygon.intersection(grid_polygon)
-                intersection_area = intersection.area
-                grid_area = grid_polygon.area
-                cov = intersection_area / grid_area
-                # Only include grids with significant coverage
-                if cov >= min_coverage_threshold:
-                    candidate_grids.append({
-                        "center_local": (center_x, center_y),
-                        "corners_local": local_corners,
-                        "grid_polygon": grid_polygon,
-                        "intersection_area": intersection_area,
-                        "coverage": cov
-                    })
-    # Sort candidates by coverage
-    candidate_grids.sort(key=lambda x: x["coverage"], reverse=True)
+    selected = np.flatnonzero(intersects & flyable & (cov >= min_coverage_threshold))
+    # Sort candidates by coverage (stable, so ties keep row-major order)
+    selected = selected[np.argsort(-cov[selected], kind="stable")]
+    if rotation:
+        # Rotate the selected grids back from the grid frame to the local projection
+        centers = centers.copy()
+        corners = corners.copy()
+        centers[selected] = rotate_points(centers[selected], -rotation)
+        corners[selected] = rotate_points(corners[selected], -rotation)
+    # Lattice position of every selected grid, used by the sweep path
+    rows, cols = np.divmod(selected, num_x)
     # Convert selected grids to geographic coordinates
-    grid_data = []
-    for grid in candidate_grids:
-        center_x, center_y = grid["center_local"]
-        geo_center = to_wgs84(center_x, center_y)
-        geo_corners = [to_wgs84(x, y) for x, y in grid["corners_local"]]
-        grid_data.append({
-            "center": (geo_center[1], geo_center[0]),
-            "corners": [(corner[1], corner[0]) for corner in geo_corners],
-            "coverage": grid["coverage"]
-        })
-    polygon_area = polygon.area
+    geo_center_lon, geo_center_lat = projection.to_wgs84(centers[selected, 0], centers[selected, 1])
+    geo_corner_lon, geo_corner_lat = projection.to_wgs84(corners[selected, :, 0], corners[selected, :, 1])
+    grid_data = [{
+        "center": center,
+        "corners": list(zip(corner_lats, corner_lons)),
+        "coverage": grid_coverage,
+        "rotation": rotation,
+        "row": row,
+        "col": col
+    } for center, corner_lats, corner_lons, grid_coverage, row, col in zip(
+        zip(geo_center_lat.tolist(), geo_center_lon.tolist()),
+        geo_corner_lat.tolist(),
+        geo_corner_lon.tolist(),
+        cov[selected].tolist(),
+        rows.tolist(),
+        cols.tolist()
+    )]
+    # Measure the union of the selected grids, so area imaged by overlapping grids is counted once
+    covered_area, extra_area, overlap_area, cell_overlap = calculate_coverage_metrics(
+        polygon, minx, miny, rows, cols, step_x, step_y, grid_width, grid_height, zones=zones
+    )
+    if overlap_raster:
+        for grid, grid_overlap in zip(grid_data, cell_overlap.tolist()):
+            grid["overlap"] = grid_overlap
     # Calculate area not searched (inside polygon but not covered by any grid)
-    covered_area = sum([polygon.intersection(Polygon(grid["corners_local"])).area for grid in candidate_grids])
     not_searched_area = polygon_area - covered_area
-    # Calculate extra area searched (area covered by grids outside the polygon)
-    extra_area = sum([
-        Polygon(grid["corners_local"]).area - polygon.intersection(Polygon(grid["corners_local"])).area
-        for grid in candidate_grids
-    ])
     print(f"Polygon area: {polygon_area:.2f} m^2")
     print(f"Area inside polygon NOT searched: {not_searched_area:.2f} m^2")
     print(f"Extra area searched outside polygon: {extra_area:.2f} m^2")
+    print(f"Area searched more than once: {overlap_area:.2f} m^2")
 
     if not grid_data:
         raise ValueError("No grids could be placed. Please enlarge the area or reduce minimum coverage.")
     return grid_data, polygon_area, not_searched_area, extra_area
 
+def generate_candidate_cells(minx, miny, num_x, num_y, step_x, step_y, grid_width, grid_height):
+    """
+    Build the centers (N x 2) and corners (N x 4 x 2) of every candidate grid in row-major order.
+    """
+    rows, cols = np.divmod(np.arange(num_x * num_y), num_x)
+    return calculate_cell_geometry(minx, miny, rows, cols, step_x, step_y, grid_width, grid_height)
+
+def calculate_cell_geometry(origin_x, origin_y, rows, cols, step_x, step_y, grid_width, grid_height):
+    """
+    Centers (N x 2) and corners (N x 4 x 2) of the lattice cells at the given row and column indices.
+    """
+    center_x = origin_x + cols * step_x + grid_width / 2
+    center_y = origin_y + rows * step_y + grid_height / 2
+    corners = np.empty((len(center_x), 4, 2))
+    corners[:, [0, 3], 0] = (center_x - grid_width / 2)[:, None]
+    corners[:, [1, 2], 0] = (center_x + grid_width / 2)[:, None]
+    corners[:, [0, 1], 1] = (center_y - grid_height / 2)[:, None]
+    corners[:, [2, 3], 1] = (center_y + grid_height / 2)[:, None]
+    return np.column_stack((center_x, center_y)), corners
+
+def project_ring(ring, projection):
+    """
+    Project a ring of (lat, lon) vertices into an (N, 2) array of local x/y.
+    """
+    return projection.local_coords(np.asarray(ring, dtype=float).reshape(-1, 2)[:, ::-1])
+
+def project_rings(rings, projection):
+    """
+    Project (lat, lon) rings into local polygons with one call to the projection.
+    """
+    if not rings:
+        return np.empty(0, dtype=object)
+    points = project_ring([point for ring in rings for point in ring], projection)
+    indices = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+    return shapely.polygons(shapely.linearrings(points, indices=indices))
+
+def rotate_points(points, angle):
+    """
+    Rotate an (..., 2) array of local coordinates counter-clockwise by angle degrees around the origin.
+    """
+    theta = math.radians(angle)
+    cos_t, sin_t = math.cos(theta), math.sin(theta)
+    x, y = points[..., 0], points[..., 1]
+    return np.stack((x * cos_t - y * sin_t, x * sin_t + y * cos_t), axis=-1)
+
+def calculate_cell_coverage(polygon, cells):
+    """
+    Return the intersects mask, the intersection area with the polygon and the area of every cell.
+    Cells that do not touch the polygon get an intersection area of 0.
+    """
+    shapely.prepare(polygon)
+    grid_areas = shapely.area(cells)
+    intersects = shapely.intersects(polygon, cells)
+    intersection_areas = np.zeros(len(cells))
+    intersection_areas[intersects] = shapely.area(shapely.intersection(polygon, cells[intersects]))
+    return intersects, intersection_areas, grid_areas
+
+def calculate_zone_overlap(polygon, zones, cells):
+    """
+    Area of every cell that lies inside both the polygon and a no-fly zone.
+    The zones are clipped to the polygon once and held in an STRtree, so each cell is only intersected
+    with the zones next to it and the cost per cell does not grow with the number of zones.
+    """
+    clipped = shapely.intersection(zones, polygon)
+    clipped = clipped[shapely.area(clipped) > 0]
+    overlap = np.zeros(len(cells))
+    if not len(clipped):
+        return overlap
+    cell_idx, zone_idx = shapely.STRtree(clipped).query(cells, predicate="intersects")
+    areas = shapely.area(shapely.intersection(cells[cell_idx], clipped[zone_idx]))
+    # Merged zones are disjoint, so the areas per cell simply add up
+    np.add.at(overlap, cell_idx, areas)
+    return overlap
+
+def calculate_flyable_cells(zones, centers):
+    """
+    Mask of cells whose center (where the drone hovers) is at least ZONE_CLEARANCE from every zone.
+    """
+    hits = shapely.STRtree(zones).query(shapely.points(centers), predicate="dwithin", distance=ZONE_CLEARANCE)
+    flyable = np.ones(len(centers), dtype=bool)
+    flyable[hits[0]] = False
+    return flyable
+
+def calculate_coverage_metrics(polygon, origin_x, origin_y, rows, cols, step_x, step_y, grid_width, grid_height,
+                               zones=None):
+    """
+    Covered area, extra area and per-cell overlap of the selected lattice cells, from a single union.
+
+    The cell edges split the plane into a raster of blocks; a 2D prefix sum gives how many cells image
+    every block. Covered blocks are merged into one rectangle per run along each raster row, and those
+    disjoint rectangles (the union of the cells) are intersected with the polygon once, so overlapping
+    cells are not counted twice. Returns (covered_area, extra_area, overlap_area, cell_overlap), where
+    cell_overlap is the fraction of each cell that is also imaged by another selected cell.
+    Area inside the no-fly zones is not counted as covered.
+    """
+    cell_x = cols * step_x
+    cell_y = rows * step_y
+    xs = np.unique(np.concatenate((cell_x, cell_x + grid_width)))
+    ys = np.unique(np.concatenate((cell_y, cell_y + grid_height)))
+    x0, x1 = np.searchsorted(xs, cell_x), np.searchsorted(xs, cell_x + grid_width)
+    y0, y1 = np.searchsorted(ys, cell_y), np.searchsorted(ys, cell_y + grid_height)
+    # Number of cells covering every raster block
+    counts = np.zeros((len(ys), len(xs)), dtype=np.int64)
+    np.add.at(counts, (y0, x0), 1)
+    np.add.at(counts, (y0, x1), -1)
+    np.add.at(counts, (y1, x0), -1)
+    np.add.at(counts, (y1, x1), 1)
+    counts = counts.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+    block_areas = np.diff(ys)[:, None] * np.diff(xs)[None, :]
+    union_area = float(block_areas[counts > 0].sum())
+    overlap_area = float(((counts - 1).clip(min=0) * block_areas).sum())
+    # Area of every cell imaged more than once, from a 2D prefix sum over the raster
+    overlapped = np.zeros((len(ys), len(xs)))
+    overlapped[1:, 1:] = (block_areas * (counts > 1)).cumsum(axis=0).cumsum(axis=1)
+    cell_overlap = (
+        overlapped[y1, x1] - overlapped[y0, x1] - overlapped[y1, x0] + overlapped[y0, x0]
+    ) / (grid_width * grid_height)
+    # Disjoint rectangles making up the union: one per run of covered blocks in a raster row
+    covered = np.pad(counts > 0, ((0, 0), (1, 1)))
+    band, run_start = np.nonzero(np.diff(covered.astype(np.int8), axis=1) == 1)
+    _, run_end = np.nonzero(np.diff(covered.astype(np.int8), axis=1) == -1)
+    runs = shapely.box(origin_x + xs[run_start], origin_y + ys[band], origin_x + xs[run_end], origin_y + ys[band + 1])
+    shapely.prepare(polygon)
+    covered_area = float(shapely.area(shapely.intersection(polygon, runs)).sum())
+    if zones is not None and len(zones):
+        covered_area -= float(calculate_zone_overlap(polygon, zones, runs).sum())
+    return covered_area, union_area - covered_area, overlap_area, cell_overlap
+
 #############################
 # Path Optimizer Functions
 #############################
 
-def optimize_tsp_path(grid_data, start_point=None):
+def optimize_tsp_path(grid_data, start_point=None, distance_method="local", time_budget=None, progress_callback=None,
+                      starts=1, cost_model=None, altitude=None, no_fly=None):
     """
-    Enhanced TSP solver using nearest neighbor + Lin-Kernighan improvement.
+    Enhanced TSP solver using nearest neighbor + 2-opt/Or-opt local search improvement.
+    distance_method selects local projection ("local") or great-circle ("haversine") distances.
+    With a time_budget (seconds) the solver keeps improving until the budget is spent and returns the
+    best tour found so far. progress_callback receives intermediate metrics every time the tour improves.
+    With starts > 1, that many randomized constructions are solved in the shared process pool and the
+    shortest tour is kept. With a cost_model (FlightCostModel) the tour minimizes flight time instead
+    of distance, and path_metrics also reports the modelled travel_time. altitude (meters) is used for
+    the estimated flight time. With no_fly (NoFlyZones) legs crossing a zone cost their detour.
     """
+    started = time.perf_counter()
+    deadline = started + time_budget if time_budget is not None else None
     if len(grid_data) == 1:
         # Only one grid, return it as the only waypoint
         grid = grid_data[0]
@@ -154,56 +358,151 @@ def optimize_tsp_path(grid_data, start_point=None):
         path_metrics = {
             "total_distance": 0,
             "grid_count": 1,
-            "estimated_flight_time": 0
+            "estimated_flight_time": get_flight_time_model().estimate(
+                0, 1, altitude if altitude is not None else DEFAULT_ALTITUDE
+            )
         }
         return grid_data, waypoints, path_metrics
     if len(grid_data) == 0:
         return grid_data, [], {}
     centers = [grid["center"] for grid in grid_data]
-    n = len(centers)
-    # Create distance matrix
-    distances = [[0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                lat1, lon1 = centers[i]
-                lat2, lon2 = centers[j]
-                lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-                dlon = lon2 - lon1
-                dlat = lat2 - lat1
-                a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-                c = 2 * math.asin(math.sqrt(a))
-                distances[i][j] = 6371000 * c
+    if cost_model is not None:
+        # Leg times from the flight cost model replace distances in the optimizer
+        points = project_centers(centers)
+        photo_heading = grid_data[0].get("rotation", 0)
+        distances = cost_model.edge_costs(points, photo_heading)
+        cost_name = "travel_time"
+        if no_fly is not None:
+            # Detours add their extra length at cruise speed to the modelled leg time
+            straight = local_distance_matrix(points)
+            routed = no_fly.routed_distances(centers, straight)
+            distances = distances + (routed - straight) / cost_model.cruise_speed
+    else:
+        # Create distance matrix
+        distances = build_distance_matrix(centers, method=distance_method)
+        if no_fly is not None:
+            distances = no_fly.routed_distances(centers, distances)
+        cost_name = "total_distance"
     # Find start index
     start_idx = 0
     if start_point:
-        min_dist = float('inf')
-        for i, center in enumerate(centers):
-            lat1, lon1 = start_point
-            lat2, lon2 = center
-            lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            c = 2 * math.asin(math.sqrt(a))
-            distance = 6371000 * c
-            if distance < min_dist:
-                min_dist = distance
-                start_idx = i
-    # Generate initial solution
-    current = start_idx
-    unvisited = set(range(n))
-    unvisited.remove(current)
-    tour = [current]
-    while unvisited:
-        next_idx = min(unvisited, key=lambda x: distances[current][x])
-        tour.append(next_idx)
-        unvisited.remove(next_idx)
-        current = next_idx
-    # Improve solution
-    improved_tour = improve_solution_with_lk(centers, tour, distances)
-    # Create output
-    optimized_grid_data = [grid_data[i] for i in improved_tour]
+        start_idx = find_nearest_index(centers, start_point, method=distance_method)
+    on_improve = None
+    if progress_callback:
+        def on_improve(tour_length, iteration):
+            progress_callback({
+                cost_name: tour_length,
+                "grid_count": len(grid_data),
+                "iteration": iteration,
+                "elapsed": time.perf_counter() - started
+            })
+    if starts > 1:
+        # Construct and improve several tours in parallel, keeping the shortest
+        improved_tour = multi_start_tour(distances, start_idx, starts=starts, deadline=deadline, on_result=on_improve)
+    else:
+        # Generate initial solution
+        tour = nearest_neighbor_tour(distances, start_idx)
+        # Improve solution
+        improved_tour = improve_tour(tour, distances, deadline=deadline, on_improve=on_improve)
+    if cost_model is None:
+        # Create output
+        return build_tour_output(grid_data, improved_tour, distances, start_point, altitude)
+    optimized_grid_data, waypoints, path_metrics = build_tour_output(
+        grid_data, improved_tour, routed if no_fly is not None else PointDistances(points), start_point, altitude
+    )
+    grid_waypoints = [waypoint for waypoint in waypoints if waypoint["type"] == "grid_center"]
+    for waypoint, heading in zip(grid_waypoints, cost_model.photo_headings(points, improved_tour, photo_heading)):
+        waypoint["rotation"] = heading
+    path_metrics["travel_time"] = (
+        calculate_tour_distance(improved_tour, distances) + cost_model.photo_hold * len(improved_tour)
+    )
+    return optimized_grid_data, waypoints, path_metrics
+
+def path_length(waypoints, no_fly):
+    """
+    Length (meters) of the legs between consecutive waypoints, measured in the no-fly zones' projection.
+    """
+    points = no_fly.project([(waypoint["lat"], waypoint["lon"]) for waypoint in waypoints])
+    delta = np.diff(points, axis=0)
+    return float(np.hypot(delta[:, 0], delta[:, 1]).sum())
+
+def route_around_zones(waypoints, path_metrics, no_fly, launch_point=None, altitude=None, reprice=False):
+    """
+    Insert the detours around the no-fly zones into a tour (see insert_detours) and count them in
+    path_metrics. With reprice, the distance and flight time grow by the length the detours add, for
+    tours that were not costed with routed distances. Returns the routed waypoints.
+    """
+    routed = insert_detours(waypoints, no_fly, launch_point)
+    path_metrics["detour_count"] = sum(1 for waypoint in routed if waypoint["type"] == "detour")
+    if reprice and path_metrics["detour_count"]:
+        launch = [{"lat": launch_point[0], "lon": launch_point[1]}] if launch_point else []
+        path_metrics["total_distance"] += (
+            path_length(launch + routed + launch, no_fly) - path_length(launch + waypoints + launch, no_fly)
+        )
+        path_metrics["estimated_flight_time"] = get_flight_time_model().estimate(
+            path_metrics["total_distance"], path_metrics["grid_count"],
+            altitude if altitude is not None else DEFAULT_ALTITUDE
+        )
+    return routed
+
+def project_centers(centers):
+    """
+    Project (lat, lon) centers into local x/y meters around their mean.
+    """
+    return project_ring(centers, create_area_projection(centers))
+
+def optimize_sweep_path(grid_data, start_point=None, altitude=None):
+    """
+    Boustrophedon (lawnmower) path: visit the grid rows (or columns) in order, alternating direction on
+    every line. Needs the row/col lattice position of every grid and only sorts them, so it runs in
+    O(n log n). Sweeping along rows and along columns, from each of the four corners, are all tried and
+    the variant with the shortest flight, including the legs to and from start_point, is kept.
+    """
+    if len(grid_data) <= 1:
+        return optimize_tsp_path(grid_data, start_point, altitude=altitude)
+    centers = np.array([grid["center"] for grid in grid_data], dtype=float)
+    projection = create_area_projection(centers)
+    distances = PointDistances(project_ring(centers, projection))
+    rows = np.array([grid["row"] for grid in grid_data])
+    cols = np.array([grid["col"] for grid in grid_data])
+    local_start = project_ring([start_point], projection)[0] if start_point else None
+    best_tour, best_cost = None, float("inf")
+    for lines, positions in ((rows, cols), (cols, rows)):
+        for descending in (False, True):
+            for reversed_first in (False, True):
+                tour = sweep_order(lines, positions, descending, reversed_first)
+                cost = distances.tour_length(tour)
+                if local_start is not None:
+                    ends = distances.points[[tour[0], tour[-1]]] - local_start
+                    cost += float(np.hypot(ends[:, 0], ends[:, 1]).sum())
+                if cost < best_cost:
+                    best_tour, best_cost = tour, cost
+    return build_tour_output(grid_data, best_tour, distances, start_point, altitude)
+
+def sweep_order(lines, positions, descending=False, reversed_first=False):
+    """
+    Indices ordered line by line with alternating direction along each line. Empty lines are skipped,
+    so the direction alternates between consecutive non-empty lines.
+    """
+    _, line_rank = np.unique(lines, return_inverse=True)
+    if descending:
+        line_rank = line_rank.max() - line_rank
+    flip = (line_rank % 2 == 1) != reversed_first
+    return np.lexsort((np.where(flip, -positions, positions), line_rank)).tolist()
+
+def polygon_convexity(coordinates):
+    """
+    Ratio between the polygon area and its convex hull area (1.0 for convex polygons).
+    """
+    polygon = Polygon(project_ring(coordinates, create_area_projection(coordinates)))
+    hull_area = polygon.convex_hull.area
+    return polygon.area / hull_area if hull_area > 0 else 1.0
+
+def build_tour_output(grid_data, tour, distances, start_point=None, altitude=None):
+    """
+    Turn a tour over grid_data into the ordered grids, waypoints and path metrics.
+    """
+    optimized_grid_data = [grid_data[i] for i in tour]
     waypoints = []
     if start_point:
         waypoints.append({
@@ -212,7 +511,7 @@ def optimize_tsp_path(grid_data, start_point=None):
             "type": "start_end",
             "order": 0
         })
-    for i, idx in enumerate(improved_tour):
+    for i, idx in enumerate(tour):
         grid = grid_data[idx]
         waypoints.append({
             "lat": grid["center"][0],
@@ -220,7 +519,7 @@ def optimize_tsp_path(grid_data, start_point=None):
             "type": "grid_center",
             "grid_id": idx,
             "order": i + (1 if start_point else 0),
-            "rotation": 0
+            "rotation": grid.get("rotation", 0)
         })
     if start_point:
         waypoints.append({
@@ -230,16 +529,11 @@ def optimize_tsp_path(grid_data, start_point=None):
             "order": len(waypoints)
         })
     # Calculate metrics
-    total_distance = calculate_tour_distance(improved_tour, distances)
-    # Improved estimated flight time calculation based on benchmarks:
-    # Takeoff: 6s, Ascend: 0.5s/m, Waypoint: 20s each, Travel: 0.5s/m, Landing: 0.5s/m
-    takeoff_time = 6.0
-    altitude = 20
-    ascend_time = 0.5 * altitude
-    landing_time = 0.5 * altitude
-    waypoint_time = len(optimized_grid_data) * 20.0
-    travel_time = 0.5 * total_distance
-    estimated_flight_time = takeoff_time + ascend_time + waypoint_time + travel_time + landing_time
+    total_distance = calculate_tour_distance(tour, distances)
+    # Flight time from the model calibrated on recorded missions (benchmark defaults until calibrated)
+    estimated_flight_time = get_flight_time_model().estimate(
+        total_distance, len(optimized_grid_data), altitude if altitude is not None else DEFAULT_ALTITUDE
+    )
     path_metrics = {
         "total_distance": total_distance,
         "grid_count": len(optimized_grid_data),
@@ -247,35 +541,15 @@ def optimize_tsp_path(grid_data, start_point=None):
     }
     return optimized_grid_data, waypoints, path_metrics
 
-def improve_solution_with_lk(points, initial_tour, distances):
-    """
-    Improve tour using Lin-Kernighan heuristic.
-    """
-    n = len(points)
-    best_tour = initial_tour.copy()
-    best_distance = calculate_tour_distance(best_tour, distances)
-    improved = True
-    while improved:
-        improved = False
-        for i in range(n-2):
-            for j in range(i+2, n):
-                new_tour = best_tour[:i+1] + list(reversed(best_tour[i+1:j+1])) + best_tour[j+1:]
-                new_distance = calculate_tour_distance(new_tour, distances)
-                if new_distance < best_distance:
-                    best_tour = new_tour
-                    best_distance = new_distance
-                    improved = True
-                    break
-            if improved:
-                break
-    return best_tour
-
 def calculate_tour_distance(tour, distances):
     """
     Calculate total tour distance.
     """
+    if hasattr(distances, "tour_length"):
+        # Lazy point distances: measure the legs directly instead of materializing a row per city
+        return distances.tour_length(tour)
     total = 0
     for i in range(len(tour) - 1):
         total += distances[tour[i]][tour[i+1]]
     total += distances[tour[-1]][tour[0]]
-    return total
\ No newline at end of file
+    return float(total)
\ No newline at end of file
@@ -8,14 +8,15 @@ import os
 import queue
 import threading
 import time
-import base64
 import json
-from io import BytesIO
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
 import cv2
 import eventlet
 import eventlet.wsgi
+from eventlet import tpool
 import socketio
 from shapely.geometry import Polygon
 from ultralytics import YOLO
@@ -35,9 +36,25 @@ from olympe.enums.camera import camera_mode, photo_mode, photo_format, photo_fil
 
 # Own module imports
 from algorithm import grid_based_algorithm
+from tsp_pool import warm_up_tsp_pool
+from plan_cache import PlanCache, plan_cache_key, canonicalize_coordinates
+from cost_model import FlightCostModel
+from flight_time import calibrate_flight_time_model, get_flight_time_model
+from incremental_planner import PlannerSession
+from tiling import plan_tiled
+from multi_drone import plan_multi_drone
+from plan import WIRE_ENCODINGS, format_wire
+from photo_store import PhotoStore, make_thumbnail
+from mission_browser import MissionBrowser, ThumbnailCache
+from mission_catalog import MissionCatalog
+from telemetry import TelemetryChannel, TelemetryHub, COALESCE_WINDOW, STREAM_TOPICS, topic_room
 
 # Configuration imports
 from config import SIMULATION_MODE, MODEL_NAME, DRONE_IP, SIMULATION_IP, DEFAULT_HOST, DEFAULT_PORT, OUTPUT_LOG
+from config import MAX_TIME_BUDGET, PROGRESS_EMIT_INTERVAL, MAX_TSP_STARTS, MAX_DRONES, TSP_POOL_WORKERS, MAX_ALTITUDE
+from config import PLAN_CACHE_MAX_BYTES, PLAN_CACHE_DIR, PLAN_CACHE_MAX_SPILL_FILES, FLIGHT_TIME_MODEL_FILE
+from config import MISSION_CATALOG_FILE
+from config import TELEMETRY_MAX_RATE, MAX_TELEMETRY_RATE, THUMBNAIL_CACHE_DIR, THUMBNAIL_WORKERS, MAX_PHOTO_RANGE
 
 # Event handler imports
 from eventlistener.positionEvent import handle_position_changed
@@ -70,11 +87,6 @@ gps_data = {
 drone_motion_state = "unknown"
 battery_percent = 0
 
-# Change tracking flags
-gps_data_changed = False
-motion_state_changed = False
-battery_percent_changed = False
-
 # Background threads
 background_thread = None
 
@@ -82,10 +94,18 @@ background_thread = None
 photo_queue = queue.Queue()
 photo_waypoints = []  # Will be filled with waypoints for the current mission
 photo_index = 0       # Index of the next waypoint to match
+photo_store = PhotoStore()  # Full-resolution photos by content id, fetched with get_photo
+
+# Telemetry, photos and flight logs waiting for the emitter (filled from drone and worker threads)
+telemetry = TelemetryChannel()
 
-# Queues for background emission
-photo_emit_queue = queue.Queue()
-flight_log_queue = queue.Queue()
+# Per-client telemetry subscriptions: rate limits, deltas and topic rooms
+telemetry_hub = TelemetryHub(
+    emit=lambda event, payload, to: sio.emit(event, payload, to=to),
+    schedule=eventlet.spawn_after,
+    max_rate=TELEMETRY_MAX_RATE,
+    max_allowed_rate=MAX_TELEMETRY_RATE
+)
 
 # Flight log
 current_flight_log = []
@@ -93,6 +113,26 @@ current_flight_log = []
 # Mission data
 mission_data = None
 
+# Computed plans, keyed on canonical polygon and planning parameters
+plan_cache = PlanCache(
+    max_bytes=PLAN_CACHE_MAX_BYTES,
+    spill_dir=os.path.join(os.path.dirname(__file__), PLAN_CACHE_DIR) if PLAN_CACHE_DIR else None,
+    max_spill_files=PLAN_CACHE_MAX_SPILL_FILES
+)
+
+# Incremental planner state per client while a polygon is being edited
+planner_sessions = {}
+
+# Completed missions served as manifest, thumbnail pages and photo ranges
+mission_browser = MissionBrowser(
+    os.path.join(os.path.dirname(__file__), "missions"),
+    ThumbnailCache(os.path.join(os.path.dirname(__file__), THUMBNAIL_CACHE_DIR))
+)
+thumbnail_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+
+# Index of completed missions for the mission list and searches
+mission_catalog = MissionCatalog(os.path.join(os.path.dirname(__file__), MISSION_CATALOG_FILE))
+
 # Load YOLOv8 model once (assumes best.pt is next to this file)
 model = YOLO(os.path.join(os.path.dirname(__file__), "models/", MODEL_NAME))
 
@@ -160,31 +200,33 @@ class DroneEventListener(olympe.EventListener):
 
     @olympe.listen_event(PositionChanged(_policy='wait'))
     def on_position_changed(self, event, scheduler):
-        global gps_data, DRONE_READY, gps_data_changed
-        gps_data, DRONE_READY, gps_data_changed = handle_position_changed(
-            event, scheduler, gps_data, DRONE_READY, gps_data_changed
-        )
+        global gps_data, DRONE_READY
+        gps_data, DRONE_READY, changed = handle_position_changed(event, scheduler, gps_data, DRONE_READY, False)
+        if changed:
+            publish_gps()
 
     @olympe.listen_event(MotionState(_policy='wait'))
     def on_motion_state_changed(self, event, scheduler):
-        global drone_motion_state, motion_state_changed
-        drone_motion_state, motion_state_changed = handle_motion_state_changed(
-            event, scheduler, drone_motion_state, motion_state_changed
-        )
+        global drone_motion_state
+        drone_motion_state, changed = handle_motion_state_changed(event, scheduler, drone_motion_state, False)
+        if changed:
+            publish_motion_state()
 
     @olympe.listen_event(BatteryStateChanged(_policy='wait'))
     def on_battery_state_changed(self, event, scheduler):
-        global battery_percent, battery_percent_changed
-        battery_percent, battery_percent_changed = handle_battery_state_changed(
-            event, scheduler, battery_percent, battery_percent_changed
-        )
+        global battery_percent
+        battery_percent, changed = handle_battery_state_changed(event, scheduler, battery_percent, False)
+        if changed:
+            publish_battery()
 
     @olympe.listen_event(FlyingStateChanged(_policy='wait'))
     def on_flying_state_changed(self, event, scheduler):
-        global drone_motion_state, motion_state_changed, Emergency
-        drone_motion_state, motion_state_changed, Emergency = handle_flying_state_changed(
-            event, scheduler, drone_motion_state, motion_state_changed, Emergency
+        global drone_motion_state, Emergency
+        drone_motion_state, changed, Emergency = handle_flying_state_changed(
+            event, scheduler, drone_motion_state, False, Emergency
         )
+        if changed:
+            publish_motion_state()
 
     @olympe.listen_event(photo_progress(_policy='wait'))
     def on_photo_progress(self, event, scheduler):
@@ -195,37 +237,151 @@ class DroneEventListener(olympe.EventListener):
 drone_event_listener = None
 
 #############################
-# Algorithm functionality
+# Telemetry Publishing
 #############################
 
-def run_path_algorithm(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None):
-    """Run the path algorithm"""
-    # Convert coverage to internal format
-    coverage = coverage / 100
+def publish_gps():
+    telemetry.publish('gps_update', {
+        "latitude": float(gps_data["latitude"]),
+        "longitude": float(gps_data["longitude"]),
+        "altitude": float(gps_data["altitude"])
+    })
 
-    # Validate inputs
+def publish_motion_state():
+    logging.info(f"Publishing motion state update: {drone_motion_state}")
+    telemetry.publish('drone_state', {"motion_state": drone_motion_state})
+    telemetry.publish('motion_update', {'motion_state': drone_motion_state})
+
+def publish_battery():
+    logging.info(f"Publishing battery update: {battery_percent}%")
+    telemetry.publish('battery_update', {"battery_percent": battery_percent})
+
+#############################
+# Algorithm functionality
+#############################
+
+def validate_plan_parameters(coordinates, altitude, overlap, coverage):
+    """Validate the planning parameters shared by all planners"""
     if not coordinates or len(coordinates) < 3:
         raise ValueError("At least 3 coordinates are required")
-    if altitude <= 0 or altitude > 40:
-        raise ValueError("Altitude must be between 0 and 40 meters")
+    if altitude <= 0 or altitude > MAX_ALTITUDE:
+        raise ValueError(f"Altitude must be between 0 and {MAX_ALTITUDE} meters")
     if not (0 <= overlap <= 100):
         raise ValueError("Overlap percentage must be between 0 and 100")
     if not (0 <= coverage <= 1):
         raise ValueError("Coverage must be between 0 and 100")
+
+def run_path_algorithm(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None,
+                       time_budget=None, progress_callback=None, starts=1, rotation=0,
+                       orientation_objective="cells", overlap_raster=False, path_mode="tsp", cost_options=None,
+                       sortie_time_budget=None, holes=None, exclusion_zones=None, tiled=False, tile_callback=None,
+                       num_drones=1, drone_start_points=None, deconfliction="delay"):
+    """Run the path algorithm"""
+    # Convert coverage to internal format
+    coverage = coverage / 100
+
+    # Validate inputs
+    validate_plan_parameters(coordinates, altitude, overlap, coverage)
+    if time_budget is not None and not (0 < time_budget <= MAX_TIME_BUDGET):
+        raise ValueError(f"Time budget must be between 0 and {MAX_TIME_BUDGET} seconds")
+    if not (1 <= starts <= MAX_TSP_STARTS):
+        raise ValueError(f"Number of TSP starts must be between 1 and {MAX_TSP_STARTS}")
+    if not (1 <= num_drones <= MAX_DRONES):
+        raise ValueError(f"Number of drones must be between 1 and {MAX_DRONES}")
+    if sortie_time_budget is not None and sortie_time_budget <= 0:
+        raise ValueError("Sortie time budget must be positive")
+    if rotation != "auto":
+        rotation = float(rotation) % 360
+    elif tiled or num_drones > 1:
+        raise ValueError("Tiled and multi-drone plans need a fixed rotation")
+    if tiled and (time_budget is not None or cost_options or path_mode != "tsp"):
+        # Tiles are solved by their own local search over distances
+        raise ValueError("Time budget, cost model and path mode are not supported in tiled mode")
+    if num_drones > 1 and (time_budget is not None or cost_options or path_mode != "tsp"):
+        # Every drone's tour is solved once per balancing round over distances
+        raise ValueError("Time budget, cost model and path mode are not supported for multiple drones")
+
+    # Serve identical or near-identical requests from the plan cache
+    cache_key = plan_cache_key(
+        coordinates, altitude, overlap, coverage, start_point, drone_start_point,
+        time_budget=time_budget, starts=starts, rotation=rotation, orientation_objective=orientation_objective,
+        overlap_raster=overlap_raster, path_mode=path_mode, cost_options=cost_options,
+        sortie_time_budget=sortie_time_budget,
+        holes=[canonicalize_coordinates(hole) for hole in holes or []],
+        exclusion_zones=[canonicalize_coordinates(zone) for zone in exclusion_zones or []],
+        tiled=tiled,
+        num_drones=num_drones,
+        drone_start_points=drone_start_points,
+        deconfliction=deconfliction if num_drones > 1 else None,
+        # Estimates change when the flight time model is refitted on new missions
+        flight_time_missions=len(get_flight_time_model().missions)
+    )
+    cached = plan_cache.get(cache_key)
+    if cached is not None:
+        logging.info("Plan served from cache")
+        return cached
     
-    # Calculate grid and flight path
-    result = grid_based_algorithm(coordinates, altitude, overlap, coverage, start_point, drone_start_point)
+    if num_drones > 1:
+        # Balanced split between drones, minimizing the longest flight
+        result = plan_multi_drone(
+            coordinates, altitude, overlap, coverage, num_drones,
+            drone_start_points or ([drone_start_point] if drone_start_point else None), rotation=rotation,
+            deconfliction=deconfliction, sortie_time_budget=sortie_time_budget, holes=holes,
+            exclusion_zones=exclusion_zones
+        )
+    elif tiled:
+        # Large areas: tiles are planned in parallel and streamed as they complete
+        result = plan_tiled(
+            coordinates, altitude, overlap, coverage, start_point, drone_start_point,
+            rotation=rotation, on_tile=tile_callback, sortie_time_budget=sortie_time_budget, holes=holes,
+            exclusion_zones=exclusion_zones
+        )
+    else:
+        # Calculate grid and flight path
+        result = grid_based_algorithm(
+            coordinates, altitude, overlap, coverage, start_point, drone_start_point,
+            time_budget=time_budget, progress_callback=progress_callback, starts=starts,
+            rotation=rotation, orientation_objective=orientation_objective, overlap_raster=overlap_raster,
+            path_mode=path_mode, cost_model=FlightCostModel.from_options(cost_options) if cost_options else None,
+            sortie_time_budget=sortie_time_budget, holes=holes, exclusion_zones=exclusion_zones
+        )
+    plan_cache.put(cache_key, result)
 
     # Return the result
     return result
 
+def run_incremental_path_algorithm(sid, coordinates, altitude, overlap, coverage, start_point=None,
+                                   drone_start_point=None, rotation=0, holes=None, exclusion_zones=None):
+    """Re-plan an edited polygon, reusing the client's planner session when the parameters are unchanged"""
+    coverage = coverage / 100
+    validate_plan_parameters(coordinates, altitude, overlap, coverage)
+    if rotation == "auto":
+        raise ValueError("Incremental planning needs a fixed rotation")
+    rotation = float(rotation) % 360
+
+    # Holes and zones are part of the parameters, so changing them re-plans from scratch
+    parameters = (altitude, overlap, coverage, start_point, drone_start_point, rotation, holes or [],
+                  exclusion_zones or [])
+    session = planner_sessions.get(sid)
+    if session is not None and session[0] == parameters:
+        return session[1].update(coordinates)
+
+    # First edit or changed parameters: plan from scratch and keep the session
+    planner = PlannerSession(
+        coordinates, altitude, overlap, coverage, start_point, drone_start_point, rotation,
+        holes=holes, exclusion_zones=exclusion_zones
+    )
+    planner_sessions[sid] = (parameters, planner)
+    return planner.result
+
 #############################
 # Flight Executor Functions
 #############################
 
-def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_start_point=None):
+def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_start_point=None, departure_delay=0):
     """
     Execute a stable flight plan with waypoint navigation and state expectations.
+    departure_delay (seconds) holds the takeoff back, as deconflicted multi-drone plans assign.
     Runs in a background thread and returns the result dict.
     """
     global drone, drone_connected
@@ -234,8 +390,9 @@ def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_star
     success = False
 
     # Set up the waypoints for photo/filename matching
-    photo_waypoints = waypoints.copy() if waypoints else []
+    photo_waypoints = [waypoint for waypoint in waypoints or [] if waypoint.get("type") != "detour"]
     photo_index = 0
+    photo_store.clear()
 
     local_drone = drone
     result_container = {}
@@ -244,8 +401,8 @@ def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_star
     def log_flight(action, **kwargs):
         log_entry = {"action": action, "timestamp": datetime.datetime.now().isoformat(), **kwargs}
         execution_log.append(log_entry)
-        # Put log into the flight_log_queue for background emission
-        flight_log_queue.put(log_entry)
+        # Hand the log to the telemetry emitter
+        telemetry.enqueue('flight_log', log_entry)
 
     def calculate_heading(lat1, lon1, lat2, lon2):
         """Calculate heading from (lat1, lon1) to (lat2, lon2) in degrees."""
@@ -290,6 +447,14 @@ def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_star
                 return
 
             log_flight("start_mission")
+            if departure_delay > 0:
+                # Wait for this drone's departure slot, still answering an emergency
+                log_flight("wait_departure", delay=departure_delay)
+                departure = time.monotonic() + departure_delay
+                while time.monotonic() < departure:
+                    if Emergency:
+                        return emergency_func()
+                    time.sleep(min(1.0, max(0.0, departure - time.monotonic())))
             # Take off and wait for hovering
             log_flight("takeoff")
             local_drone(
@@ -344,6 +509,9 @@ def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_star
                     moveTo(lat, lon, altitude, MoveTo_Orientation_mode.TO_TARGET, 0.0)
                     >> moveToChanged(status=MoveToChanged_Status.DONE, _timeout=30)
                 ).wait().success()
+                if wp_type == "detour":
+                    # Detour vertices around no-fly zones are only flown through
+                    continue
 
                 # Rotate drone to face the specified rotation
                 log_flight("rotate_drone", waypoint_num=i+1)
@@ -417,7 +585,7 @@ def execute_stable_flight_plan(waypoints, altitude, start_point=None, drone_star
 def photo_background_worker():
     """
     Background worker that matches photo filenames to waypoints,
-    runs each through YOLOv8, emits annotated or raw photo plus `detected`.
+    runs each through YOLOv8, emits a thumbnail of the annotated or raw photo plus `detected`.
     """
     global photo_index, photo_waypoints
 
@@ -439,7 +607,6 @@ def photo_background_worker():
                 base_photo_path = os.path.join("photos", base_filename)
                 detected_photo_path = os.path.join("photos", detected_filename)
                 detected = False
-                photo_data = None
                 try:
                     # Always save the original as {waypoint_index}.jpg
                     img_cv = cv2.imread(photo_path)
@@ -455,25 +622,15 @@ def photo_background_worker():
                         detected = True
                         # Annotate and save as {waypoint_index}_detected.jpg
                         annotated = results[0].plot()
-                        annotated_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
                         if Image is not None:
-                            pil_img = Image.fromarray(annotated_rgb)
-                            buf = BytesIO()
-                            pil_img.save(buf, format="JPEG", quality=30, optimize=True)
-                            photo_bytes = buf.getvalue()
+                            pil_img = Image.fromarray(cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB))
                             pil_img.save(detected_photo_path, format="JPEG", quality=90, optimize=True)
                         else:
-                            _, photo_bytes = cv2.imencode('.jpg', annotated, [int(cv2.IMWRITE_JPEG_QUALITY),30])
-                            photo_bytes = photo_bytes.tobytes()
                             cv2.imwrite(detected_photo_path, annotated)
-                        photo_data = base64.b64encode(photo_bytes).decode("utf-8")
-                        emit_filename = detected_filename
+                        emit_path, emit_filename = detected_photo_path, detected_filename
                     else:
                         # No detection, emit the original
-                        with open(base_photo_path, "rb") as f:
-                            photo_bytes = f.read()
-                        photo_data = base64.b64encode(photo_bytes).decode("utf-8")
-                        emit_filename = base_filename
+                        emit_path, emit_filename = base_photo_path, base_filename
 
                     # Remove the original downloaded file if different
                     if filename != base_filename and os.path.exists(photo_path):
@@ -481,19 +638,26 @@ def photo_background_worker():
                 except Exception as e:
                     print(f"Could not process photo file {photo_path}: {e}")
                     # Fallback to raw file
-                    with open(photo_path, "rb") as f:
-                        raw = f.read()
-                    photo_data = base64.b64encode(raw).decode("utf-8")
-                    emit_filename = filename
+                    emit_path, emit_filename = photo_path, filename
 
-                # Emit with detection flag and correct filename
-                photo_emit_queue.put({
+                # Push a small thumbnail as a binary attachment; clients fetch the photo itself
+                # by content id (get_photo) when they need it
+                with open(emit_path, "rb") as f:
+                    photo_bytes = f.read()
+                try:
+                    thumbnail = make_thumbnail(photo_bytes)
+                except Exception as e:
+                    print(f"Could not create thumbnail of {emit_path}: {e}")
+                    thumbnail = None
+                telemetry.enqueue('photo_update', {
                     "filename": emit_filename,
                     "lat": lat,
                     "lon": lon,
-                    "photo_base64": photo_data,
                     "index": photo_index,
-                    "detected": detected
+                    "detected": detected,
+                    "content_id": photo_store.add(emit_path, photo_bytes),
+                    "size": len(photo_bytes),
+                    "thumbnail": thumbnail
                 })
                 print(f"photo: {emit_filename} at {lat},{lon} detected={detected}")
                 photo_index += 1
@@ -510,7 +674,7 @@ def photo_background_worker():
 def connect_to_drone():
     """Connect to the drone without waiting for GPS fix"""
     global drone, drone_connected, drone_event_listener
-    global battery_percent, battery_percent_changed, drone_motion_state, motion_state_changed
+    global battery_percent, drone_motion_state
     global DRONE_READY
     
     try:
@@ -601,7 +765,7 @@ def connect_to_drone():
             battery_state = drone.get_state(BatteryStateChanged)
             if battery_state and "percent" in battery_state:
                 battery_percent = battery_state["percent"]
-                battery_percent_changed = True
+                publish_battery()
                 logging.info(f"Initial battery level: {battery_percent}%")
         except Exception as be:
             logging.warning(f"Could not get initial battery state: {be}")
@@ -613,7 +777,7 @@ def connect_to_drone():
                 raw_state = str(motion_state["state"])
                 new_state = raw_state.split('.')[-1].lower()
                 drone_motion_state = new_state
-                motion_state_changed = True
+                publish_motion_state()
                 logging.info(f"Initial motion state: {drone_motion_state}")
         except Exception as me:
             logging.warning(f"Could not get initial motion state: {me}")
@@ -683,11 +847,34 @@ def disconnect_from_drone():
 @sio.event
 def connect(sid, environ):
     logging.info(f'Client connected: {sid}')
-    sio.emit('drone_status', {'connected': drone_connected, 'gps_fix': gps_fix_established})
+    # Every client gets all telemetry at the default rate until it subscribes otherwise
+    subscribe_client(sid)
+    sio.emit('drone_status', {'connected': drone_connected, 'gps_fix': gps_fix_established}, to=sid)
 
 @sio.event
 def disconnect(sid):
     logging.info(f'Client disconnected: {sid}')
+    planner_sessions.pop(sid, None)
+    telemetry_hub.unsubscribe(sid)
+
+@sio.on('subscribe_telemetry')
+def handle_subscribe_telemetry(sid, data):
+    """Choose the telemetry topics, max rate (per second) and delta payloads for this client"""
+    try:
+        data = data or {}
+        return subscribe_client(sid, data.get('topics'), data.get('max_rate'), bool(data.get('delta', False)))
+    except Exception as e:
+        logging.error(f"Telemetry subscription error: {str(e)}")
+        return {"error": str(e)}
+
+def subscribe_client(sid, topics=None, max_rate=None, delta=False):
+    subscriber = telemetry_hub.subscribe(sid, topics, max_rate, delta)
+    for topic in STREAM_TOPICS:
+        if topic in subscriber.topics:
+            sio.enter_room(sid, topic_room(topic))
+        else:
+            sio.leave_room(sid, topic_room(topic))
+    return subscriber.settings()
 
 @sio.on('get_drone_status')
 def handle_get_drone_status(sid, data):
@@ -717,10 +904,10 @@ def handle_get_position(sid, data):
             "longitude": gps_data["longitude"],
             "altitude": gps_data["altitude"]
         }
-        # Emit all relevant updates
-        sio.emit('gps_update', {**position, "motion_state": drone_motion_state})
-        sio.emit('motion_update', {'motion_state': drone_motion_state})
-        sio.emit('battery_update', {'battery_percent': battery_percent})
+        # Emit all relevant updates to the asking client only
+        sio.emit('gps_update', {**position, "motion_state": drone_motion_state}, to=sid)
+        sio.emit('motion_update', {'motion_state': drone_motion_state}, to=sid)
+        sio.emit('battery_update', {'battery_percent': battery_percent}, to=sid)
         return {
             'success': True,
             'position': position,
@@ -731,90 +918,146 @@ def handle_get_position(sid, data):
         logging.error(f"Error getting position: {str(e)}")
         return {'success': False, 'error': str(e)}
 
+@sio.on('get_photo')
+def handle_get_photo(sid, data):
+    """
+    Full-resolution photo of a photo_update by its content id, sent as a binary attachment.
+    Expects data = {"content_id": "<id>"}
+    """
+    photo_id = (data or {}).get("content_id")
+    photo = photo_store.read(photo_id) if photo_id else None
+    if photo is None:
+        return {"error": f"Unknown photo '{photo_id}'"}
+    filename, photo_bytes = photo
+    return {"content_id": photo_id, "filename": filename, "photo": photo_bytes}
+
 @sio.on('get_completed_missions')
 def handle_get_completed_missions(sid, data):
     """
-    Returns a list of mission folder names (strings) inside the missions directory.
+    Returns a list of mission folder names (strings), newest first, from the mission catalog.
     """
-    missions_dir = os.path.join(os.path.dirname(__file__), "missions")
     try:
-        if not os.path.exists(missions_dir):
-            return {"missions": []}
-        # Only include directories
-        missions = [
-            name for name in os.listdir(missions_dir)
-            if os.path.isdir(os.path.join(missions_dir, name))
-        ]
-        return {"missions": missions}
+        return {"missions": mission_catalog.mission_names()}
     except Exception as e:
         return {"error": str(e)}
 
-@sio.on('get_completed_mission_data')
-def handle_get_completed_mission_data(sid, data):
+@sio.on('search_missions')
+def handle_search_missions(sid, data):
     """
-    Returns all images (as base64) and the log.json data for a given mission.
+    Missions with their metadata and log summary, newest first, filtered by any of
+    data = {"since": ISO timestamp, "until": ISO timestamp, "drone": str, "min_detections": int,
+            "polygon": [[lat, lon], ...]} (a mission matches the polygon when a photo lies inside it)
+    """
+    try:
+        data = data or {}
+        return {"missions": mission_catalog.find_missions(
+            since=data.get("since"), until=data.get("until"), drone=data.get("drone"),
+            min_detections=data.get("min_detections"), polygon=data.get("polygon")
+        )}
+    except Exception as e:
+        logging.error(f"Mission search error: {str(e)}")
+        return {"error": str(e)}
+
+@sio.on('search_mission_photos')
+def handle_search_mission_photos(sid, data):
+    """
+    Photos across missions with their location and detection flag, e.g. all detections within a
+    polygon in the last month: data = {"detected": true, "polygon": [[lat, lon], ...], "since": ...}.
+    Also accepts "until" and "drone".
+    """
+    try:
+        data = data or {}
+        return {"photos": mission_catalog.find_photos(
+            since=data.get("since"), until=data.get("until"), drone=data.get("drone"),
+            detected=data.get("detected"), polygon=data.get("polygon")
+        )}
+    except Exception as e:
+        logging.error(f"Mission photo search error: {str(e)}")
+        return {"error": str(e)}
+
+@sio.on('get_completed_mission_manifest')
+def handle_get_completed_mission_manifest(sid, data):
+    """
+    Photo list, log.json and mission.json of a mission, without image data.
     Expects data = {"mission": "<folder_name>"}
     """
-    import base64
-
-    mission_name = data.get("mission")
-    if not mission_name:
-        return {"error": "No mission specified."}
-
-    missions_dir = os.path.join(os.path.dirname(__file__), "missions")
-    mission_path = os.path.join(missions_dir, mission_name)
-    if not os.path.isdir(mission_path):
-        return {"error": "Mission folder does not exist."}
-
-    # Gather images
-    images = []
-    for fname in os.listdir(mission_path):
-        if fname.lower().endswith(".jpg"):
-            img_path = os.path.join(mission_path, fname)
-            try:
-                with open(img_path, "rb") as f:
-                    img_b64 = base64.b64encode(f.read()).decode("utf-8")
-                images.append({
-                    "filename": fname,
-                    "base64": img_b64
-                })
-            except Exception as e:
-                images.append({
-                    "filename": fname,
-                    "error": str(e)
-                })
+    try:
+        return mission_browser.manifest(data.get("mission"))
+    except Exception as e:
+        return {"error": str(e)}
 
-    # Load log.json
-    log_path = os.path.join(mission_path, "log.json")
-    log_data = None
-    if os.path.isfile(log_path):
-        try:
-            with open(log_path, "r") as f:
-                log_data = json.load(f)
-        except Exception as e:
-            log_data = {"error": str(e)}
+@sio.on('get_completed_mission_thumbnails')
+def handle_get_completed_mission_thumbnails(sid, data):
+    """
+    One page of photo thumbnails (binary attachments) of a mission, in manifest order.
+    Expects data = {"mission": "<folder_name>", "page": 0, "page_size": optional}
+    """
+    try:
+        # Thumbnails that are not cached yet are made in native threads, so the hub keeps serving
+        return tpool.execute(
+            mission_browser.thumbnail_page, data.get("mission"), int(data.get("page", 0)),
+            data.get("page_size"), thumbnail_executor.map
+        )
+    except Exception as e:
+        return {"error": str(e)}
 
-    # Load mission.json
-    mission_json_path = os.path.join(mission_path, "mission.json")
-    mission_json_data = None
-    if os.path.isfile(mission_json_path):
-        try:
-            with open(mission_json_path, "r") as f:
-                mission_json_data = json.load(f)
-        except Exception as e:
-            mission_json_data = {"error": str(e)}
+@sio.on('get_completed_mission_photo')
+def handle_get_completed_mission_photo(sid, data):
+    """
+    A byte range of a full-resolution mission photo (binary attachment); the size in the reply
+    tells the client whether to ask for the next range.
+    Expects data = {"mission": "<folder_name>", "filename": "<photo>", "offset": 0, "length": optional}
+    """
+    try:
+        return mission_browser.photo_range(
+            data.get("mission"), data.get("filename"), data.get("offset", 0),
+            data.get("length", MAX_PHOTO_RANGE)
+        )
+    except Exception as e:
+        return {"error": str(e)}
+
+@sio.on('get_plan_cache_stats')
+def handle_get_plan_cache_stats(sid, data):
+    return plan_cache.stats()
+
+def make_path_metrics_emitter(sid):
+    """
+    Build a progress callback that streams intermediate path_metrics to one client.
+    Emits are throttled to PROGRESS_EMIT_INTERVAL and yield to the eventlet hub so they are sent
+    while the solver is still running instead of after it returns.
+    """
+    last_emit = [0.0]
+
+    def emit_progress(metrics):
+        now = time.monotonic()
+        if now - last_emit[0] < PROGRESS_EMIT_INTERVAL:
+            return
+        last_emit[0] = now
+        sio.emit('path_metrics', metrics, to=sid)
+        sio.sleep(0)
+
+    return emit_progress
+
+def make_tile_emitter(sid, wire_format=None):
+    """
+    Build a callback that streams every solved tile of a tiled plan to one client as 'grid_tile'.
+    """
+    def emit_tile(tile_plan):
+        sio.emit('grid_tile', encode_plan_response(tile_plan, wire_format) if wire_format else dict(tile_plan), to=sid)
+        sio.sleep(0)
 
-    return {
-        "images": images,
-        "log": log_data,
-        "mission": mission_json_data
-    }
+    return emit_tile
 
 @sio.on('calculate_grid')
 def handle_calculate_grid(sid, data):
     if not DRONE_READY:
         return {"error": "Drone is not ready. Wait for valid GPS coordinates before calculating grid."}
     try:
+        wire_format = data.get('wire_format') # Optional "compact" or "binary" plan encoding
+        if wire_format is not None and wire_format not in WIRE_ENCODINGS:
+            raise ValueError(f"Unknown wire format '{wire_format}', expected one of {WIRE_ENCODINGS}")
+        time_budget = data.get('time_budget') # Optional wall-clock budget in seconds
+        sortie_time_budget = data.get('sortie_time_budget') # Optional flight time per battery in seconds
         result = run_path_algorithm(
             coordinates=data['coordinates'],
             altitude=float(data['altitude']),
@@ -822,40 +1065,98 @@ def handle_calculate_grid(sid, data):
             coverage=float(data['coverage']),
             start_point=data.get('start_point'), # Optional start point
             drone_start_point=data.get('drone_start_point'),
+            time_budget=float(time_budget) if time_budget is not None else None,
+            progress_callback=make_path_metrics_emitter(sid),
+            starts=int(data.get('starts', 1)), # Parallel multi-start TSP solves
+            rotation=data.get('rotation', 0), # Grid heading in degrees or "auto"
+            orientation_objective=data.get('orientation_objective', 'cells'),
+            overlap_raster=bool(data.get('overlap_raster', False)), # Per-grid overlapped fraction
+            path_mode=data.get('path_mode', 'tsp'), # "tsp", "sweep" or "auto"
+            cost_options=data.get('cost_model'), # Optimize flight time (speed, yaw rate, wind) instead of distance
+            sortie_time_budget=float(sortie_time_budget) if sortie_time_budget is not None else None, # Per battery
+            holes=data.get('holes'), # Optional (lat, lon) rings inside the polygon that are not searched
+            exclusion_zones=data.get('exclusion_zones'), # Optional no-fly zones the path routes around
+            tiled=bool(data.get('tiled', False)), # Plan large areas tile by tile in parallel
+            tile_callback=make_tile_emitter(sid, wire_format),
+            num_drones=int(data.get('num_drones', 1)), # Split the area between several drones
+            drone_start_points=data.get('drone_start_points'), # One launch point per drone (or one shared)
+            deconfliction=data.get('deconfliction', 'delay'), # "delay", "altitude" or None
         )
-        # Remove start/end points from path and return separately
-        path = result["path"]
-        start_point = None
-        if path and len(path) >= 2 and path[0].get("type") == "start_end" and path[-1].get("type") == "start_end":
-            start_point = path[0]
-            # Remove first and last (start/end) from path
-            path = path[1:-1]
-        result["waypoints"] = path
-        result["start_point"] = start_point
-
-        # --- Fix: Ensure drone_start_point is always an object with lat/lon keys ---
-        drone_start_point = result.get("metadata", {}).get("drone_start_point")
-        if isinstance(drone_start_point, (list, tuple)) and len(drone_start_point) == 2:
-            result["drone_start_point"] = {
-                "lat": drone_start_point[0],
-                "lon": drone_start_point[1]
+        if wire_format:
+            return encode_plan_response(result, wire_format)
+        if "drones" in result:
+            return {
+                "drones": [format_grid_response(plan) for plan in result["drones"]],
+                "metadata": result["metadata"]
             }
-        elif isinstance(drone_start_point, dict):
-            result["drone_start_point"] = {
-                "lat": drone_start_point.get("lat"),
-                "lon": drone_start_point.get("lon")
-            }
-        else:
-            result["drone_start_point"] = None
-        # --------------------------------------------------------------------------
-
-        # Remove the old "path" key to avoid confusion
-        result.pop("path", None)
-        return result
+        return format_grid_response(result)
     except Exception as e:
         logging.error(f"Grid calculation error: {str(e)}")
         return {"error": str(e)}
 
+@sio.on('update_grid_polygon')
+def handle_update_grid_polygon(sid, data):
+    """Re-plan while the user drags polygon vertices; only the cells around the edit are recomputed"""
+    if not DRONE_READY:
+        return {"error": "Drone is not ready. Wait for valid GPS coordinates before calculating grid."}
+    try:
+        result = run_incremental_path_algorithm(
+            sid,
+            coordinates=data['coordinates'],
+            altitude=float(data['altitude']),
+            overlap=float(data['overlap']),
+            coverage=float(data['coverage']),
+            start_point=data.get('start_point'),
+            drone_start_point=data.get('drone_start_point'),
+            rotation=data.get('rotation', 0),
+            holes=data.get('holes'),
+            exclusion_zones=data.get('exclusion_zones'),
+        )
+        return format_grid_response(result)
+    except Exception as e:
+        logging.error(f"Incremental grid calculation error: {str(e)}")
+        return {"error": str(e)}
+
+@sio.on('end_grid_editing')
+def handle_end_grid_editing(sid, data):
+    planner_sessions.pop(sid, None)
+
+def format_grid_response(result):
+    """Shape a plan for the frontend: separate the start point from the waypoints"""
+    # Remove start/end points from path and return separately
+    path = result["path"]
+    start_point = None
+    if path and len(path) >= 2 and path[0].get("type") == "start_end" and path[-1].get("type") == "start_end":
+        start_point = path[0]
+        # Remove first and last (start/end) from path
+        path = path[1:-1]
+    result["waypoints"] = path
+    result["start_point"] = start_point
+
+    # --- Fix: Ensure drone_start_point is always an object with lat/lon keys ---
+    drone_start_point = result.get("metadata", {}).get("drone_start_point")
+    if isinstance(drone_start_point, (list, tuple)) and len(drone_start_point) == 2:
+        result["drone_start_point"] = {
+            "lat": drone_start_point[0],
+            "lon": drone_start_point[1]
+        }
+    elif isinstance(drone_start_point, dict):
+        result["drone_start_point"] = {
+            "lat": drone_start_point.get("lat"),
+            "lon": drone_start_point.get("lon")
+        }
+    else:
+        result["drone_start_point"] = None
+    # --------------------------------------------------------------------------
+
+    # Remove the old "path" key to avoid confusion
+    result.pop("path", None)
+    return dict(result)
+
+def encode_plan_response(result, wire_format):
+    """Flat-array plan for clients that asked for a wire format; start points stay in the path"""
+    return format_wire(result, binary=wire_format == "binary")
+
 @sio.on('execute_flight')
 def handle_flight_execution(sid, data):
     # For indoor testing, always consider the drone ready
@@ -877,10 +1178,18 @@ def handle_flight_execution(sid, data):
     start_point = data.get('start_point')
     drone_start_point = data.get('drone_start_point')
     waypoints = data['waypoints']
-    altitude = float(data['altitude'])
-
-    # Store mission data globally for later saving
+    # A drone of a multi-drone plan sends its plan's metadata: its altitude layer and departure delay
+    drone_metadata = data.get('metadata') or {}
+    altitude = float(drone_metadata.get('altitude') or data['altitude'])
+    departure_delay = float(drone_metadata.get('departure_delay') or 0)
+    if not (0 < altitude <= MAX_ALTITUDE) or departure_delay < 0:
+        message = f"Altitude must be between 0 and {MAX_ALTITUDE} meters and the departure delay not negative"
+        sio.emit('flight_log', {'action': 'Error', 'message': message})
+        return {"error": message}
+
+    # Store mission data globally for later saving, with the drone that flies it for the mission catalog
     mission_data = data.copy()
+    mission_data.setdefault("drone", SIMULATION_IP if SIMULATION_MODE else DRONE_IP)
 
     def flight_thread():
         try:
@@ -902,10 +1211,11 @@ def handle_flight_execution(sid, data):
                 waypoints=waypoints,
                 altitude=altitude,
                 start_point=start_point,
-                drone_start_point=drone_start_point
+                drone_start_point=drone_start_point,
+                departure_delay=departure_delay
             )
 
-            # Remove per-log emission here; logs are now emitted from background_loop
+            # Remove per-log emission here; logs are emitted by the telemetry emitter
             sio.start_background_task(sio.emit, 'flight_result', result)
             
         except Exception as e:
@@ -923,102 +1233,71 @@ def handle_flight_execution(sid, data):
 import random
 
 def start_background_tasks():
-    """Start background tasks using eventlet's spawn_n for true async compatibility, with different intervals."""
-    def background_loop():
-        global gps_data_changed, motion_state_changed, battery_percent_changed
-        
-        logging.info("Background task started (eventlet)")
+    """
+    Start the telemetry emitter: one greenthread that sleeps until a drone listener or worker thread
+    publishes, then sends everything pending. No polling while idle.
+    """
+    def telemetry_emitter():
+        logging.info("Telemetry emitter started (eventlet)")
 
         while True:
             try:
-                if drone_connected:                    
-                    # Check for GPS data changes and emit if changed
-                    if gps_data_changed:
-                        emit_data = {
-                            "latitude": float(gps_data["latitude"]),
-                            "longitude": float(gps_data["longitude"]),
-                            "altitude": float(gps_data["altitude"])
-                        }
-                        sio.emit('gps_update', emit_data, skip_sid=None)
-                        gps_data_changed = False  # Reset the flag
-                    
-                    # Check for motion state changes and emit if changed
-                    if motion_state_changed:
-                        logging.info(f"Background: emitting motion state update: {drone_motion_state}")
-                        sio.emit('drone_state', {"motion_state": drone_motion_state}, skip_sid=None)
-                        sio.emit('motion_update', {
-                            'motion_state': drone_motion_state
-                        }, skip_sid=None)
-                        motion_state_changed = False  # Reset the flag
-                    
-                    # Check for battery updates and emit if changed
-                    if battery_percent_changed:
-                        logging.info(f"Background: emitting battery update: {battery_percent}%")
-                        sio.emit('battery_update', {"battery_percent": battery_percent}, skip_sid=None)
-                        battery_percent_changed = False  # Reset the flag
-
-                    # Emit photo updates from photo_emit_queue
-                    try:
-                        while True:
-                            photo_update = photo_emit_queue.get_nowait()
-                            sio.emit("photo_update", photo_update, skip_sid=None)
-                    except queue.Empty:
-                        pass
-
-                    # Emit flight logs from flight_log_queue
-                    try:
-                        while True:
-                            flight_log = flight_log_queue.get_nowait()
-                            sio.emit("flight_log", flight_log, skip_sid=None)
-                            # --- Track the log in memory ---
-                            current_flight_log.append(flight_log)
-                            # --- If this is the "complete" log, save the log to missions/{timestamp}/log.json ---
-                            if (
-                                flight_log.get("action") == "complete"
-                                and flight_log.get("success") is True
-                            ):
-                                import json, os, shutil
-                                timestamp = flight_log.get("timestamp", "").replace(":", "-")
-                                mission_dir = os.path.join("missions", timestamp)
-                                os.makedirs(mission_dir, exist_ok=True)
-                                log_path = os.path.join(mission_dir, "log.json")
-                                with open(log_path, "w") as f:
-                                    json.dump(current_flight_log, f, indent=2)
-                                print(f"Flight log saved to {log_path}")
-                                # Save mission_data as mission.json
-                                global mission_data
-                                if mission_data is not None:
-                                    mission_json_path = os.path.join(mission_dir, "mission.json")
-                                    with open(mission_json_path, "w") as f:
-                                        json.dump(mission_data, f, indent=2)
-                                    print(f"Mission data saved to {mission_json_path}")
-                                # Move all photos to the mission folder
-                                photos_dir = "photos"
-                                for filename in os.listdir(photos_dir):
-                                    src = os.path.join(photos_dir, filename)
-                                    dst = os.path.join(mission_dir, filename)
-                                    if os.path.isfile(src):
-                                        shutil.move(src, dst)
-                                print(f"Moved all photos to {mission_dir}")
-                                # Optionally, clear the log for the next mission
-                                current_flight_log.clear()
-                                # Optionally, clear mission_data for the next mission
-                                mission_data = None
-                    except queue.Empty:
-                        pass
-                else:
-                    logging.debug("Background: drone not connected, skipping update")
-                
-                eventlet.sleep(0.2)  # Short sleep for responsiveness
+                telemetry.wait()
+                # Let the rest of a burst arrive so it is sent once
+                eventlet.sleep(COALESCE_WINDOW)
+                for event, payload in telemetry.drain():
+                    telemetry_hub.deliver(event, payload)
+                    if event == 'flight_log':
+                        record_flight_log(payload)
             except Exception as e:
-                logging.error(f"Error in background task: {str(e)}")
+                logging.error(f"Error in telemetry emitter: {str(e)}")
                 eventlet.sleep(2)
 
-    # Only start one background task
+    # Only start one emitter
     global background_thread
     if background_thread is None:
-        background_thread = eventlet.spawn(background_loop)
-        logging.info("Eventlet background task spawned")
+        background_thread = eventlet.spawn(telemetry_emitter)
+        logging.info("Eventlet telemetry emitter spawned")
+
+def record_flight_log(flight_log):
+    """Track a sent flight log; the "complete" log saves the mission folder"""
+    global mission_data
+    current_flight_log.append(flight_log)
+    # --- If this is the "complete" log, save the log to missions/{timestamp}/log.json ---
+    if flight_log.get("action") != "complete" or flight_log.get("success") is not True:
+        return
+    timestamp = flight_log.get("timestamp", "").replace(":", "-")
+    mission_dir = os.path.join("missions", timestamp)
+    os.makedirs(mission_dir, exist_ok=True)
+    log_path = os.path.join(mission_dir, "log.json")
+    with open(log_path, "w") as f:
+        json.dump(current_flight_log, f, indent=2)
+    print(f"Flight log saved to {log_path}")
+    # Save mission_data as mission.json
+    if mission_data is not None:
+        mission_json_path = os.path.join(mission_dir, "mission.json")
+        with open(mission_json_path, "w") as f:
+            json.dump(mission_data, f, indent=2)
+        print(f"Mission data saved to {mission_json_path}")
+    # Move all photos to the mission folder
+    photos_dir = "photos"
+    for filename in os.listdir(photos_dir):
+        src = os.path.join(photos_dir, filename)
+        dst = os.path.join(mission_dir, filename)
+        if os.path.isfile(src):
+            shutil.move(src, dst)
+    photo_store.relocate(photos_dir, mission_dir)
+    print(f"Moved all photos to {mission_dir}")
+    # Index the saved mission for the mission list and searches
+    mission_catalog.add_mission(mission_dir)
+    # Refit flight time estimates with the new mission (only its log is read)
+    calibrate_flight_time_model(
+        "missions", os.path.join(os.path.dirname(__file__), FLIGHT_TIME_MODEL_FILE)
+    )
+    # Optionally, clear the log for the next mission
+    current_flight_log.clear()
+    # Optionally, clear mission_data for the next mission
+    mission_data = None
 
 #############################
 # Main Execution
@@ -1028,5 +1307,12 @@ if __name__ == "__main__":
     port = int(os.environ.get('PORT', DEFAULT_PORT))
     host = os.environ.get('HOST', DEFAULT_HOST)
     
+    # Spawn the planner processes before serving so no request pays the start-up cost
+    warm_up_tsp_pool(TSP_POOL_WORKERS)
+    # Fit flight time estimates to any missions recorded since the last start
+    calibrate_flight_time_model("missions", os.path.join(os.path.dirname(__file__), FLIGHT_TIME_MODEL_FILE))
+    # Index missions added, changed or removed while the server was down
+    mission_catalog.sync(os.path.join(os.path.dirname(__file__), "missions"))
+
     logging.info(f"Starting python-socketio server on {host}:{port}")
     eventlet.wsgi.server(eventlet.listen((host, port)), application)
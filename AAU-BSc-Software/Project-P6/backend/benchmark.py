@@ -0,0 +1,245 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from shapely.affinity import rotate, scale
+
+from algorithm import calculate_grid_placement, optimize_tsp_path
+from geo_utils import create_local_projection, calculate_grid_size
+from config import BENCHMARK_BASELINE_FILE
+
+#############################
+# Benchmark Settings
+#############################
+
+CORPUS_SEED = 6                 # Seed of the polygon corpus, fixed so every run plans the same areas
+CORPUS_ORIGIN = (57.0128, 9.9905)
+CORPUS_SHAPES = ("convex", "concave", "thin", "holes")
+CORPUS_CELLS = (10, 100, 1000, 10000)
+CORPUS_ALTITUDES = (15, 25, 40)
+BENCHMARK_OVERLAP = 20          # Percent
+BENCHMARK_COVERAGE = 0.5        # Fraction of a cell inside the area for it to be searched
+
+TIME_TOLERANCE = 0.25           # Relative slowdown of placement or TSP time flagged as a regression
+TIME_SLACK = 0.05               # Seconds of slowdown always tolerated (timer noise on small cases)
+MEMORY_TOLERANCE = 0.20         # Relative growth of the tracemalloc peak flagged as a regression
+LENGTH_TOLERANCE = 0.01         # Relative growth of the tour length flagged as a regression
+# tracemalloc keeps a record per allocation, which does not fit in memory next to the local search's
+# O(n^2) distance lists beyond a few thousand cells; larger cases are timed but record no peak
+MEMORY_PROFILE_MAX_CELLS = 2000
+
+#############################
+# Polygon Corpus
+#############################
+
+def generate_corpus(seed=CORPUS_SEED, shapes=CORPUS_SHAPES, cells=CORPUS_CELLS, altitudes=CORPUS_ALTITUDES):
+    """
+    Reproducible benchmark areas: every shape at every altitude, sized to hold about the target number
+    of cells. Returns a list of cases {"name", "shape", "altitude", "target_cells", "coordinates", "holes"}
+    with (lat, lon) rings.
+    """
+    projection = create_local_projection(*CORPUS_ORIGIN)
+    corpus = []
+    for shape in shapes:
+        for target_cells in cells:
+            for altitude in altitudes:
+                # Every case has its own stream, so a subset of the corpus plans the same areas
+                rng = np.random.default_rng([seed, CORPUS_SHAPES.index(shape), target_cells, altitude])
+                grid_width, grid_height = calculate_grid_size(altitude)
+                cell_area = grid_width * grid_height * (1 - BENCHMARK_OVERLAP / 100) ** 2
+                area, holes = _shape(shape, rng, target_cells)
+                # Scale so the searched area (without holes) holds target_cells cells
+                factor = np.sqrt(target_cells * cell_area / area.area)
+                area = scale(area, factor, factor, origin=(0, 0))
+                holes = [scale(hole, factor, factor, origin=(0, 0)) for hole in holes]
+                corpus.append({
+                    "name": f"{shape}-{target_cells}-{altitude}m",
+                    "shape": shape,
+                    "altitude": altitude,
+                    "target_cells": target_cells,
+                    "coordinates": _to_wgs84(area.exterior, projection),
+                    "holes": [_to_wgs84(hole.exterior, projection) for hole in holes],
+                })
+    return corpus
+
+def _shape(shape, rng, target_cells):
+    """
+    Unscaled polygon of a corpus shape in local meters and the holes cut out of it. The returned area
+    is the polygon without its holes.
+    """
+    if shape == "convex":
+        angles = np.sort(rng.uniform(0, 2 * np.pi, 12))
+        points = np.column_stack((1.5 * np.cos(angles), np.sin(angles))) * rng.uniform(0.9, 1.1, (12, 1))
+        area = shapely.convex_hull(shapely.multipoints(points))
+        return rotate(area, rng.uniform(0, 180), origin=(0, 0)), []
+    if shape == "concave":
+        # Star with seven arms
+        angles = np.linspace(0, 2 * np.pi, 14, endpoint=False)
+        radii = np.where(np.arange(14) % 2 == 0, 1.0, 0.45) * rng.uniform(0.85, 1.15, 14)
+        area = Polygon(np.column_stack((radii * np.cos(angles), radii * np.sin(angles))))
+        return rotate(area, rng.uniform(0, 180), origin=(0, 0)), []
+    if shape == "thin":
+        # Strip up to 25 times longer than wide, like a road or river bank, and at least two cells wide
+        length = min(25, target_cells / 4)
+        area = shapely.box(-length / 2, -0.5, length / 2, 0.5)
+        return rotate(area, rng.uniform(0, 180), origin=(0, 0)), []
+    if shape == "holes":
+        # Field with three buildings
+        outer = shapely.box(-1, -1, 1, 1)
+        centers = [(-0.5, -0.4), (0.4, -0.3), (0.1, 0.5)]
+        holes = [
+            shapely.box(x - size, y - size, x + size, y + size)
+            for (x, y), size in zip(centers, rng.uniform(0.1, 0.2, 3))
+        ]
+        area = Polygon(outer.exterior.coords, [hole.exterior.coords for hole in holes])
+        return area, holes
+    raise ValueError(f"Unknown corpus shape '{shape}', expected one of {CORPUS_SHAPES}")
+
+def _to_wgs84(ring, projection):
+    x, y = np.asarray(ring.coords)[:-1].T
+    lon, lat = projection.to_wgs84(x, y)
+    return list(zip(lat.tolist(), lon.tolist()))
+
+#############################
+# Benchmark Runner
+#############################
+
+def run_case(case):
+    """
+    Plan one corpus case: grid placement followed by the TSP from the first polygon vertex.
+    Times come from a plain run; the peak memory from a second run under tracemalloc, which slows
+    the planner down too much to time it at the same time (None above MEMORY_PROFILE_MAX_CELLS).
+    """
+    def plan():
+        # The planner prints its area summary; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            grid_data, _, _, _ = calculate_grid_placement(
+                case["coordinates"], case["altitude"], BENCHMARK_OVERLAP, BENCHMARK_COVERAGE, holes=case["holes"]
+            )
+            placed = time.perf_counter()
+            _, _, path_metrics = optimize_tsp_path(grid_data, case["coordinates"][0], altitude=case["altitude"])
+            finished = time.perf_counter()
+        return len(grid_data), path_metrics["total_distance"], placed - started, finished - placed
+
+    cell_count, tour_length, placement_time, tsp_time = plan()
+    peak_memory = None
+    if case["target_cells"] <= MEMORY_PROFILE_MAX_CELLS:
+        tracemalloc.start()
+        try:
+            plan()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "shape": case["shape"],
+        "altitude": case["altitude"],
+        "target_cells": case["target_cells"],
+        "cell_count": cell_count,
+        "tour_length": tour_length,
+        "placement_time": placement_time,
+        "tsp_time": tsp_time,
+        "wall_time": placement_time + tsp_time,
+        "peak_memory": peak_memory,
+    }
+
+def run_benchmarks(corpus, log=None):
+    """Results of every case, keyed by case name."""
+    results = {}
+    for case in corpus:
+        results[case["name"]] = run_case(case)
+        if log:
+            log(format_result(case["name"], results[case["name"]]))
+    return results
+
+def format_result(name, result):
+    peak = f"{result['peak_memory'] / 2 ** 20:7.1f} MiB" if result["peak_memory"] is not None else "      - MiB"
+    return (
+        f"{name:<20} {result['cell_count']:>6} cells  placement {result['placement_time']:7.3f} s  "
+        f"tsp {result['tsp_time']:7.3f} s  peak {peak}  tour {result['tour_length']:10.0f} m"
+    )
+
+#############################
+# Baseline
+#############################
+
+def load_baseline(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({
+            "created_at": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "shapely": shapely.__version__,
+            "machine": platform.machine(),
+            "cases": results,
+        }, f, indent=2)
+
+def compare_to_baseline(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE,
+                        length_tolerance=LENGTH_TOLERANCE):
+    """
+    Regressions of results against the baseline cases, as readable strings. A case regresses when its
+    placement or TSP time, its tracemalloc peak or its tour length grew beyond the tolerance, or when
+    a different number of cells was selected. Cases missing from the baseline are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+        if result["cell_count"] != reference["cell_count"]:
+            regressions.append(f"{name}: cell count {reference['cell_count']} -> {result['cell_count']}")
+        for key in ("placement_time", "tsp_time"):
+            if result[key] > reference[key] * (1 + time_tolerance) + TIME_SLACK:
+                regressions.append(f"{name}: {key} {reference[key]:.3f} s -> {result[key]:.3f} s")
+        if None not in (result["peak_memory"], reference["peak_memory"]) and \
+                result["peak_memory"] > reference["peak_memory"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: peak memory {reference['peak_memory'] / 2 ** 20:.1f} MiB -> "
+                f"{result['peak_memory'] / 2 ** 20:.1f} MiB"
+            )
+        if result["tour_length"] > reference["tour_length"] * (1 + length_tolerance):
+            regressions.append(f"{name}: tour length {reference['tour_length']:.0f} m -> {result['tour_length']:.0f} m")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark grid placement and TSP on a generated polygon corpus")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           BENCHMARK_BASELINE_FILE))
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--max-cells", type=int, default=max(CORPUS_CELLS), help="skip larger corpus cases")
+    parser.add_argument("--shape", action="append", choices=CORPUS_SHAPES, help="only run these shapes")
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus(
+        shapes=args.shape or CORPUS_SHAPES, cells=[cells for cells in CORPUS_CELLS if cells <= args.max_cells]
+    )
+    results = run_benchmarks(corpus, log=print)
+    if args.update:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to create one")
+        return 0
+    regressions = compare_to_baseline(results, load_baseline(args.baseline))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions in {len(results)} cases")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,4 +8,33 @@ SIMULATION_IP = "10.202.0.1"
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 5000
 
-OUTPUT_LOG = False
\ No newline at end of file
+OUTPUT_LOG = False
+
+# Path planning
+MAX_TIME_BUDGET = 60  # Maximum solver time budget in seconds accepted from a client
+PROGRESS_EMIT_INTERVAL = 0.25  # Minimum seconds between path_metrics progress emits
+MAX_TSP_STARTS = 32  # Maximum parallel multi-start TSP constructions per request
+MAX_DRONES = 8  # Maximum number of drones a single plan is split between
+MAX_ALTITUDE = 40  # Highest flight altitude in meters, also for the altitude layers of deconflicted drones
+TSP_POOL_WORKERS = None  # Planner process pool size, None uses all CPU cores
+PLAN_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Memory bound for cached plans (serialized size)
+PLAN_CACHE_DIR = "plan_cache"  # On-disk spill directory next to backend.py, None disables spilling
+PLAN_CACHE_MAX_SPILL_FILES = 500  # Oldest spilled plans are removed beyond this count
+FLIGHT_TIME_MODEL_FILE = "flight_time_model.json"  # Flight time model fitted on missions/*/log.json, next to backend.py
+BENCHMARK_BASELINE_FILE = "benchmark_baseline.json"  # Planner benchmark results (python benchmark.py --update), next to backend.py
+
+# Telemetry
+TELEMETRY_MAX_RATE = 5  # Default gps/motion/battery updates per second sent to each client
+MAX_TELEMETRY_RATE = 20  # Highest per-client telemetry rate a client may subscribe with
+
+# Photos
+THUMBNAIL_MAX_SIZE = 320  # Longest side in pixels of the photo thumbnails pushed during a mission
+THUMBNAIL_QUALITY = 70  # JPEG quality of the thumbnails; full photos are fetched on demand with get_photo
+THUMBNAIL_CACHE_DIR = "thumbnail_cache"  # On-disk thumbnails of completed mission photos, next to backend.py
+THUMBNAIL_WORKERS = 4  # Threads making the thumbnails of a mission page that are not cached yet
+
+# Completed missions
+MISSION_PAGE_SIZE = 24  # Thumbnails per page of get_completed_mission_thumbnails
+MAX_MISSION_PAGE_SIZE = 100  # Largest page size a client may ask for
+MAX_PHOTO_RANGE = 1024 * 1024  # Largest byte range of a photo sent per get_completed_mission_photo
+MISSION_CATALOG_FILE = "missions.sqlite3"  # SQLite index of missions/ (photos, detections, logs), next to backend.py
@@ -0,0 +1,127 @@
+import numpy as np
+
+#############################
+# Cost Model Settings
+#############################
+
+DEFAULT_CRUISE_SPEED = 2.0      # m/s, matches the 0.5 s/m travel estimate
+DEFAULT_ACCELERATION = 1.0      # m/s^2, the drone stops at every waypoint
+DEFAULT_YAW_RATE = 45.0         # degrees/s
+DEFAULT_PHOTO_HOLD = 3.0        # Seconds spent still at a waypoint (settle after rotating + photo)
+MIN_GROUND_SPEED = 0.5          # m/s, floor for the ground speed into a strong headwind
+
+#############################
+# Cost Model
+#############################
+
+class FlightCostModel:
+    """
+    Time-based (seconds) edge costs for the tour optimizer, following how execute_stable_flight_plan
+    flies: accelerate from a stop, cruise, decelerate to a stop, yaw from the photo heading to the leg
+    heading before leaving and back to the photo heading on arrival.
+
+    Wind is given as the speed (m/s) and the compass direction it blows FROM. The local search needs
+    symmetric costs, so the travel time of a leg is the mean of flying it in both directions; over a
+    closed tour the first-order head/tailwind terms cancel, so this is exact up to second order.
+    With axial_photo_heading the camera may face the photo heading or its opposite (the footprint is
+    the same), whichever needs less yaw. Without it, the yaw per leg is the same for every leg and only
+    adds a constant.
+    """
+
+    def __init__(self, cruise_speed=DEFAULT_CRUISE_SPEED, acceleration=DEFAULT_ACCELERATION,
+                 yaw_rate=DEFAULT_YAW_RATE, photo_hold=DEFAULT_PHOTO_HOLD, wind_speed=0.0, wind_direction=0.0,
+                 axial_photo_heading=False):
+        if cruise_speed <= 0 or acceleration <= 0 or yaw_rate <= 0:
+            raise ValueError("Cruise speed, acceleration and yaw rate must be positive")
+        if wind_speed < 0:
+            raise ValueError("Wind speed cannot be negative")
+        self.cruise_speed = float(cruise_speed)
+        self.acceleration = float(acceleration)
+        self.yaw_rate = float(yaw_rate)
+        self.photo_hold = float(photo_hold)
+        self.wind_speed = float(wind_speed)
+        self.wind_direction = float(wind_direction)
+        self.axial_photo_heading = bool(axial_photo_heading)
+
+    @classmethod
+    def from_options(cls, options):
+        """
+        Build a model from a client options dict, ignoring unknown keys.
+        """
+        names = ("cruise_speed", "acceleration", "yaw_rate", "photo_hold", "wind_speed", "wind_direction")
+        kwargs = {name: float(options[name]) for name in names if options.get(name) is not None}
+        kwargs["axial_photo_heading"] = bool(options.get("axial_photo_heading", False))
+        return cls(**kwargs)
+
+    def edge_costs(self, points, photo_heading=0.0):
+        """
+        n x n matrix of leg times (seconds) between local x/y points, from one heading table.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        dx = points[None, :, 0] - points[:, None, 0]
+        dy = points[None, :, 1] - points[:, None, 1]
+        distances = np.hypot(dx, dy)
+        # Compass heading of every leg, degrees clockwise from north
+        headings = np.degrees(np.arctan2(dx, dy))
+        costs = self.travel_time(distances, headings) + self.yaw_time(headings, photo_heading)
+        np.fill_diagonal(costs, 0)
+        return costs
+
+    def travel_time(self, distances, headings):
+        """
+        Stop-to-stop time over the given distances, averaged over both directions of travel.
+        """
+        # Tailwind component along the leg; the wind blows from wind_direction
+        tailwind = -self.wind_speed * np.cos(np.radians(headings - self.wind_direction))
+        forward = self._stop_to_stop_time(distances, self.cruise_speed + tailwind)
+        backward = self._stop_to_stop_time(distances, self.cruise_speed - tailwind)
+        return (forward + backward) / 2
+
+    def yaw_time(self, headings, photo_heading=0.0):
+        """
+        Time to yaw from the photo heading to the leg heading and back again at the next waypoint.
+        """
+        if not self.axial_photo_heading:
+            # Mean of both directions: the two turn angles always add up to 180 degrees
+            return np.full(np.shape(headings), 180.0 / self.yaw_rate)
+        return 2 * axial_angle_difference(headings, photo_heading) / self.yaw_rate
+
+    def photo_headings(self, points, tour, photo_heading=0.0):
+        """
+        Camera heading to use at every tour position: the photo heading or its opposite, whichever
+        needs the least yaw between the arrival and departure legs.
+        """
+        if not self.axial_photo_heading:
+            return [photo_heading] * len(tour)
+        ordered = np.asarray(points, dtype=float)[np.asarray(tour)]
+        delta = np.roll(ordered, -1, axis=0) - ordered
+        departure = np.degrees(np.arctan2(delta[:, 0], delta[:, 1]))
+        arrival = np.roll(departure, 1)
+        flipped = (photo_heading + 180) % 360
+        keep_cost = angle_difference(arrival, photo_heading) + angle_difference(photo_heading, departure)
+        flip_cost = angle_difference(arrival, flipped) + angle_difference(flipped, departure)
+        return np.where(flip_cost < keep_cost, flipped, photo_heading).tolist()
+
+    def _stop_to_stop_time(self, distances, speed):
+        """
+        Trapezoidal speed profile: accelerate, cruise, decelerate; triangular on short legs.
+        """
+        speed = np.maximum(speed, MIN_GROUND_SPEED)
+        ramp_distance = speed ** 2 / self.acceleration
+        return np.where(
+            distances >= ramp_distance,
+            distances / speed + speed / self.acceleration,
+            2 * np.sqrt(distances / self.acceleration)
+        )
+
+def angle_difference(a, b):
+    """
+    Smallest absolute difference between compass angles, in [0, 180].
+    """
+    return np.abs((np.asarray(a) - b + 180) % 360 - 180)
+
+def axial_angle_difference(a, b):
+    """
+    Smallest absolute difference between two axes (angles modulo 180), in [0, 90].
+    """
+    return np.abs((np.asarray(a) - b + 90) % 180 - 90)
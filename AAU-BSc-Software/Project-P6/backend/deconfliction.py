@@ -0,0 +1,229 @@
+import numpy as np
+import shapely
+
+from algorithm import project_ring
+from geo_utils import create_area_projection
+from flight_time import get_flight_time_model, DEFAULT_ALTITUDE
+from config import MAX_ALTITUDE
+
+#############################
+# Deconfliction Settings
+#############################
+
+MIN_SEPARATION = 10.0           # Meters two drones at the same altitude must stay apart
+LAYER_SEPARATION = 5.0          # Meters between the altitude layers given to conflicting drones
+DECONFLICTION_MODES = ("delay", "altitude")
+SEARCH_ITERATIONS = 60          # Ternary / bisection steps when solving for conflicting delays
+
+#############################
+# Trajectories
+#############################
+
+class Trajectory:
+    """
+    Time-parameterized 2D flight of one drone: straight segments flown at constant velocity from
+    position start[i] at time t0[i] to end[i] at t1[i]. Hovers (takeoff, photos, landing) are segments
+    with start == end. Times follow the calibrated flight time model.
+    """
+
+    def __init__(self, t0, t1, start, end):
+        self.t0 = np.asarray(t0, dtype=float)
+        self.t1 = np.asarray(t1, dtype=float)
+        self.start = np.asarray(start, dtype=float).reshape(-1, 2)
+        self.end = np.asarray(end, dtype=float).reshape(-1, 2)
+        duration = self.t1 - self.t0
+        self.velocity = np.divide(
+            self.end - self.start, duration[:, None], out=np.zeros_like(self.start), where=duration[:, None] > 0
+        )
+
+    @property
+    def duration(self):
+        return float(self.t1[-1]) if len(self.t1) else 0.0
+
+    def position(self, t):
+        """Positions at the times t (clamped to the flight)."""
+        t = np.clip(np.asarray(t, dtype=float), 0, self.duration)
+        index = np.clip(np.searchsorted(self.t1, t, side="left"), 0, len(self.t1) - 1)
+        return self.start[index] + self.velocity[index] * (t - self.t0[index])[..., None]
+
+def build_trajectory(points, photo_mask, altitude, model=None):
+    """
+    Trajectory through local points: hover for takeoff and ascent at the first point, fly every leg
+    (leg_time + travel_rate * distance), hover waypoint_time where photo_mask is set, hover to land
+    at the last point.
+    """
+    p = (model or get_flight_time_model()).parameters
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    legs = np.hypot(*np.diff(points, axis=0).T)
+    durations = [p["takeoff_time"] + p["ascend_rate"] * altitude]
+    starts, ends = [points[0]], [points[0]]
+    for k, leg in enumerate(legs):
+        durations.append(p["leg_time"] + p["travel_rate"] * leg)
+        starts.append(points[k])
+        ends.append(points[k + 1])
+        if photo_mask[k + 1]:
+            durations.append(p["waypoint_time"])
+            starts.append(points[k + 1])
+            ends.append(points[k + 1])
+    durations.append(p["landing_rate"] * altitude)
+    starts.append(points[-1])
+    ends.append(points[-1])
+    t1 = np.cumsum(durations)
+    return Trajectory(t1 - durations, t1, starts, ends)
+
+#############################
+# Conflict Detection
+#############################
+
+def conflicting_delays(fixed, moving, min_separation=MIN_SEPARATION):
+    """
+    Delay intervals (d_lo, d_hi) for which `moving`, departing d seconds after `fixed`, comes closer than
+    min_separation to it.
+
+    Only segment pairs whose paths come within min_separation of each other can conflict; they are found
+    with an STRtree over the fixed drone's segments. For one pair, the set of (time, delay) where the
+    drones are too close is convex, so the delays that conflict form an interval: the closest approach
+    f(d) is convex in d, and the interval ends are found by a ternary search for its minimum and
+    bisection for the crossings, vectorized over all candidate pairs.
+    """
+    moving_index, fixed_index = shapely.STRtree(_segment_geometries(fixed)).query(
+        _segment_geometries(moving), predicate="dwithin", distance=min_separation
+    )
+    keep = (moving.t1[moving_index] > moving.t0[moving_index]) & (fixed.t1[fixed_index] > fixed.t0[fixed_index])
+    fixed_index, moving_index = fixed_index[keep], moving_index[keep]
+    if not len(fixed_index):
+        return np.empty((0, 2))
+    # Delays for which the two segments overlap in time
+    lo = fixed.t0[fixed_index] - moving.t1[moving_index]
+    hi = fixed.t1[fixed_index] - moving.t0[moving_index]
+
+    def closest(delay):
+        return _closest_approach(fixed, moving, fixed_index, moving_index, delay)
+
+    # Ternary search for the delay of closest approach (closest is convex in the delay)
+    left, right = lo.copy(), hi.copy()
+    for _ in range(SEARCH_ITERATIONS):
+        third = (right - left) / 3
+        first, second = left + third, right - third
+        closer = closest(first) < closest(second)
+        right = np.where(closer, second, right)
+        left = np.where(closer, left, first)
+    best = (left + right) / 2
+    conflict = closest(best) < min_separation
+    lo, hi, best = lo[conflict], hi[conflict], best[conflict]
+    fixed_index, moving_index = fixed_index[conflict], moving_index[conflict]
+
+    def crossing(outside, inside):
+        """Bisection for the delay between outside (clear) and inside (conflict) where f = separation."""
+        for _ in range(SEARCH_ITERATIONS):
+            middle = (outside + inside) / 2
+            clear = _closest_approach(fixed, moving, fixed_index, moving_index, middle) >= min_separation
+            outside = np.where(clear, middle, outside)
+            inside = np.where(clear, inside, middle)
+        return outside
+
+    return np.column_stack((crossing(lo, best), crossing(hi, best)))
+
+def _closest_approach(fixed, moving, fixed_index, moving_index, delay):
+    """
+    Smallest distance between segment pairs when the moving drone departs `delay` seconds later,
+    over the time both segments are flown (inf when they never overlap in time).
+    """
+    start = np.maximum(fixed.t0[fixed_index], moving.t0[moving_index] + delay)
+    stop = np.minimum(fixed.t1[fixed_index], moving.t1[moving_index] + delay)
+    fixed_velocity = fixed.velocity[fixed_index]
+    moving_velocity = moving.velocity[moving_index]
+    # Relative position at `start` and relative velocity, both linear over the overlap
+    offset = (
+        fixed.start[fixed_index] + fixed_velocity * (start - fixed.t0[fixed_index])[:, None]
+        - moving.start[moving_index] - moving_velocity * (start - delay - moving.t0[moving_index])[:, None]
+    )
+    relative = fixed_velocity - moving_velocity
+    speed = (relative ** 2).sum(axis=1)
+    duration = np.clip(stop - start, 0, None)
+    at = np.clip(np.divide(-(offset * relative).sum(axis=1), speed, out=np.zeros_like(speed), where=speed > 0),
+                 0, duration)
+    distance = np.hypot(*(offset + relative * at[:, None]).T)
+    return np.where(stop >= start, distance, np.inf)
+
+def _segment_geometries(trajectory):
+    """Line of every segment, or its point for hovers."""
+    lines = shapely.linestrings(np.stack((trajectory.start, trajectory.end), axis=1))
+    return np.where(shapely.length(lines) > 0, lines, shapely.points(trajectory.start))
+
+def earliest_clear_delay(intervals):
+    """Smallest delay >= 0 outside every open (d_lo, d_hi) interval."""
+    delay = 0.0
+    for low, high in sorted(map(tuple, intervals)):
+        if low >= delay:
+            break
+        delay = max(delay, high)
+    return delay
+
+#############################
+# Deconfliction
+#############################
+
+def deconflict_plans(plans, mode="delay", min_separation=MIN_SEPARATION, model=None):
+    """
+    Keep every pair of drones at least min_separation apart.
+
+    mode="delay" gives each drone the smallest departure delay that clears it from the drones already
+    scheduled, longest flights first so the makespan grows as little as possible. mode="altitude"
+    keeps everyone departing together and gives drones that would conflict different altitude layers
+    (greedy colouring of the conflict graph), LAYER_SEPARATION apart above the planned altitude; it raises
+    ValueError when the layers don't fit below MAX_ALTITUDE. Returns {"mode", "delays", "altitudes", "conflicts"},
+    where conflicts is the number of drone pairs that conflicted without deconfliction.
+    """
+    if mode not in DECONFLICTION_MODES:
+        raise ValueError(f"Unknown deconfliction mode '{mode}', expected one of {DECONFLICTION_MODES}")
+    model = model or get_flight_time_model()
+    routes = [
+        [(waypoint["lat"], waypoint["lon"]) for waypoint in plan["path"]]
+        for plan in plans
+    ]
+    altitudes = [plan["metadata"].get("altitude") or DEFAULT_ALTITUDE for plan in plans]
+    flying = [k for k, route in enumerate(routes) if route]
+    if not flying:
+        return {"mode": mode, "delays": [0.0] * len(plans), "altitudes": altitudes, "conflicts": 0}
+    projection = create_area_projection([point for k in flying for point in routes[k]])
+    trajectories = {}
+    for k in flying:
+        photo_mask = [waypoint["type"] == "grid_center" for waypoint in plans[k]["path"]]
+        trajectories[k] = build_trajectory(project_ring(routes[k], projection), photo_mask, altitudes[k], model)
+    pair_intervals = {}
+    for a in flying:
+        for b in flying:
+            if a < b:
+                intervals = conflicting_delays(trajectories[a], trajectories[b], min_separation)
+                pair_intervals[(a, b)] = intervals
+                # a departing d after b conflicts exactly when b departing -d after a does
+                pair_intervals[(b, a)] = -intervals[:, ::-1]
+    conflicts = {
+        (a, b) for (a, b), intervals in pair_intervals.items()
+        if a < b and np.any((intervals[:, 0] < 0) & (intervals[:, 1] > 0))
+    }
+    delays = [0.0] * len(plans)
+    if mode == "delay":
+        scheduled = []
+        for k in sorted(flying, key=lambda k: -trajectories[k].duration):
+            # Intervals are relative to each scheduled drone's own delay
+            intervals = [pair_intervals[(other, k)] + delays[other] for other in scheduled]
+            delays[k] = float(earliest_clear_delay(np.concatenate(intervals))) if intervals else 0.0
+            scheduled.append(k)
+    else:
+        layers = {}
+        degree = {k: sum(k in pair for pair in conflicts) for k in flying}
+        for k in sorted(flying, key=lambda k: -degree[k]):
+            taken = {layers[other] for other in layers if (min(k, other), max(k, other)) in conflicts}
+            layers[k] = next(layer for layer in range(len(flying)) if layer not in taken)
+        altitudes = [
+            altitude + LAYER_SEPARATION * layers.get(k, 0) for k, altitude in enumerate(altitudes)
+        ]
+        if max(altitudes) > MAX_ALTITUDE:
+            # Layers are only stacked upwards: flying lower shrinks the camera footprint and leaves gaps
+            raise ValueError(
+                f"{max(layers.values()) + 1} altitude layers {LAYER_SEPARATION:g} m apart do not fit below "
+                f"{MAX_ALTITUDE} m; plan at a lower altitude or use delay deconfliction"
+            )
+    return {"mode": mode, "delays": delays, "altitudes": altitudes, "conflicts": len(conflicts)}
@@ -0,0 +1,102 @@
+import numpy as np
+from geo_utils import create_area_projection, create_local_projection
+
+#############################
+# Distance Settings
+#############################
+
+EARTH_RADIUS = 6371000          # meters
+DISTANCE_METHODS = ("local", "haversine")
+COMPACT_THRESHOLD = 2000        # Matrices with more points than this are stored as float32
+ROW_BLOCK_SIZE = 1024           # Rows computed at a time, so large matrices need no float64 temporaries
+
+#############################
+# Distance Matrix Functions
+#############################
+
+def build_distance_matrix(centers, method="local", dtype=None):
+    """
+    Build the full n x n distance matrix (meters) between (lat, lon) centers in one broadcast.
+
+    method="local" measures straight-line distances in the local projection around the centroid,
+    method="haversine" measures great-circle distances. The matrix is float64 unless `dtype` is given
+    or there are more than COMPACT_THRESHOLD centers, in which case float32 halves the memory use.
+    """
+    points = np.asarray(centers, dtype=float).reshape(-1, 2)
+    if method == "local":
+        return local_distance_matrix(create_area_projection(points).local_coords(points[:, ::-1]), dtype)
+    if method == "haversine":
+        return _compact(haversine_distances(points[:, None, :], points[None, :, :]), dtype)
+    raise ValueError(f"Unknown distance method '{method}', expected one of {DISTANCE_METHODS}")
+
+def local_distance_matrix(points, dtype=None):
+    """
+    Build the distance matrix between points that are already in local x/y meters.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+    matrix = np.empty((len(points), len(points)), dtype=_matrix_dtype(len(points), dtype))
+    for start in range(0, len(points), ROW_BLOCK_SIZE):
+        rows = slice(start, start + ROW_BLOCK_SIZE)
+        matrix[rows] = np.hypot(x[rows, None] - x[None, :], y[rows, None] - y[None, :])
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+def haversine_distances(origins, targets):
+    """
+    Great-circle distance (meters) between broadcastable arrays of (lat, lon) pairs in degrees.
+    """
+    origins = np.radians(np.asarray(origins, dtype=float))
+    targets = np.radians(np.asarray(targets, dtype=float))
+    lat1, lon1 = origins[..., 0], origins[..., 1]
+    lat2, lon2 = targets[..., 0], targets[..., 1]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def find_nearest_index(centers, point, method="local"):
+    """
+    Return the index of the center closest to a (lat, lon) point.
+    """
+    points = np.asarray(centers, dtype=float).reshape(-1, 2)
+    lat, lon = float(point[0]), float(point[1])
+    if method == "local":
+        x, y = _project(points, lat, lon)
+        distances = np.hypot(x, y)
+    elif method == "haversine":
+        distances = haversine_distances((lat, lon), points)
+    else:
+        raise ValueError(f"Unknown distance method '{method}', expected one of {DISTANCE_METHODS}")
+    return int(np.argmin(distances))
+
+def nearest_neighbor_tour(distances, start_idx=0):
+    """
+    Construct a tour by repeatedly moving to the closest unvisited point.
+    """
+    n = len(distances)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start_idx]
+    visited[start_idx] = True
+    current = start_idx
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, distances[current])
+        current = int(np.argmin(row))
+        visited[current] = True
+        tour.append(current)
+    return tour
+
+def _matrix_dtype(n, dtype=None):
+    if dtype is None:
+        dtype = np.float32 if n > COMPACT_THRESHOLD else np.float64
+    return dtype
+
+def _compact(matrix, dtype=None):
+    matrix = matrix.astype(_matrix_dtype(len(matrix), dtype), copy=False)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+def _project(points, center_lat, center_lon):
+    """
+    Project (lat, lon) rows into local x/y meters around the given center.
+    """
+    to_local, _ = create_local_projection(center_lat, center_lon)
+    return to_local(points[:, 1], points[:, 0])
@@ -0,0 +1,226 @@
+import datetime
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+from distance_matrix import haversine_distances
+
+#############################
+# Flight Time Settings
+#############################
+
+# Defaults match the original benchmark-based estimate
+DEFAULT_PARAMETERS = {
+    "takeoff_time": 6.0,        # s
+    "ascend_rate": 0.5,         # s per meter of altitude
+    "leg_time": 0.0,            # s per leg (acceleration and braking)
+    "travel_rate": 0.5,         # s per meter flown
+    "waypoint_time": 20.0,      # s per waypoint (rotate, photo, rotate)
+    "landing_rate": 0.5,        # s per meter of altitude
+}
+# Regression per flight phase: the parameters it fits, in design matrix column order
+PHASE_PARAMETERS = {
+    "takeoff": ("takeoff_time",),
+    "ascend": ("ascend_rate",),
+    "travel": ("leg_time", "travel_rate"),
+    "waypoint": ("waypoint_time",),
+    "landing": ("landing_rate",),
+}
+DEFAULT_ALTITUDE = 20          # m, assumed when the caller does not pass the mission altitude
+MOVE_ACTIONS = ("move_to_start_point", "move_to_waypoint", "return_to_drone_start_point")
+WAYPOINT_END_ACTIONS = MOVE_ACTIONS + ("land",)
+
+_model = None
+_model_lock = threading.Lock()
+
+#############################
+# Flight Time Model
+#############################
+
+class FlightTimeModel:
+    """
+    Flight time estimate with per-phase durations fitted by least squares to recorded missions.
+
+    Only the normal equations (X^T X, X^T y) of every phase are kept, so missions can be added one at a
+    time and the fit redone without reading older logs again. Phases without samples keep the defaults.
+    """
+
+    def __init__(self, statistics=None, missions=None):
+        self.statistics = statistics or {
+            phase: {
+                "xtx": np.zeros((len(names), len(names))).tolist(),
+                "xty": [0.0] * len(names),
+                "samples": 0
+            } for phase, names in PHASE_PARAMETERS.items()
+        }
+        self.missions = set(missions or [])
+        self.parameters = dict(DEFAULT_PARAMETERS)
+        self.fit()
+
+    def estimate(self, total_distance, waypoint_count, altitude):
+        """
+        Estimated mission time (seconds) for a tour of waypoint_count legs over total_distance meters.
+        """
+        p = self.parameters
+        return (
+            p["takeoff_time"]
+            + p["ascend_rate"] * altitude
+            + waypoint_count * (p["waypoint_time"] + p["leg_time"])
+            + p["travel_rate"] * total_distance
+            + p["landing_rate"] * altitude
+        )
+
+    def add_mission(self, name, log):
+        """
+        Add the phase samples of one mission log (list of timestamped actions). Returns the sample count.
+        """
+        samples = extract_phase_samples(log)
+        for phase, row, duration in samples:
+            x = np.asarray(row, dtype=float)
+            stats = self.statistics[phase]
+            stats["xtx"] = (np.asarray(stats["xtx"]) + np.outer(x, x)).tolist()
+            stats["xty"] = (np.asarray(stats["xty"]) + x * duration).tolist()
+            stats["samples"] += 1
+        self.missions.add(name)
+        return len(samples)
+
+    def fit(self):
+        self.parameters = dict(DEFAULT_PARAMETERS)
+        for phase, names in PHASE_PARAMETERS.items():
+            stats = self.statistics[phase]
+            if not stats["samples"]:
+                continue
+            # Minimum-norm solution when the samples cannot separate the parameters (e.g. one leg length)
+            solution = np.linalg.lstsq(np.asarray(stats["xtx"]), np.asarray(stats["xty"]), rcond=None)[0]
+            self.parameters.update(zip(names, solution.tolist()))
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "parameters": self.parameters,
+                "statistics": self.statistics,
+                "missions": sorted(self.missions),
+            }, f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved model, or return an uncalibrated one if the file is missing or unreadable.
+        """
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls(data["statistics"], data["missions"])
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Could not load flight time model {path}, starting over: {e}")
+            return cls()
+
+#############################
+# Calibration Functions
+#############################
+
+def calibrate_flight_time_model(missions_dir, model_path):
+    """
+    Fold every mission in missions_dir that the saved model has not seen yet into the fit, save it,
+    and make it the model used for flight time estimates.
+    """
+    model = FlightTimeModel.load(model_path)
+    added = 0
+    if os.path.isdir(missions_dir):
+        for name in sorted(os.listdir(missions_dir)):
+            if name in model.missions:
+                continue
+            log_path = os.path.join(missions_dir, name, "log.json")
+            try:
+                with open(log_path, "r") as f:
+                    log = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logging.warning(f"Skipping mission log {log_path}: {e}")
+                continue
+            model.add_mission(name, log)
+            added += 1
+    if added:
+        model.fit()
+        model.save(model_path)
+        logging.info(f"Flight time model calibrated with {added} new mission(s): {model.parameters}")
+    set_flight_time_model(model)
+    return model
+
+def extract_phase_samples(log):
+    """
+    Turn a mission log into (phase, design row, duration) samples. The duration of an action is the
+    time until the next logged action.
+    """
+    events = sorted(log, key=lambda entry: entry.get("timestamp", ""))
+    times = [_parse_timestamp(entry.get("timestamp")) for entry in events]
+    home = next(((e["lat"], e["lon"]) for e in events if e.get("action") == "return_to_drone_start_point"), None)
+    position = home
+    altitude = None
+    samples = []
+    for i, entry in enumerate(events[:-1]):
+        action = entry.get("action")
+        duration = _duration(times, i, i + 1)
+        if action == "takeoff" and duration:
+            samples.append(("takeoff", (1.0,), duration))
+        elif action == "ascend":
+            altitude = float(entry.get("altitude", 0))
+            if duration and altitude > 0:
+                samples.append(("ascend", (altitude,), duration))
+        elif action in MOVE_ACTIONS:
+            target = (entry["lat"], entry["lon"])
+            # Moves end when the next action (rotate, photo or land) is logged
+            if duration and position is not None:
+                distance = float(haversine_distances(position, target))
+                samples.append(("travel", (1.0, distance), duration))
+            position = target
+        elif action == "rotate_drone":
+            # Everything done at the waypoint until the drone sets off again
+            end = next(
+                (j for j in range(i + 1, len(events)) if events[j].get("action") in WAYPOINT_END_ACTIONS), None
+            )
+            hold = _duration(times, i, end) if end is not None else None
+            if hold:
+                samples.append(("waypoint", (1.0,), hold))
+        elif action == "land" and altitude:
+            if duration:
+                samples.append(("landing", (altitude,), duration))
+    return samples
+
+def _parse_timestamp(timestamp):
+    try:
+        return datetime.datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+
+def _duration(times, start, end):
+    if times[start] is None or times[end] is None:
+        return None
+    seconds = (times[end] - times[start]).total_seconds()
+    return seconds if seconds > 0 else None
+
+#############################
+# Shared Model
+#############################
+
+def get_flight_time_model():
+    """
+    Return the model used for flight time estimates, uncalibrated until one is set.
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = FlightTimeModel()
+        return _model
+
+def set_flight_time_model(model):
+    global _model
+    with _model_lock:
+        _model = model
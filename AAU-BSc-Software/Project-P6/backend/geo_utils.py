@@ -1,26 +1,129 @@
 import math
+import numpy as np
 
-def create_local_projection(center_lat, center_lon):
-    """Create a local projection for converting between geographic and local coordinates"""
-    # Conversion factors
-    lat_to_m = 111320  # approximate meters per degree of latitude
+#############################
+# Projection Settings
+#############################
+
+METERS_PER_DEGREE = 111320      # Approximate meters per degree of latitude (equirectangular mode)
+ACCURATE_PROJECTION_SPAN = 5000 # Meters of area extent above which the ellipsoidal projection is used
+WGS84_A = 6378137.0             # WGS84 semi-major axis in meters
+WGS84_F = 1 / 298.257223563     # WGS84 flattening
+
+#############################
+# Local Projection
+#############################
+
+class LocalProjection:
+    """
+    Projection between geographic (lon, lat) and local (x, y) meters around a center point.
+
+    to_local and to_wgs84 accept scalars or NumPy arrays. local_coords and wgs84_coords map (N, 2)
+    arrays of (lon, lat) / (x, y) rows and can be passed to shapely.transform directly. The default
+    equirectangular mode is exact enough for single fields; accurate=True uses a transverse Mercator
+    projection of the WGS84 ellipsoid (Krueger series, millimeter accuracy hundreds of km out).
+    Unpacks as (to_local, to_wgs84), like the pair of functions create_local_projection used to return.
+    """
+
+    def __init__(self, center_lat, center_lon, accurate=False):
+        self.center_lat = center_lat
+        self.center_lon = center_lon
+        self.accurate = accurate
+        self.lat_to_m = METERS_PER_DEGREE
+        self.lon_to_m = METERS_PER_DEGREE * math.cos(math.radians(center_lat))
+        if accurate:
+            n = WGS84_F / (2 - WGS84_F)
+            self._n = n
+            self._radius = WGS84_A / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64)
+            self._alpha = np.array([
+                n / 2 - 2 * n ** 2 / 3 + 5 * n ** 3 / 16 + 41 * n ** 4 / 180,
+                13 * n ** 2 / 48 - 3 * n ** 3 / 5 + 557 * n ** 4 / 1440,
+                61 * n ** 3 / 240 - 103 * n ** 4 / 140,
+                49561 * n ** 4 / 161280,
+            ])
+            self._beta = np.array([
+                n / 2 - 2 * n ** 2 / 3 + 37 * n ** 3 / 96 - n ** 4 / 360,
+                n ** 2 / 48 + n ** 3 / 15 - 437 * n ** 4 / 1440,
+                17 * n ** 3 / 480 - 37 * n ** 4 / 840,
+                4397 * n ** 4 / 161280,
+            ])
+            self._delta = np.array([
+                2 * n - 2 * n ** 2 / 3 - 2 * n ** 3 + 116 * n ** 4 / 45,
+                7 * n ** 2 / 3 - 8 * n ** 3 / 5 - 227 * n ** 4 / 45,
+                56 * n ** 3 / 15 - 136 * n ** 4 / 35,
+                4279 * n ** 4 / 630,
+            ])
+            self._origin_y = 0.0
+            self._origin_y = float(self._tm_forward(center_lon, center_lat)[1])
 
-    # Calculate longitude conversion factor at given latitude
-    lon_to_m = 111320 * math.cos(math.radians(center_lat))
+    def __iter__(self):
+        return iter((self.to_local, self.to_wgs84))
 
-    # Convert to local coordinates (meters)
-    def to_local(lon, lat):
-        x = (lon - center_lon) * lon_to_m
-        y = (lat - center_lat) * lat_to_m
+    def to_local(self, lon, lat):
+        """Convert geographic coordinates to local meters (x east, y north)"""
+        if self.accurate:
+            return self._tm_forward(lon, lat)
+        x = (lon - self.center_lon) * self.lon_to_m
+        y = (lat - self.center_lat) * self.lat_to_m
         return (x, y)
 
-    # Convert back to geographic coordinates
-    def to_wgs84(x, y):
-        lon = center_lon + (x / lon_to_m)
-        lat = center_lat + (y / lat_to_m)
+    def to_wgs84(self, x, y):
+        """Convert local meters back to geographic coordinates"""
+        if self.accurate:
+            return self._tm_inverse(x, y)
+        lon = self.center_lon + (x / self.lon_to_m)
+        lat = self.center_lat + (y / self.lat_to_m)
         return (lon, lat)
 
-    return to_local, to_wgs84
+    def local_coords(self, coords):
+        """(N, 2) array of (lon, lat) rows to (N, 2) local (x, y) rows"""
+        coords = np.asarray(coords, dtype=float)
+        return np.stack(self.to_local(coords[..., 0], coords[..., 1]), axis=-1)
+
+    def wgs84_coords(self, coords):
+        """(N, 2) array of local (x, y) rows to (N, 2) (lon, lat) rows"""
+        coords = np.asarray(coords, dtype=float)
+        return np.stack(self.to_wgs84(coords[..., 0], coords[..., 1]), axis=-1)
+
+    def _tm_forward(self, lon, lat):
+        phi = np.radians(lat)
+        lam = np.radians(np.subtract(lon, self.center_lon))
+        e = 2 * math.sqrt(self._n) / (1 + self._n)
+        t = np.sinh(np.arctanh(np.sin(phi)) - e * np.arctanh(e * np.sin(phi)))
+        xi_p = np.arctan2(t, np.cos(lam))
+        eta_p = np.arctanh(np.sin(lam) / np.sqrt(1 + t ** 2))
+        j = np.arange(1, 5).reshape((4,) + (1,) * np.ndim(xi_p))
+        alpha = self._alpha.reshape(j.shape)
+        xi = xi_p + np.sum(alpha * np.sin(2 * j * xi_p) * np.cosh(2 * j * eta_p), axis=0)
+        eta = eta_p + np.sum(alpha * np.cos(2 * j * xi_p) * np.sinh(2 * j * eta_p), axis=0)
+        return self._radius * eta, self._radius * xi - self._origin_y
+
+    def _tm_inverse(self, x, y):
+        xi = (np.asarray(y, dtype=float) + self._origin_y) / self._radius
+        eta = np.asarray(x, dtype=float) / self._radius
+        j = np.arange(1, 5).reshape((4,) + (1,) * np.ndim(xi))
+        beta = self._beta.reshape(j.shape)
+        xi_p = xi - np.sum(beta * np.sin(2 * j * xi) * np.cosh(2 * j * eta), axis=0)
+        eta_p = eta - np.sum(beta * np.cos(2 * j * xi) * np.sinh(2 * j * eta), axis=0)
+        chi = np.arcsin(np.sin(xi_p) / np.cosh(eta_p))
+        phi = chi + np.sum(self._delta.reshape(j.shape) * np.sin(2 * j * chi), axis=0)
+        lam = np.arctan2(np.sinh(eta_p), np.cos(xi_p))
+        return self.center_lon + np.degrees(lam), np.degrees(phi)
+
+def create_local_projection(center_lat, center_lon, accurate=False):
+    """Create a local projection for converting between geographic and local coordinates"""
+    return LocalProjection(center_lat, center_lon, accurate=accurate)
+
+def create_area_projection(coordinates):
+    """
+    Local projection centered on (lat, lon) coordinates, switching to the ellipsoidal mode when the
+    area spans more than ACCURATE_PROJECTION_SPAN, where the equirectangular approximation drifts.
+    """
+    points = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    center_lat, center_lon = points.mean(axis=0)
+    lat_span, lon_span = np.ptp(points, axis=0)
+    span = max(lat_span * METERS_PER_DEGREE, lon_span * METERS_PER_DEGREE * math.cos(math.radians(center_lat)))
+    return LocalProjection(float(center_lat), float(center_lon), accurate=span > ACCURATE_PROJECTION_SPAN)
 
 def calculate_grid_size(altitude):
     """Calculate the grid size based on the altitude and rectilinear camera parameters"""
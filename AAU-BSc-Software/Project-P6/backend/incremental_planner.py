@@ -0,0 +1,265 @@
+import datetime
+import math
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from shapely.affinity import rotate
+
+from algorithm import (
+    calculate_cell_geometry, calculate_cell_coverage, calculate_coverage_metrics, calculate_zone_overlap,
+    calculate_flyable_cells, rotate_points, build_tour_output, format_plan, project_ring, project_rings,
+    route_around_zones
+)
+from geo_utils import create_area_projection, calculate_grid_size
+from local_search import improve_tour, PointDistances
+from distance_matrix import local_distance_matrix, nearest_neighbor_tour
+from no_fly import get_no_fly_zones
+
+#############################
+# Incremental Planner
+#############################
+
+class PlannerSession:
+    """
+    Planner state for one interactive editing session.
+
+    The local projection and the cell lattice are fixed when the session is created, and the
+    intersection area of every cell touching the polygon is kept. When the polygon is edited only the
+    cells touching the changed region are recomputed, and the previous tour is repaired locally
+    (dropped cells removed, new cells inserted, local search around the edit) instead of re-solved.
+    The first plan matches calculate_grid_placement exactly; later plans keep the original lattice
+    origin so cells do not shift under the user while dragging.
+    holes and exclusion_zones are fixed for the session and handled as in calculate_grid_placement; the
+    tour is routed around the zones after every plan. A client changing them starts a new session.
+    """
+
+    def __init__(self, coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None,
+                 rotation=0, holes=None, exclusion_zones=None):
+        self.altitude = altitude
+        self.overlap = overlap
+        self.coverage = coverage
+        self.start_point = start_point
+        self.drone_start_point = drone_start_point
+        self.rotation = rotation
+        # The session keeps the projection of the first polygon, so the lattice stays put while editing
+        self.projection = create_area_projection(coordinates)
+        self.holes = project_rings(holes or [], self.projection)
+        self.zones = shapely.get_parts(shapely.union_all(project_rings(exclusion_zones or [], self.projection)))
+        if rotation:
+            self.holes = shapely.transform(self.holes, lambda points: rotate_points(points, rotation))
+            self.zones = shapely.transform(self.zones, lambda points: rotate_points(points, rotation))
+        self.no_fly = get_no_fly_zones(exclusion_zones) if len(self.zones) else None
+        self.grid_width, self.grid_height = calculate_grid_size(altitude)
+        self.step_x = self.grid_width * (1 - overlap / 100)
+        self.step_y = self.grid_height * (1 - overlap / 100)
+        self.polygon, self.polygon_area = self._local_polygon(coordinates)
+        minx, miny, _, _ = self.polygon.bounds
+        self.origin = (minx, miny)
+        self.domain = self._domain(self.polygon)
+        # (row, col) -> (intersection area, cell area) for every cell touching the polygon
+        self.cells = {}
+        self._evaluate(self._domain_cells(self.domain))
+        self.tour = []
+        self.result = self._plan(recomputed=len(self.cells), incremental=False)
+
+    def update(self, coordinates):
+        """
+        Re-plan after the polygon has been edited and return the new plan.
+        """
+        polygon, self.polygon_area = self._local_polygon(coordinates)
+        changed = self.polygon.symmetric_difference(polygon)
+        domain = self._domain(polygon)
+        # Cells outside the new lattice extent are dropped, cells new to the extent are evaluated
+        self.cells = {key: value for key, value in self.cells.items() if self._in_domain(key, domain)}
+        recompute = {key for key in self._domain_cells(domain) if not self._in_domain(key, self.domain)}
+        if not changed.is_empty:
+            nearby = [key for key in self._cells_in_bounds(changed.bounds, domain) if key not in recompute]
+            if nearby:
+                _, corners = self._cell_geometry(nearby)
+                touched = shapely.intersects(changed, shapely.polygons(corners))
+                recompute.update(key for key, hit in zip(nearby, touched) if hit)
+        self.polygon = polygon
+        self.domain = domain
+        for key in recompute:
+            self.cells.pop(key, None)
+        self._evaluate(sorted(recompute))
+        self.result = self._plan(recomputed=len(recompute), incremental=True)
+        return self.result
+
+    def _local_polygon(self, coordinates):
+        polygon = Polygon(project_ring(coordinates, self.projection))
+        if self.rotation:
+            polygon = rotate(polygon, self.rotation, origin=(0, 0))
+        if len(self.holes):
+            polygon = polygon.difference(shapely.union_all(self.holes))
+        # The area to search leaves out the no-fly zones, as in calculate_grid_placement
+        area = polygon.area - float(shapely.area(shapely.intersection(self.zones, polygon)).sum())
+        return polygon, area
+
+    def _domain(self, polygon):
+        """
+        Row and column ranges the full planner would lay out for this polygon, on the session lattice.
+        """
+        minx, miny, maxx, maxy = polygon.bounds
+        origin_x, origin_y = self.origin
+        col_start = math.floor((minx - origin_x) / self.step_x)
+        row_start = math.floor((miny - origin_y) / self.step_y)
+        col_end = max(math.ceil((maxx - origin_x) / self.step_x), col_start + 1)
+        row_end = max(math.ceil((maxy - origin_y) / self.step_y), row_start + 1)
+        return row_start, row_end, col_start, col_end
+
+    @staticmethod
+    def _in_domain(key, domain):
+        row_start, row_end, col_start, col_end = domain
+        return row_start <= key[0] < row_end and col_start <= key[1] < col_end
+
+    @staticmethod
+    def _domain_cells(domain):
+        row_start, row_end, col_start, col_end = domain
+        return [(row, col) for row in range(row_start, row_end) for col in range(col_start, col_end)]
+
+    def _cells_in_bounds(self, bounds, domain):
+        """
+        Domain cells whose boxes may overlap the given bounding box.
+        """
+        minx, miny, maxx, maxy = bounds
+        origin_x, origin_y = self.origin
+        row_start, row_end, col_start, col_end = domain
+        first_col = max(col_start, math.floor((minx - origin_x - self.grid_width) / self.step_x))
+        last_col = min(col_end - 1, math.ceil((maxx - origin_x) / self.step_x))
+        first_row = max(row_start, math.floor((miny - origin_y - self.grid_height) / self.step_y))
+        last_row = min(row_end - 1, math.ceil((maxy - origin_y) / self.step_y))
+        return [(row, col) for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)]
+
+    def _cell_geometry(self, keys):
+        rows = np.array([key[0] for key in keys])
+        cols = np.array([key[1] for key in keys])
+        return calculate_cell_geometry(
+            self.origin[0], self.origin[1], rows, cols, self.step_x, self.step_y, self.grid_width, self.grid_height
+        )
+
+    def _evaluate(self, keys):
+        if not keys:
+            return
+        centers, corners = self._cell_geometry(keys)
+        cells = shapely.polygons(corners)
+        intersects, intersection_areas, grid_areas = calculate_cell_coverage(self.polygon, cells)
+        if len(self.zones):
+            # Cells hovering too close to a zone are never flown, so they are not kept at all
+            intersection_areas = intersection_areas - calculate_zone_overlap(self.polygon, self.zones, cells)
+            intersects = intersects & calculate_flyable_cells(self.zones, centers)
+        for key, hit, intersection_area, grid_area in zip(keys, intersects, intersection_areas, grid_areas):
+            if hit:
+                self.cells[key] = (float(intersection_area), float(grid_area))
+
+    def _selected(self):
+        return {
+            key for key, (intersection_area, grid_area) in self.cells.items()
+            if intersection_area / grid_area >= self.coverage
+        }
+
+    def _tsp_start(self):
+        point = self.start_point if self.start_point else self.drone_start_point
+        if not point:
+            return None, None
+        local = project_ring([point], self.projection)
+        if self.rotation:
+            local = rotate_points(local, self.rotation)
+        return point, local[0]
+
+    def _plan(self, recomputed, incremental):
+        selected = self._selected()
+        if not selected:
+            raise ValueError("No grids could be placed. Please enlarge the area or reduce minimum coverage.")
+        tsp_start, start_local = self._tsp_start()
+        if incremental and self.tour:
+            keys, active = self._repair_tour(selected)
+        else:
+            keys, active = sorted(selected), None
+        centers, corners = self._cell_geometry(keys)
+        start = int(np.argmin(np.hypot(*(centers - start_local).T))) if start_local is not None else 0
+        if active is None:
+            # First plan: full construction and improvement, as optimize_tsp_path does
+            distances = local_distance_matrix(centers)
+            tour = improve_tour(nearest_neighbor_tour(distances, start), distances)
+        else:
+            distances = PointDistances(centers)
+            tour = list(range(start, len(keys))) + list(range(start))
+            tour = improve_tour(tour, distances, kicks=0, active=active, verify=False)
+        self.tour = [keys[i] for i in tour]
+        return self._format(keys, centers, corners, tour, distances, tsp_start, recomputed, incremental)
+
+    def _repair_tour(self, selected):
+        """
+        Remove dropped cells from the previous tour and insert new cells where they lengthen it the least.
+        Returns the keys in tour order and the tour positions whose neighbourhood must be re-optimized.
+        """
+        keys = [key for key in self.tour if key in selected]
+        kept = set(keys)
+        removed_neighbors = set()
+        for i, key in enumerate(self.tour):
+            if key not in selected:
+                removed_neighbors.add(self.tour[i - 1])
+                removed_neighbors.add(self.tour[(i + 1) % len(self.tour)])
+        added = sorted(selected - kept)
+        if not keys:
+            keys, added = added[:1], added[1:]
+        points = list(self._cell_geometry(keys)[0]) if keys else []
+        if added:
+            added_centers = self._cell_geometry(added)[0]
+            for key, center in zip(added, added_centers):
+                tour_points = np.array(points)
+                following = np.roll(tour_points, -1, axis=0)
+                cost = (np.hypot(*(tour_points - center).T) + np.hypot(*(following - center).T)
+                        - np.hypot(*(tour_points - following).T))
+                position = int(np.argmin(cost)) + 1
+                keys.insert(position, key)
+                points.insert(position, center)
+        changed = (set(added) | removed_neighbors) & selected
+        active = [i for i, key in enumerate(keys) if key in changed]
+        return keys, active
+
+    def _format(self, keys, centers, corners, tour, distances, tsp_start, recomputed, incremental):
+        if self.rotation:
+            centers = rotate_points(centers, -self.rotation)
+            corners = rotate_points(corners, -self.rotation)
+        center_lon, center_lat = self.projection.to_wgs84(centers[:, 0], centers[:, 1])
+        corner_lon, corner_lat = self.projection.to_wgs84(corners[:, :, 0], corners[:, :, 1])
+        grid_data = [{
+            "center": center,
+            "corners": list(zip(corner_lats, corner_lons)),
+            "coverage": self.cells[key][0] / self.cells[key][1],
+            "rotation": self.rotation,
+            "row": key[0],
+            "col": key[1]
+        } for key, center, corner_lats, corner_lons in zip(
+            keys, zip(center_lat.tolist(), center_lon.tolist()), corner_lat.tolist(), corner_lon.tolist()
+        )]
+        optimized_grid_data, waypoints, path_metrics = build_tour_output(
+            grid_data, tour, distances, tsp_start, self.altitude
+        )
+        covered_area, extra_area, _, _ = calculate_coverage_metrics(
+            self.polygon, self.origin[0], self.origin[1], np.array([key[0] for key in keys]),
+            np.array([key[1] for key in keys]), self.step_x, self.step_y, self.grid_width, self.grid_height,
+            zones=self.zones
+        )
+        if self.no_fly is not None:
+            # The tour is not costed with routed distances, so the detours are priced in afterwards
+            waypoints = route_around_zones(
+                waypoints, path_metrics, self.no_fly, None if self.start_point else self.drone_start_point,
+                self.altitude, reprice=True
+            )
+        return format_plan(optimized_grid_data, waypoints, path_metrics, {
+            "altitude": self.altitude,
+            "overlap_percent": self.overlap,
+            "rotation": self.rotation,
+            "start_point": self.start_point,
+            "drone_start_point": self.drone_start_point,
+            "created_at": datetime.datetime.now().isoformat(),
+            "polygon_area": self.polygon_area,
+            "not_searched_area": self.polygon_area - covered_area,
+            "extra_area": extra_area,
+            "incremental": incremental,
+            "recomputed_cells": recomputed,
+        })
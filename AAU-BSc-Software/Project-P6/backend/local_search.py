@@ -0,0 +1,392 @@
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+#############################
+# Local Search Settings
+#############################
+
+NEIGHBOR_COUNT = 10        # Candidate neighbours examined per city
+OR_OPT_MAX_SEGMENT = 3     # Longest segment moved by an Or-opt move
+IMPROVEMENT_EPSILON = 1e-7 # Minimum gain (in metres) for a move to count as an improvement
+CHECK_BLOCK_SIZE = 256     # Rows per block in the vectorized 2-opt check
+KICK_COUNT = 300           # Double-bridge perturbations tried after the first local optimum
+KICK_WINDOW = 30           # Tour positions spanned by one perturbation
+DEADLINE_CHECK_INTERVAL = 64  # Queue pops between deadline checks
+LIST_MATRIX_MAX_CITIES = 2000 # Larger matrices are indexed in place instead of copied into Python lists
+
+#############################
+# Local Search Functions
+#############################
+
+def improve_tour(initial_tour, distances, neighbor_count=NEIGHBOR_COUNT, or_opt_max_segment=OR_OPT_MAX_SEGMENT,
+                 kicks=KICK_COUNT, seed=0, deadline=None, on_improve=None, active=None, verify=True):
+    """
+    Improve a closed tour with neighbour-list 2-opt and Or-opt moves.
+
+    The tour is kept in an array with a position index so every move is evaluated in O(1).
+    Cities whose neighbourhood yielded no improvement are switched off (don't-look bits) until
+    one of their tour edges changes. After the first local optimum, localized double-bridge kicks
+    are tried and kept only when they lead to a shorter tour. Finally a vectorized scan over all
+    2-opt moves guarantees the result is 2-opt optimal. The returned tour starts with the same
+    city as the initial tour.
+
+    When a deadline (time.perf_counter() timestamp) is given the solver is anytime: kicks continue
+    until the deadline instead of stopping after `kicks`, and the best tour found so far is returned
+    when time runs out. on_improve(tour_length, iteration) is called whenever the best tour improves.
+
+    For local repairs, `active` limits the initial queue to the given cities and verify=False skips the
+    final all-pairs 2-opt scan; combine with kicks=0 to only touch the neighbourhood of an edit.
+    distances may be a PointDistances instead of a matrix, so a repair only computes the rows it visits.
+    """
+    n = len(initial_tour)
+    if n < 4:
+        return list(initial_tour)
+    if isinstance(distances, PointDistances):
+        matrix = distances
+    else:
+        matrix = np.asarray(distances)
+        if not np.issubdtype(matrix.dtype, np.floating):
+            matrix = matrix.astype(float)
+    search = _TourSearch(initial_tour, matrix, neighbor_count, or_opt_max_segment, deadline, active)
+    search.run()
+    best_length = search.length()
+    iteration = 0
+    if on_improve:
+        on_improve(best_length, iteration)
+    if n >= 8:
+        rng = random.Random(seed)
+        while not search.expired() and (deadline is not None or iteration < kicks):
+            iteration += 1
+            snapshot = search.snapshot()
+            search.double_bridge(rng)
+            search.run()
+            length = search.length()
+            if length < best_length - IMPROVEMENT_EPSILON:
+                best_length = length
+                if on_improve:
+                    on_improve(best_length, iteration)
+            else:
+                search.restore(snapshot)
+    while verify and not search.expired() and search.apply_best_two_opt():
+        search.run()
+        length = search.length()
+        if on_improve and length < best_length - IMPROVEMENT_EPSILON:
+            best_length = length
+            on_improve(best_length, iteration)
+    return search.tour_from(initial_tour[0])
+
+def build_neighbor_lists(matrix, neighbor_count=NEIGHBOR_COUNT):
+    """
+    Return the k nearest other cities for every city, closest first.
+    """
+    n = len(matrix)
+    k = min(neighbor_count, n - 1)
+    neighbors = np.empty((n, k), dtype=np.intp)
+    # Block by block, so the temporaries stay small for large matrices
+    for start in range(0, n, CHECK_BLOCK_SIZE):
+        rows = np.arange(start, min(start + CHECK_BLOCK_SIZE, n))
+        masked = np.array(matrix[rows])
+        masked[np.arange(len(rows)), rows] = np.inf
+        nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1, kind="stable")
+        neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+    return neighbors
+
+class PointDistances:
+    """
+    Euclidean distances between local x/y points, computed one row at a time on demand.
+    Indexing as distances[a][b] matches a matrix, without the O(n^2) cost of building one.
+    """
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, city):
+        row = self.rows.get(city)
+        if row is None:
+            row = self.row_array(city).tolist()
+            self.rows[city] = row
+        return row
+
+    def row_array(self, city):
+        delta = self.points - self.points[city]
+        return np.hypot(delta[:, 0], delta[:, 1])
+
+    def tour_length(self, tour):
+        ordered = self.points[np.asarray(tour)]
+        delta = ordered - np.roll(ordered, -1, axis=0)
+        return float(np.hypot(delta[:, 0], delta[:, 1]).sum())
+
+    def as_matrix(self):
+        delta = self.points[:, None, :] - self.points[None, :, :]
+        return np.hypot(delta[..., 0], delta[..., 1])
+
+class _LazyNeighbors:
+    """
+    k-nearest candidate lists computed per city the first time the search asks for them.
+    """
+
+    def __init__(self, distances, neighbor_count):
+        self.distances = distances
+        self.k = min(neighbor_count, len(distances) - 1)
+        self.lists = {}
+
+    def __getitem__(self, city):
+        nearest = self.lists.get(city)
+        if nearest is None:
+            row = self.distances.row_array(city)
+            row[city] = np.inf
+            candidates = np.argpartition(row, self.k - 1)[:self.k]
+            nearest = candidates[np.argsort(row[candidates], kind="stable")].tolist()
+            self.lists[city] = nearest
+        return nearest
+
+class _TourSearch:
+    """
+    Array-backed tour with position index and don't-look-bit queue.
+    """
+
+    def __init__(self, initial_tour, matrix, neighbor_count, or_opt_max_segment, deadline=None, active=None):
+        self.n = len(initial_tour)
+        self.deadline = deadline
+        self.tolerance = 0.0
+        if isinstance(matrix, PointDistances):
+            self.points = matrix
+            self.matrix = None
+            self.dist = matrix
+            self.neighbors = _LazyNeighbors(matrix, neighbor_count)
+        else:
+            self.points = None
+            self.matrix = matrix
+            if self.n <= LIST_MATRIX_MAX_CITIES:
+                # Python lists give much faster scalar access than NumPy indexing in the inner loops
+                self.dist = matrix.tolist()
+            else:
+                # A list copy costs ~32 bytes per entry (paid again in every pool worker), so large matrices
+                # are indexed in place
+                self.dist = matrix
+                if matrix.dtype != np.float64:
+                    # Moves are then summed in the matrix precision; gains within its rounding error of the
+                    # removed edges don't count, so ties (common on grid lattices) can't cycle
+                    self.tolerance = 8 * float(np.finfo(matrix.dtype).eps)
+            self.neighbors = build_neighbor_lists(matrix, neighbor_count).tolist()
+        self.or_opt_max_segment = min(or_opt_max_segment, self.n - 3)
+        self.tour = list(initial_tour)
+        self.pos = [0] * self.n
+        for i, city in enumerate(self.tour):
+            self.pos[city] = i
+        self.queue = deque()
+        self.queued = [False] * self.n
+        self.push(*(self.tour if active is None else active))
+
+    def succ(self, city):
+        return self.tour[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def push(self, *cities):
+        for city in cities:
+            if not self.queued[city]:
+                self.queued[city] = True
+                self.queue.append(city)
+
+    def expired(self):
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def run(self):
+        """
+        Process the don't-look-bit queue until no city yields an improving move or the deadline passes.
+        Every applied move shortens the tour, so stopping early still leaves a valid, improved tour.
+        """
+        pops = 0
+        while self.queue:
+            pops += 1
+            if pops % DEADLINE_CHECK_INTERVAL == 0 and self.expired():
+                # Leave the remaining work to a later call; restore() clears the queue anyway
+                return
+            city = self.queue.popleft()
+            self.queued[city] = False
+            if self.try_two_opt(city) or self.try_or_opt(city):
+                self.push(city)
+
+    def try_two_opt(self, a):
+        dist = self.dist
+        dist_a = dist[a]
+        # Successor direction: replace (a, succ a) and (c, succ c) with (a, c) and (succ a, succ c)
+        b = self.succ(a)
+        d_ab = dist_a[b]
+        for c in self.neighbors[a]:
+            d_ac = dist_a[c]
+            if d_ac >= d_ab:
+                break
+            d = self.succ(c)
+            if c == b or d == a:
+                continue
+            d_cd = dist[c][d]
+            delta = d_ac + dist[b][d] - d_ab - d_cd
+            if delta < -IMPROVEMENT_EPSILON - self.tolerance * (d_ab + d_cd):
+                self.reverse(self.pos[b], self.pos[c])
+                self.push(a, b, c, d)
+                return True
+        # Predecessor direction: replace (pred a, a) and (pred c, c) with (a, c) and (pred a, pred c)
+        b = self.pred(a)
+        d_ab = dist_a[b]
+        for c in self.neighbors[a]:
+            d_ac = dist_a[c]
+            if d_ac >= d_ab:
+                break
+            d = self.pred(c)
+            if c == b or d == a:
+                continue
+            d_cd = dist[c][d]
+            delta = d_ac + dist[b][d] - d_ab - d_cd
+            if delta < -IMPROVEMENT_EPSILON - self.tolerance * (d_ab + d_cd):
+                self.reverse(self.pos[c], self.pos[b])
+                self.push(a, b, c, d)
+                return True
+        return False
+
+    def try_or_opt(self, s1):
+        """
+        Move the segment starting at s1 (1 to or_opt_max_segment cities) next to a neighbour of
+        either segment end, in either orientation.
+        """
+        dist = self.dist
+        n = self.n
+        start = self.pos[s1]
+        for length in range(1, self.or_opt_max_segment + 1):
+            s2 = self.tour[(start + length - 1) % n]
+            prev = self.pred(s1)
+            nxt = self.succ(s2)
+            segment = {self.tour[(start + k) % n] for k in range(length)}
+            removed = dist[prev][s1] + dist[s2][nxt]
+            removal_gain = removed - dist[prev][nxt]
+            if removal_gain <= IMPROVEMENT_EPSILON:
+                continue
+            for end, other in ((s1, s2), (s2, s1)):
+                dist_end = dist[end]
+                for c in self.neighbors[end]:
+                    d_ec = dist_end[c]
+                    if d_ec >= removal_gain:
+                        break
+                    if c in segment:
+                        continue
+                    # Insert with `end` adjacent to c, either after c or before it
+                    for u, v, first in ((c, self.succ(c), end), (self.pred(c), c, other)):
+                        if u in segment or v in segment:
+                            continue
+                        last = other if first == end else end
+                        d_uv = dist[u][v]
+                        delta = dist[u][first] + dist[last][v] - d_uv - removal_gain
+                        if delta < -IMPROVEMENT_EPSILON - self.tolerance * (removed + d_uv):
+                            self.move_segment(start, length, u, first == s1)
+                            self.push(prev, nxt, s1, s2, u, v)
+                            return True
+        return False
+
+    def reverse(self, i, j):
+        """
+        Reverse the tour between positions i and j (inclusive, walking forward and wrapping).
+        The shorter side of the cycle is reversed since both give the same tour.
+        """
+        n = self.n
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        tour, pos = self.tour, self.pos
+        for _ in range(length // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def move_segment(self, start, length, after, forward):
+        """
+        Remove the segment at positions start..start+length-1 and reinsert it after city `after`.
+        """
+        rotated = self.tour[start:] + self.tour[:start]
+        segment = rotated[:length] if forward else rotated[length - 1::-1]
+        rest = rotated[length:]
+        k = rest.index(after) + 1
+        self.tour = rest[:k] + segment + rest[k:]
+        for i, city in enumerate(self.tour):
+            self.pos[city] = i
+
+    def length(self):
+        if self.points is not None:
+            return self.points.tour_length(self.tour)
+        tour = np.asarray(self.tour)
+        return float(self.matrix[tour, np.roll(tour, -1)].sum(dtype=float))
+
+    def snapshot(self):
+        return self.tour.copy(), self.pos.copy()
+
+    def restore(self, snapshot):
+        self.tour, self.pos = snapshot[0].copy(), snapshot[1].copy()
+        self.queue.clear()
+        self.queued = [False] * self.n
+
+    def double_bridge(self, rng):
+        """
+        Swap two adjacent short segments inside a random window of the tour (A X Y Z -> A Y X Z).
+        Every city in the window is put back on the queue.
+        """
+        n = self.n
+        window = min(KICK_WINDOW, n - 2)
+        start = rng.randrange(n)
+        p1, p2 = sorted(rng.sample(range(2, window + 1), 2))
+        positions = [(start + k) % n for k in range(window + 1)]
+        cities = [self.tour[p] for p in positions]
+        cities[1:p2] = cities[p1:p2] + cities[1:p1]
+        for p, city in zip(positions, cities):
+            self.tour[p] = city
+            self.pos[city] = p
+        self.push(*cities)
+
+    def apply_best_two_opt(self):
+        """
+        Scan every 2-opt move with NumPy and apply the best improving one.
+        Returns False when the tour is 2-opt optimal.
+        """
+        if self.matrix is None:
+            self.matrix = self.points.as_matrix()
+        n = self.n
+        tour = np.asarray(self.tour)
+        nxt = np.roll(tour, -1)
+        # Compact (float32) matrices are widened so rounding never looks like an improvement
+        edges = self.matrix[tour, nxt].astype(float)
+        columns = np.arange(n)
+        best_delta, best_move = -IMPROVEMENT_EPSILON, None
+        for row in range(0, n - 2, CHECK_BLOCK_SIZE):
+            rows = np.arange(row, min(row + CHECK_BLOCK_SIZE, n - 2))
+            delta = (self.matrix[np.ix_(tour[rows], tour)].astype(float) + self.matrix[np.ix_(nxt[rows], nxt)]
+                     - edges[rows, None] - edges[None, :])
+            # Only moves with j >= i + 2 are valid; the first and last edge are adjacent in the cycle
+            invalid = columns[None, :] < rows[:, None] + 2
+            invalid[rows == 0, n - 1] = True
+            delta[invalid] = np.inf
+            flat = int(np.argmin(delta))
+            i, j = divmod(flat, n)
+            if delta[i, j] < best_delta:
+                best_delta, best_move = delta[i, j], (rows[i], j)
+        if best_move is None:
+            return False
+        i, j = best_move
+        a, b, c, d = self.tour[i], self.tour[i + 1], self.tour[j], self.tour[(j + 1) % n]
+        self.reverse(i + 1, j)
+        self.push(a, b, c, d)
+        return True
+
+    def tour_from(self, start_city):
+        start = self.pos[start_city]
+        return self.tour[start:] + self.tour[:start]
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+
+from photo_store import make_thumbnail
+from config import THUMBNAIL_MAX_SIZE, MISSION_PAGE_SIZE, MAX_MISSION_PAGE_SIZE, MAX_PHOTO_RANGE
+
+#############################
+# Mission Browser Settings
+#############################
+
+# Photos the worker saved for a waypoint: {index}.jpg and, with a detection, {index}_detected.jpg
+PHOTO_NAME = re.compile(r"^(\d+)(_detected)?\.jpg$", re.IGNORECASE)
+
+#############################
+# Thumbnail Cache
+#############################
+
+class ThumbnailCache:
+    """
+    Thumbnails of mission photos, kept on disk so a mission is only scaled down once.
+
+    A cached thumbnail carries the modification time of its photo (os.utime), so a photo that
+    is replaced gets a new thumbnail on its next request without any bookkeeping.
+    """
+
+    def __init__(self, cache_dir, max_size=THUMBNAIL_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, photo_path):
+        """JPEG thumbnail bytes of the photo at photo_path"""
+        photo_stat = os.stat(photo_path)
+        path = self._cache_path(photo_path)
+        try:
+            if os.stat(path).st_mtime_ns == photo_stat.st_mtime_ns:
+                with open(path, "rb") as f:
+                    return f.read()
+        except FileNotFoundError:
+            pass
+
+        with open(photo_path, "rb") as f:
+            thumbnail = make_thumbnail(f.read(), self.max_size)
+        try:
+            # Unique temporary name, thumbnails of a page are made in parallel threads
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(thumbnail)
+            os.utime(tmp_path, ns=(photo_stat.st_atime_ns, photo_stat.st_mtime_ns))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not cache thumbnail {path}: {e}")
+        return thumbnail
+
+    def _cache_path(self, photo_path):
+        key = f"{os.path.abspath(photo_path)}|{self.max_size}"
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".jpg")
+
+#############################
+# Mission Browser
+#############################
+
+def photo_sort_key(filename):
+    """Waypoint photos in flight order, other photos after them by name"""
+    match = PHOTO_NAME.match(filename)
+    return (0, int(match.group(1)), filename) if match else (1, 0, filename)
+
+def mission_signature(path):
+    """Modification times of a mission folder and its log and mission files; changes on every save"""
+    signature = [os.stat(path).st_mtime_ns]
+    for name in ("log.json", "mission.json"):
+        try:
+            signature.append(os.stat(os.path.join(path, name)).st_mtime_ns)
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+def mission_photos(path):
+    """
+    Photos in a mission folder in flight order, an original and its _detected version as one entry:
+    {"index", "filename", "size", "detected_filename", "detected_size"}, where the detected fields
+    are None unless the photo has an annotated version.
+    """
+    sizes = {}
+    for entry in os.scandir(path):
+        if entry.is_file() and entry.name.lower().endswith(".jpg"):
+            sizes[entry.name] = entry.stat().st_size
+    photos = []
+    for filename in sorted(sizes, key=photo_sort_key):
+        match = PHOTO_NAME.match(filename)
+        if match and match.group(2):
+            # Listed with its original, unless the original is missing
+            if f"{match.group(1)}.jpg" in sizes:
+                continue
+        detected_filename = f"{match.group(1)}_detected.jpg" if match and not match.group(2) else None
+        photos.append({
+            "index": len(photos),
+            "filename": filename,
+            "size": sizes[filename],
+            "detected_filename": detected_filename if detected_filename in sizes else None,
+            "detected_size": sizes.get(detected_filename),
+        })
+    return photos
+
+class MissionBrowser:
+    """
+    Completed missions served in parts: a manifest (photo list, log and mission parameters),
+    thumbnails page by page, and full photos in byte ranges.
+
+    Manifests are cached per mission and rebuilt when the mission folder, log.json or
+    mission.json change, so reopening a mission reads no files.
+    """
+
+    def __init__(self, missions_dir, thumbnails, page_size=MISSION_PAGE_SIZE):
+        self.missions_dir = missions_dir
+        self.thumbnails = thumbnails
+        self.page_size = page_size
+        self.lock = threading.Lock()
+        self.manifests = {}  # mission name -> (signature, manifest)
+
+    def mission_path(self, mission):
+        """Folder of a mission; raises ValueError for names that are not a mission folder"""
+        if not mission or mission in (".", "..") or os.path.basename(mission) != mission:
+            raise ValueError(f"Invalid mission name '{mission}'")
+        path = os.path.join(self.missions_dir, mission)
+        if not os.path.isdir(path):
+            raise ValueError("Mission folder does not exist.")
+        return path
+
+    def manifest(self, mission):
+        """
+        Everything about a mission except image data:
+        {"mission_name", "photos", "page_size", "pages", "log", "mission"}, with photos as listed by
+        mission_photos.
+        """
+        path = self.mission_path(mission)
+        signature = mission_signature(path)
+        with self.lock:
+            cached = self.manifests.get(mission)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        photos = mission_photos(path)
+        manifest = {
+            "mission_name": mission,
+            "photos": photos,
+            "page_size": self.page_size,
+            "pages": math.ceil(len(photos) / self.page_size),
+            "log": _read_json(os.path.join(path, "log.json")),
+            "mission": _read_json(os.path.join(path, "mission.json")),
+        }
+        with self.lock:
+            self.manifests[mission] = (signature, manifest)
+        return manifest
+
+    def thumbnail_page(self, mission, page, page_size=None, map_function=map):
+        """
+        Thumbnails of one page of the manifest's photos: {"page", "pages", "thumbnails"} with
+        {"index", "filename", "thumbnail"} entries (thumbnail is None when the photo can't be read).
+        map_function makes the thumbnails, e.g. a thread pool's map.
+        """
+        page_size = self.page_size if page_size is None else int(page_size)
+        if not 1 <= page_size <= MAX_MISSION_PAGE_SIZE:
+            raise ValueError(f"Page size must be between 1 and {MAX_MISSION_PAGE_SIZE}")
+        manifest = self.manifest(mission)
+        path = self.mission_path(mission)
+        photos = manifest["photos"][page * page_size:(page + 1) * page_size] if page >= 0 else []
+
+        def thumbnail(photo):
+            try:
+                return self.thumbnails.get(os.path.join(path, photo["filename"]))
+            except Exception as e:
+                logging.warning(f"Could not make thumbnail of {photo['filename']}: {e}")
+                return None
+
+        return {
+            "page": page,
+            "pages": math.ceil(len(manifest["photos"]) / page_size),
+            "thumbnails": [
+                {"index": photo["index"], "filename": photo["filename"], "thumbnail": data}
+                for photo, data in zip(photos, map_function(thumbnail, photos))
+            ],
+        }
+
+    def photo_range(self, mission, filename, offset=0, length=MAX_PHOTO_RANGE):
+        """
+        Bytes [offset, offset + length) of a mission photo, at most MAX_PHOTO_RANGE:
+        {"filename", "offset", "size", "data"}, where size is the size of the whole photo.
+        """
+        manifest = self.manifest(mission)
+        listed = {photo["filename"] for photo in manifest["photos"]} | \
+                 {photo["detected_filename"] for photo in manifest["photos"] if photo["detected_filename"]}
+        if filename not in listed:
+            raise ValueError(f"Mission has no photo '{filename}'")
+        offset, length = int(offset), min(int(length), MAX_PHOTO_RANGE)
+        if offset < 0 or length < 1:
+            raise ValueError("Photo range must have a non-negative offset and a positive length")
+        with open(os.path.join(self.mission_path(mission), filename), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(offset)
+            data = f.read(length)
+        return {"filename": filename, "offset": offset, "size": size, "data": data}
+
+def _read_json(path):
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        return {"error": str(e)}
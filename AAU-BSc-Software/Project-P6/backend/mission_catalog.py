@@ -0,0 +1,312 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import shapely
+
+from mission_browser import PHOTO_NAME, mission_photos, mission_signature
+
+#############################
+# Mission Catalog Settings
+#############################
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS missions (
+    name TEXT PRIMARY KEY,
+    started_at TEXT,
+    completed_at TEXT,
+    success INTEGER,
+    error TEXT,
+    duration REAL,
+    drone TEXT,
+    altitude REAL,
+    waypoint_count INTEGER,
+    photo_count INTEGER,
+    detection_count INTEGER,
+    signature TEXT
+);
+CREATE INDEX IF NOT EXISTS missions_started_at ON missions (started_at);
+CREATE INDEX IF NOT EXISTS missions_drone ON missions (drone, started_at);
+CREATE INDEX IF NOT EXISTS missions_detection_count ON missions (detection_count);
+
+CREATE TABLE IF NOT EXISTS photos (
+    id INTEGER PRIMARY KEY,
+    mission TEXT NOT NULL REFERENCES missions (name) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    detected_filename TEXT,
+    detected INTEGER NOT NULL,
+    waypoint_index INTEGER,
+    lat REAL,
+    lon REAL,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS photos_mission ON photos (mission);
+CREATE INDEX IF NOT EXISTS photos_detected ON photos (detected, mission);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS photo_locations USING rtree (id, min_lat, max_lat, min_lon, max_lon);
+
+CREATE TABLE IF NOT EXISTS log_actions (
+    mission TEXT NOT NULL REFERENCES missions (name) ON DELETE CASCADE,
+    action TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (mission, action)
+);
+"""
+
+MISSION_COLUMNS = (
+    "name", "started_at", "completed_at", "success", "error", "duration", "drone", "altitude",
+    "waypoint_count", "photo_count", "detection_count",
+)
+PHOTO_COLUMNS = ("mission", "filename", "detected_filename", "detected", "waypoint_index", "lat", "lon", "size")
+QUERY_PARAMETER_CHUNK = 500     # Mission names bound per IN (...) query, below SQLite's parameter limit
+
+#############################
+# Mission Summaries
+#############################
+
+def summarize_mission(path):
+    """
+    Catalog rows of the mission folder at path: (mission, photos, action_counts), where mission has
+    the MISSION_COLUMNS, photos the PHOTO_COLUMNS and action_counts counts the log entries per action.
+    Photos are located at the waypoint they were taken at, the way the photo worker numbers them.
+    """
+    name = os.path.basename(os.path.normpath(path))
+    log = _read_json(os.path.join(path, "log.json"))
+    mission_data = _read_json(os.path.join(path, "mission.json"))
+    log = [entry for entry in log if isinstance(entry, dict)] if isinstance(log, list) else []
+    mission_data = mission_data if isinstance(mission_data, dict) else {}
+
+    timestamps = [entry["timestamp"] for entry in log if entry.get("timestamp")]
+    complete = next((entry for entry in reversed(log) if entry.get("action") == "complete"), None)
+    error = next((entry for entry in log if entry.get("action") == "error"), None)
+    action_counts = {}
+    for entry in log:
+        action = entry.get("action")
+        if action:
+            action_counts[action] = action_counts.get(action, 0) + 1
+
+    waypoints = mission_data.get("waypoints") or []
+    photo_waypoints = [waypoint for waypoint in waypoints if waypoint.get("type") != "detour"]
+    photos = []
+    for photo in mission_photos(path):
+        match = PHOTO_NAME.match(photo["filename"])
+        waypoint_index = int(match.group(1)) - 1 if match else None
+        waypoint = photo_waypoints[waypoint_index] \
+            if waypoint_index is not None and 0 <= waypoint_index < len(photo_waypoints) else {}
+        photos.append((
+            name, photo["filename"], photo["detected_filename"], int(photo["detected_filename"] is not None),
+            waypoint_index, waypoint.get("lat"), waypoint.get("lon"), photo["size"],
+        ))
+
+    mission = (
+        name,
+        timestamps[0] if timestamps else None,
+        complete.get("timestamp") if complete else None,
+        int(bool(complete.get("success"))) if complete else 0,
+        error.get("error") if error else None,
+        _seconds_between(timestamps[0], timestamps[-1]) if timestamps else None,
+        mission_data.get("drone"),
+        _float_or_none(mission_data.get("altitude")),
+        len(waypoints),
+        len(photos),
+        sum(photo[3] for photo in photos),
+    )
+    return mission, photos, action_counts
+
+def _read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _seconds_between(start, end):
+    try:
+        return (datetime.datetime.fromisoformat(end) - datetime.datetime.fromisoformat(start)).total_seconds()
+    except ValueError:
+        return None
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+#############################
+# Mission Catalog
+#############################
+
+class MissionCatalog:
+    """
+    SQLite index of completed missions: mission metadata, a log summary, and every photo with its
+    location and detection flag, with an R-tree on photo locations. The mission list and searches
+    by date, drone, detection count and area are queries instead of directory scans.
+
+    The database runs in WAL mode, so searches read while a saved mission is written. One
+    connection is shared by the eventlet hub and worker threads, behind a lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA foreign_keys=ON")
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add_mission(self, path):
+        """Index (or re-index) the mission folder at path"""
+        mission, photos, action_counts = summarize_mission(path)
+        signature = json.dumps(mission_signature(path))
+        with self.lock, self.connection:
+            self._remove(mission[0])
+            self.connection.execute(
+                f"INSERT INTO missions ({', '.join(MISSION_COLUMNS)}, signature) "
+                f"VALUES ({', '.join('?' * (len(MISSION_COLUMNS) + 1))})",
+                mission + (signature,)
+            )
+            for photo in photos:
+                photo_id = self.connection.execute(
+                    f"INSERT INTO photos ({', '.join(PHOTO_COLUMNS)}) VALUES ({', '.join('?' * len(PHOTO_COLUMNS))})",
+                    photo
+                ).lastrowid
+                lat, lon = photo[5], photo[6]
+                if lat is not None and lon is not None:
+                    self.connection.execute(
+                        "INSERT INTO photo_locations VALUES (?, ?, ?, ?, ?)", (photo_id, lat, lat, lon, lon)
+                    )
+            self.connection.executemany(
+                "INSERT INTO log_actions (mission, action, count) VALUES (?, ?, ?)",
+                [(mission[0], action, count) for action, count in action_counts.items()]
+            )
+
+    def sync(self, missions_dir):
+        """
+        Bring the catalog in line with missions_dir: index new or changed mission folders and drop
+        removed ones. Unchanged missions are only stat'ed. Returns the number of missions indexed.
+        """
+        names = set()
+        if os.path.isdir(missions_dir):
+            names = {entry.name for entry in os.scandir(missions_dir) if entry.is_dir()}
+        with self.lock:
+            known = dict(self.connection.execute("SELECT name, signature FROM missions").fetchall())
+        indexed = 0
+        for name in sorted(names):
+            path = os.path.join(missions_dir, name)
+            if known.get(name) != json.dumps(mission_signature(path)):
+                try:
+                    self.add_mission(path)
+                    indexed += 1
+                except Exception as e:
+                    logging.warning(f"Could not index mission {name}: {e}")
+        with self.lock, self.connection:
+            for name in set(known) - names:
+                self._remove(name)
+        return indexed
+
+    def mission_names(self):
+        """Names of all cataloged missions, newest first"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name FROM missions ORDER BY COALESCE(started_at, name) DESC"
+            ).fetchall()
+        return [row["name"] for row in rows]
+
+    def find_missions(self, since=None, until=None, drone=None, min_detections=None, polygon=None):
+        """
+        Missions (dicts of MISSION_COLUMNS plus "actions", the log entry count per action), newest
+        first, that started within [since, until] (ISO timestamps), were flown by drone, have at least
+        min_detections photos with a detection and, with a polygon of (lat, lon) vertices, have a photo
+        inside it.
+        """
+        where, parameters = self._mission_filters(since, until, drone)
+        if min_detections is not None:
+            where.append("detection_count >= ?")
+            parameters.append(int(min_detections))
+        with self.lock:
+            rows = [dict(row) for row in self.connection.execute(
+                f"SELECT {', '.join(MISSION_COLUMNS)} FROM missions"
+                f"{' WHERE ' + ' AND '.join(where) if where else ''} "
+                "ORDER BY COALESCE(started_at, name) DESC",
+                parameters
+            )]
+        if polygon is not None:
+            inside = {photo["mission"] for photo in self.find_photos(since, until, drone, polygon=polygon)}
+            rows = [row for row in rows if row["name"] in inside]
+        # Log summaries of the found missions only, through the (mission, action) primary key
+        names = [row["name"] for row in rows]
+        actions = {}
+        with self.lock:
+            for start in range(0, len(names), QUERY_PARAMETER_CHUNK):
+                chunk = names[start:start + QUERY_PARAMETER_CHUNK]
+                for action_row in self.connection.execute(
+                    f"SELECT mission, action, count FROM log_actions WHERE mission IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ):
+                    actions.setdefault(action_row["mission"], {})[action_row["action"]] = action_row["count"]
+        for row in rows:
+            row["actions"] = actions.get(row["name"], {})
+        return rows
+
+    def find_photos(self, since=None, until=None, drone=None, detected=None, polygon=None):
+        """
+        Photos (dicts of PHOTO_COLUMNS plus the mission's "started_at") of missions that started
+        within [since, until] and were flown by drone, optionally only those with (or without) a
+        detection and those inside a polygon of (lat, lon) vertices. The R-tree narrows a polygon
+        down to its bounding box, the exact test is done on the remaining photos.
+        """
+        where, parameters = self._mission_filters(since, until, drone, table="missions.")
+        joins = ""
+        if detected is not None:
+            where.append("photos.detected = ?")
+            parameters.append(int(bool(detected)))
+        if polygon is not None:
+            lats, lons = np.asarray(polygon, dtype=float).T
+            joins = " JOIN photo_locations ON photo_locations.id = photos.id"
+            # R-tree boxes are rounded outwards to 32-bit floats, so test for overlap, not containment
+            where.append("photo_locations.max_lat >= ? AND photo_locations.min_lat <= ? "
+                         "AND photo_locations.max_lon >= ? AND photo_locations.min_lon <= ?")
+            parameters.extend([lats.min(), lats.max(), lons.min(), lons.max()])
+        with self.lock:
+            rows = [dict(row) for row in self.connection.execute(
+                f"SELECT {', '.join('photos.' + column for column in PHOTO_COLUMNS)}, missions.started_at "
+                f"FROM photos JOIN missions ON missions.name = photos.mission{joins}"
+                f"{' WHERE ' + ' AND '.join(where) if where else ''} "
+                "ORDER BY COALESCE(missions.started_at, missions.name) DESC, photos.id",
+                parameters
+            )]
+        if polygon is not None and rows:
+            area = shapely.Polygon(np.column_stack((lons, lats)))
+            inside = shapely.contains_xy(area, [row["lon"] for row in rows], [row["lat"] for row in rows])
+            rows = [row for row, keep in zip(rows, inside) if keep]
+        return rows
+
+    def _mission_filters(self, since, until, drone, table=""):
+        where, parameters = [], []
+        if since is not None:
+            where.append(f"{table}started_at >= ?")
+            parameters.append(since)
+        if until is not None:
+            where.append(f"{table}started_at <= ?")
+            parameters.append(until)
+        if drone is not None:
+            where.append(f"{table}drone = ?")
+            parameters.append(drone)
+        return where, parameters
+
+    def _remove(self, name):
+        # The R-tree has no foreign key, so its rows go first
+        self.connection.execute(
+            "DELETE FROM photo_locations WHERE id IN (SELECT id FROM photos WHERE mission = ?)", (name,)
+        )
+        self.connection.execute("DELETE FROM missions WHERE name = ?", (name,))
@@ -0,0 +1,309 @@
+import datetime
+
+import numpy as np
+
+from algorithm import calculate_grid_placement, build_tour_output, format_plan, project_ring, route_around_zones
+from geo_utils import create_area_projection
+from distance_matrix import local_distance_matrix
+from flight_time import get_flight_time_model, DEFAULT_ALTITUDE
+from tsp_pool import get_tsp_pool, solve_start
+from deconfliction import deconflict_plans
+from sorties import split_sorties
+from no_fly import get_no_fly_zones
+
+#############################
+# Multi-drone Settings
+#############################
+
+KMEANS_ITERATIONS = 15          # Capacitated k-means iterations per partition
+BALANCE_ROUNDS = 3              # Partition / solve rounds used to even out the drones' flight times
+
+#############################
+# Multi-drone Planner
+#############################
+
+def plan_multi_drone(coordinates, altitude, overlap, coverage, num_drones, drone_start_points=None, rotation=0,
+                     seed=0, deconfliction="delay", sortie_time_budget=None, holes=None, exclusion_zones=None):
+    """
+    Split the grids of one area between num_drones drones so the longest flight (the makespan) is short.
+
+    The grids are partitioned by a capacitated k-means whose cluster sizes are chosen so every drone's
+    estimated flight time, including the legs to and from its own launch point, is equal. Each drone's
+    closed tour from its launch point is solved in parallel in the shared process pool. The measured
+    tour times then correct the per-grid time of every cluster and the partition is redone; the
+    partition with the smallest makespan is kept. drone_start_points holds one (lat, lon) launch point
+    per drone (or a single one shared by all). deconfliction ("delay", "altitude" or None) separates
+    the drones in time or altitude (see deconflict_plans). holes, exclusion_zones and sortie_time_budget
+    are handled as by grid_based_algorithm: the tours are costed and flown around the exclusion zones.
+    Returns {"drones": [plan per drone], "metadata"}.
+    """
+    grid_data, polygon_area, not_searched_area, extra_area = calculate_grid_placement(
+        coordinates, altitude, overlap, coverage, rotation=rotation, holes=holes, exclusion_zones=exclusion_zones
+    )
+    no_fly = get_no_fly_zones(exclusion_zones) if exclusion_zones else None
+    launches = [
+        (float(point["lat"]), float(point["lon"])) if isinstance(point, dict) else (float(point[0]), float(point[1]))
+        for point in drone_start_points or []
+    ]
+    if len(launches) == 1:
+        launches = launches * num_drones
+    if launches and len(launches) != num_drones:
+        raise ValueError("Give one drone start point per drone, or a single shared one")
+    num_drones = max(1, min(num_drones, len(grid_data)))
+    launches = launches[:num_drones]
+    model = get_flight_time_model()
+    altitude_m = altitude if altitude is not None else DEFAULT_ALTITUDE
+    plans = []
+    if grid_data:
+        centers = np.array([grid["center"] for grid in grid_data], dtype=float)
+        projection = create_area_projection(centers)
+        points = project_ring(centers, projection)
+        launch_points = project_ring(launches, projection) if launches else None
+        labels, tours, times = balanced_partition(
+            points, launch_points, num_drones, model, altitude_m, seed, no_fly=no_fly, centers=centers,
+            launches=launches
+        )
+        for drone in range(num_drones):
+            members = np.flatnonzero(labels == drone)
+            plans.append(_drone_plan(
+                grid_data, members, tours[drone], times[drone], points,
+                launches[drone] if launches else None, launch_points[drone] if launches else None, altitude, drone,
+                no_fly=no_fly
+            ))
+            if sortie_time_budget is not None:
+                plans[-1]["sorties"] = split_sorties(
+                    plans[-1]["path"], launches[drone] if launches else None, sortie_time_budget, altitude,
+                    no_fly=no_fly
+                )
+    separation = None
+    if deconfliction and plans:
+        separation = deconflict_plans(plans, mode=deconfliction)
+        for plan, delay, drone_altitude in zip(plans, separation["delays"], separation["altitudes"]):
+            plan["metadata"]["departure_delay"] = delay
+            plan["metadata"]["altitude"] = drone_altitude
+    makespan = max((
+        plan["path_metrics"].get("estimated_flight_time", 0) + plan["metadata"].get("departure_delay", 0)
+        for plan in plans
+    ), default=0)
+    return {
+        "drones": plans,
+        "metadata": {
+            "altitude": altitude,
+            "overlap_percent": overlap,
+            "rotation": rotation,
+            "num_drones": len(plans),
+            "makespan": makespan,
+            "total_flight_time": sum(plan["path_metrics"].get("estimated_flight_time", 0) for plan in plans),
+            "created_at": datetime.datetime.now().isoformat(),
+            "polygon_area": polygon_area,
+            "not_searched_area": not_searched_area,
+            "extra_area": extra_area,
+            "deconfliction": separation,
+        }
+    }
+
+def balanced_partition(points, launch_points, num_drones, model, altitude, seed=0, rounds=BALANCE_ROUNDS,
+                       no_fly=None, centers=None, launches=None):
+    """
+    Min-max partition of local points between drones, with each drone's tour solved.
+    With no_fly (NoFlyZones), the tours are solved on routed distances (see _solve_tours).
+
+    Returns (labels, tours, times): the drone of every point, each drone's closed tour (indices into its
+    own points in label order, starting at its launch point as index -1 when launch_points are given)
+    and each drone's estimated flight time.
+    """
+    p = model.parameters
+    fixed_time = p["takeoff_time"] + (p["ascend_rate"] + p["landing_rate"]) * altitude
+    spacing = _typical_spacing(points)
+    cell_times = np.full(num_drones, p["waypoint_time"] + p["leg_time"] + p["travel_rate"] * spacing)
+    centroids = _seed_centroids(points, num_drones, seed)
+    if launch_points is not None:
+        centroids = centroids[_match_launches(centroids, launch_points)]
+    best = None
+    for _ in range(rounds):
+        home_times = _home_times(centroids, launch_points, p)
+        capacities = balanced_capacities(len(points), cell_times, home_times)
+        labels, centroids = capacitated_kmeans(points, centroids, capacities)
+        tours, lengths = _solve_tours(points, labels, launch_points, num_drones, no_fly, centers, launches)
+        counts = np.bincount(labels, minlength=num_drones)
+        times = np.array([
+            model.estimate(lengths[drone], counts[drone], altitude) for drone in range(num_drones)
+        ])
+        if best is None or times.max() < best[2].max():
+            best = (labels, tours, times)
+        # Measured time per grid of every cluster, with its home legs and fixed overhead taken out
+        home_times = _home_times(centroids, launch_points, p, points, labels)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            measured = (times - fixed_time - home_times) / counts
+        cell_times = np.where((counts > 0) & (measured > 0), measured, cell_times)
+    return best
+
+def balanced_capacities(count, cell_times, home_times):
+    """
+    Grids per drone that give every drone the same flight time: n_i * cell_time_i + home_time_i = T with
+    sum(n_i) = count. Rounded with the largest remainders so the capacities add up to count.
+    """
+    inverse = 1 / cell_times
+    target = (count + np.sum(home_times * inverse)) / np.sum(inverse)
+    sizes = np.clip((target - home_times) * inverse, 0, None)
+    sizes *= count / sizes.sum() if sizes.sum() > 0 else 0
+    capacities = np.floor(sizes).astype(int)
+    remainder = count - capacities.sum()
+    capacities[np.argsort(capacities - sizes)[:remainder]] += 1
+    return capacities
+
+def capacitated_kmeans(points, centroids, capacities, iterations=KMEANS_ITERATIONS):
+    """
+    k-means where cluster i takes exactly capacities[i] points.
+
+    In every iteration the points are assigned in order of regret (how much farther their second-best
+    centroid is than their best), each to its nearest centroid that still has room, and the centroids
+    move to the mean of their points. Returns (labels, centroids).
+    """
+    centroids = np.array(centroids, dtype=float)
+    labels = None
+    for _ in range(iterations):
+        delta = points[:, None, :] - centroids[None, :, :]
+        distances = np.hypot(delta[..., 0], delta[..., 1])
+        preference = np.argsort(distances, axis=1)
+        ranked = np.take_along_axis(distances, preference, axis=1)
+        regret = ranked[:, 1] - ranked[:, 0] if len(centroids) > 1 else np.zeros(len(points))
+        room = np.array(capacities, dtype=int)
+        new_labels = np.empty(len(points), dtype=int)
+        for point in np.argsort(-regret, kind="stable"):
+            for cluster in preference[point]:
+                if room[cluster] > 0:
+                    room[cluster] -= 1
+                    new_labels[point] = cluster
+                    break
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        for cluster in range(len(centroids)):
+            members = labels == cluster
+            if members.any():
+                centroids[cluster] = points[members].mean(axis=0)
+    return labels, centroids
+
+def _solve_tours(points, labels, launch_points, num_drones, no_fly=None, centers=None, launches=None):
+    """
+    Solve every drone's closed tour in the process pool. With launch points, the launch point is
+    the last city of each drone's matrix and tours are rotated to start there. With no_fly, legs
+    crossing a zone cost their detour; centers and launches are the (lat, lon) of points and launch_points.
+    """
+    pool = get_tsp_pool()
+    futures = []
+    for drone in range(num_drones):
+        cities = points[labels == drone]
+        geo_cities = centers[labels == drone] if no_fly is not None else None
+        start_idx = 0
+        if launch_points is not None:
+            cities = np.vstack((cities, launch_points[drone]))
+            geo_cities = np.vstack((geo_cities, launches[drone])) if no_fly is not None else None
+            start_idx = len(cities) - 1
+        if len(cities) <= 1:
+            futures.append(None)
+            continue
+        distances = local_distance_matrix(cities)
+        if no_fly is not None:
+            distances = no_fly.routed_distances(geo_cities, distances)
+        futures.append(pool.submit(solve_start, distances, start_idx, 0))
+    tours, lengths = [], []
+    for drone, future in enumerate(futures):
+        if future is None:
+            count = int(np.sum(labels == drone))
+            tours.append([-1] if launch_points is not None and not count else list(range(count)))
+            lengths.append(0.0)
+            continue
+        tour, length = future.result()
+        if launch_points is not None:
+            # The launch point is the last city; report it as -1
+            tour = [city if city < len(tour) - 1 else -1 for city in tour]
+        tours.append(tour)
+        lengths.append(length)
+    return tours, lengths
+
+def _drone_plan(grid_data, members, tour, flight_time, points, launch, launch_point, altitude, drone, no_fly=None):
+    """
+    Plan of one drone in the format of grid_based_algorithm. With no_fly, the tour is routed around the zones.
+    """
+    drone_grids = [grid_data[i] for i in members]
+    grid_tour = [city for city in tour if city >= 0]
+    distances = local_distance_matrix(points[members]) if len(members) else np.zeros((0, 0))
+    if not grid_tour:
+        return format_plan([], [], {"total_distance": 0, "grid_count": 0, "estimated_flight_time": 0},
+                           {"drone": drone, "drone_start_point": launch})
+    optimized_grid_data, waypoints, path_metrics = build_tour_output(
+        drone_grids, grid_tour, distances, launch, altitude
+    )
+    if launch is not None:
+        # Each drone flies from its own launch point, so its legs to and from it are part of the flight
+        cities = np.vstack((points[members], launch_point))
+        path_metrics["total_distance"] = _cycle_length(cities, [city if city >= 0 else len(members) for city in tour])
+    path_metrics["estimated_flight_time"] = float(flight_time)
+    if no_fly is not None:
+        # Straight legs were measured above; the detours add their length and re-estimate the flight
+        waypoints = route_around_zones(waypoints, path_metrics, no_fly, altitude=altitude, reprice=True)
+    for waypoint in waypoints:
+        if waypoint["type"] == "grid_center":
+            waypoint["grid_id"] = int(members[waypoint["grid_id"]])
+    return format_plan(optimized_grid_data, waypoints, path_metrics, {
+        "drone": drone,
+        "drone_start_point": launch,
+        "altitude": altitude,
+    })
+
+def _seed_centroids(points, count, seed):
+    """k-means++ seeding."""
+    rng = np.random.default_rng(seed)
+    centroids = [points[rng.integers(len(points))]]
+    for _ in range(1, count):
+        delta = points[:, None, :] - np.array(centroids)[None, :, :]
+        nearest = (delta ** 2).sum(axis=2).min(axis=1)
+        centroids.append(points[rng.choice(len(points), p=nearest / nearest.sum())] if nearest.sum() > 0
+                         else points[rng.integers(len(points))])
+    return np.array(centroids, dtype=float)
+
+def _match_launches(centroids, launch_points):
+    """
+    Order of the centroids that gives drone i the cluster closest to its launch point (greedy matching).
+    """
+    delta = launch_points[:, None, :] - centroids[None, :, :]
+    distances = np.hypot(delta[..., 0], delta[..., 1])
+    order = np.empty(len(launch_points), dtype=int)
+    for _ in range(len(launch_points)):
+        drone, cluster = np.unravel_index(np.argmin(distances), distances.shape)
+        order[drone] = cluster
+        distances[drone, :] = np.inf
+        distances[:, cluster] = np.inf
+    return order
+
+def _home_times(centroids, launch_points, parameters, points=None, labels=None):
+    """
+    Time of the legs between every drone's launch point and its cluster (its nearest point, or its
+    centroid when no assignment is given). Zero without launch points.
+    """
+    if launch_points is None:
+        return np.zeros(len(centroids))
+    if labels is None:
+        home = np.hypot(*(centroids - launch_points).T)
+    else:
+        home = np.array([
+            np.hypot(*(points[labels == drone] - launch_points[drone]).T).min() if np.any(labels == drone) else 0.0
+            for drone in range(len(centroids))
+        ])
+    return 2 * (parameters["leg_time"] + parameters["travel_rate"] * home)
+
+def _typical_spacing(points):
+    """Median distance between a point and its nearest neighbour, sampled."""
+    sample = points[:: max(1, len(points) // 500)]
+    delta = sample[:, None, :] - points[None, :, :]
+    distances = np.hypot(delta[..., 0], delta[..., 1])
+    distances[distances == 0] = np.inf
+    nearest = distances.min(axis=1)
+    return float(np.median(nearest[np.isfinite(nearest)])) if np.isfinite(nearest).any() else 0.0
+
+def _cycle_length(cities, tour):
+    ordered = cities[np.asarray(tour)]
+    delta = ordered - np.roll(ordered, -1, axis=0)
+    return float(np.hypot(delta[:, 0], delta[:, 1]).sum())
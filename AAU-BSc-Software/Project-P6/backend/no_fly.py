@@ -0,0 +1,209 @@
+import functools
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from geo_utils import create_area_projection
+from plan_cache import canonicalize_coordinates
+
+#############################
+# No-fly Zone Settings
+#############################
+
+ZONE_CLEARANCE = 5.0            # Meters kept between the flight path and a no-fly zone
+VISIBILITY_CACHE_SIZE = 32      # Sites whose zones and visibility graph are kept between requests
+UNREACHABLE_DISTANCE = 1e7      # Meters used for legs no detour can fly, so the solver avoids them
+LEG_BLOCK_SIZE = 1 << 18        # Leg geometries built at once when testing visibility
+
+#############################
+# No-fly Zones
+#############################
+
+class NoFlyZones:
+    """
+    No-fly zones of one site, with what is needed to route around them.
+
+    Zones are merged, then held in an STRtree. Flight legs must stay ZONE_CLEARANCE / 2 away from them,
+    and detours run over the vertices of the zones grown by ZONE_CLEARANCE. The visibility graph over
+    those vertices and its all-pairs shortest paths only depend on the zones, so instances are cached
+    per site (see get_no_fly_zones). Everything is computed in a local projection centered on the zones.
+    """
+
+    def __init__(self, zones, clearance=ZONE_CLEARANCE):
+        self.projection = create_area_projection([point for zone in zones for point in zone])
+        polygons = [Polygon(self.projection.local_coords([(lon, lat) for lat, lon in zone])) for zone in zones]
+        self.zones = shapely.get_parts(shapely.union_all(shapely.make_valid(np.array(polygons))))
+        self.zones = self.zones[shapely.area(self.zones) > 0]
+        self.blocking = shapely.buffer(self.zones, clearance / 2, join_style="mitre")
+        shapely.prepare(self.blocking)
+        self.tree = shapely.STRtree(self.blocking)
+        self.boxes = shapely.bounds(self.blocking)
+        self.bounds = shapely.total_bounds(self.blocking)
+        padded = shapely.buffer(self.zones, clearance, join_style="mitre")
+        self.nodes = np.concatenate([
+            shapely.get_coordinates(shapely.get_exterior_ring(zone))[:-1] for zone in padded
+        ]) if len(padded) else np.empty((0, 2))
+        self._build_visibility_graph()
+
+    def _build_visibility_graph(self):
+        """
+        Shortest paths between all detour vertices (Floyd-Warshall), with next hops to rebuild them.
+        """
+        count = len(self.nodes)
+        delta = self.nodes[:, None, :] - self.nodes[None, :, :]
+        graph = np.hypot(delta[..., 0], delta[..., 1])
+        graph[~self.visible(self.nodes, self.nodes)] = np.inf
+        np.fill_diagonal(graph, 0)
+        next_hop = np.where(np.isfinite(graph), np.arange(count)[None, :], -1)
+        for k in range(count):
+            through = graph[:, k, None] + graph[None, k, :]
+            better = through < graph
+            graph = np.where(better, through, graph)
+            next_hop = np.where(better, next_hop[:, k, None], next_hop)
+        self.node_distances = graph
+        self.next_hop = next_hop
+
+    def project(self, centers):
+        """
+        (lat, lon) rows to local x/y in the zones' projection.
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        return self.projection.local_coords(centers[:, ::-1])
+
+    def visible(self, origins, targets):
+        """
+        Mask (len(origins) x len(targets)) of straight legs that stay clear of every zone.
+
+        Legs whose bounding box misses the zones' total bounds are clear without building a geometry. The
+        others are queried against the STRtree of zones, which only runs the exact intersection test on
+        the zones whose boxes a leg crosses, so the cost per leg stays near-constant as zones are added.
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+        blocked = np.zeros((len(origins), len(targets)), dtype=bool)
+        if not len(self.blocking):
+            return ~blocked
+        min_x, min_y, max_x, max_y = self.bounds
+        near = (
+            (np.minimum(origins[:, None, 0], targets[None, :, 0]) <= max_x)
+            & (np.maximum(origins[:, None, 0], targets[None, :, 0]) >= min_x)
+            & (np.minimum(origins[:, None, 1], targets[None, :, 1]) <= max_y)
+            & (np.maximum(origins[:, None, 1], targets[None, :, 1]) >= min_y)
+        )
+        rows, cols = np.nonzero(near)
+        for block in range(0, len(rows), LEG_BLOCK_SIZE):
+            block_rows, block_cols = rows[block:block + LEG_BLOCK_SIZE], cols[block:block + LEG_BLOCK_SIZE]
+            starts, ends = origins[block_rows], targets[block_cols]
+            legs = shapely.linestrings(np.stack((starts, ends), axis=1))
+            # Candidate pairs from the tree, kept when the leg itself (not just its box) crosses the zone's
+            # box, then the exact test against the prepared zones
+            leg_idx, zone_idx = self.tree.query(legs)
+            crossing = _segments_cross_boxes(starts[leg_idx], ends[leg_idx], self.boxes[zone_idx])
+            leg_idx, zone_idx = leg_idx[crossing], zone_idx[crossing]
+            hits = shapely.intersects(self.blocking[zone_idx], legs[leg_idx])
+            blocked[block_rows[leg_idx[hits]], block_cols[leg_idx[hits]]] = True
+        return ~blocked
+
+    def routed_distances(self, centers, distances):
+        """
+        Copy of the distance matrix between (lat, lon) centers where legs crossing a zone are replaced
+        by the length of the shortest detour around the zones.
+        """
+        points = self.project(centers)
+        routed = np.array(distances, copy=True)
+        if not len(self.zones):
+            return routed
+        blocked = ~self.visible(points, points)
+        blocked |= blocked.T
+        rows, cols = np.nonzero(np.triu(blocked, 1))
+        if not len(rows):
+            return routed
+        entry, _ = self._entry_distances(points)
+        # Best detour: into the graph at some vertex, along the graph, out at a vertex visible from target
+        to_graph = np.min(entry[:, :, None] + self.node_distances[None, :, :], axis=1)
+        detours = np.min(to_graph[rows] + entry[cols], axis=1)
+        detours = np.where(np.isfinite(detours), detours, UNREACHABLE_DISTANCE)
+        routed[rows, cols] = detours
+        routed[cols, rows] = detours
+        return routed
+
+    def detour(self, start, end):
+        """
+        Local x/y vertices to fly through between two local points, empty if the straight leg is clear.
+        """
+        if not len(self.zones) or self.visible(start, end)[0, 0]:
+            return []
+        entry, _ = self._entry_distances(np.array([start, end]))
+        total = entry[0][:, None] + self.node_distances + entry[1][None, :]
+        first, last = np.unravel_index(np.argmin(total), total.shape)
+        if not np.isfinite(total[first, last]):
+            return []
+        path = [first]
+        while path[-1] != last:
+            path.append(self.next_hop[path[-1], last])
+        return [self.nodes[node] for node in path]
+
+    def _entry_distances(self, points):
+        """
+        Distance from every point to every visible detour vertex (inf where hidden).
+        """
+        delta = self.nodes[None, :, :] - points[:, None, :]
+        distances = np.hypot(delta[..., 0], delta[..., 1])
+        visible = self.visible(points, self.nodes)
+        return np.where(visible, distances, np.inf), visible
+
+def _segments_cross_boxes(starts, ends, boxes):
+    """
+    Mask of segments (starts[i], ends[i]) that pass through the box (min_x, min_y, max_x, max_y) boxes[i],
+    by clipping the segment's parameter range to the box on both axes (Liang-Barsky).
+    """
+    low, high = np.zeros(len(starts)), np.ones(len(starts))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for axis in (0, 1):
+            delta = ends[:, axis] - starts[:, axis]
+            first = (boxes[:, axis] - starts[:, axis]) / delta
+            second = (boxes[:, axis + 2] - starts[:, axis]) / delta
+            # Segments parallel to the axis are inside the slab for any t, or never
+            parallel = delta == 0
+            inside = (starts[:, axis] >= boxes[:, axis]) & (starts[:, axis] <= boxes[:, axis + 2])
+            low = np.maximum(low, np.where(parallel, np.where(inside, 0.0, np.inf), np.minimum(first, second)))
+            high = np.minimum(high, np.where(parallel, np.where(inside, 1.0, -np.inf), np.maximum(first, second)))
+    return low <= high
+
+#############################
+# Site Cache and Routing
+#############################
+
+@functools.lru_cache(maxsize=VISIBILITY_CACHE_SIZE)
+def _cached_zones(canonical_zones, clearance):
+    return NoFlyZones([list(zone) for zone in canonical_zones], clearance)
+
+def get_no_fly_zones(zones, clearance=ZONE_CLEARANCE):
+    """
+    Return the NoFlyZones of a site, reusing the visibility graph when the same zones come again.
+    """
+    canonical = tuple(sorted(canonicalize_coordinates(zone) for zone in zones))
+    return _cached_zones(canonical, clearance)
+
+def insert_detours(waypoints, no_fly, launch_point=None):
+    """
+    Insert "detour" waypoints (no photo) wherever the leg between consecutive waypoints crosses a zone.
+    With a launch_point ((lat, lon) the drone takes off from and returns to) the legs from it to the
+    first waypoint and from the last waypoint back to it are routed too. Their detours open and close
+    the list. Returns the new waypoint list with renumbered orders.
+    """
+    launch = [{"lat": launch_point[0], "lon": launch_point[1]}] if launch_point and waypoints else []
+    legs = launch + waypoints + launch
+    routed = []
+    for previous, waypoint in zip([None] + legs[:-1], legs):
+        if previous is not None:
+            start, end = no_fly.project([(previous["lat"], previous["lon"]), (waypoint["lat"], waypoint["lon"])])
+            for x, y in no_fly.detour(start, end):
+                lon, lat = no_fly.projection.to_wgs84(x, y)
+                routed.append({"lat": float(lat), "lon": float(lon), "type": "detour"})
+        routed.append(dict(waypoint))
+    if launch:
+        routed = routed[1:-1]
+    for order, waypoint in enumerate(routed):
+        waypoint["order"] = order
+    return routed
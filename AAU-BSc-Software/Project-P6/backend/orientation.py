@@ -0,0 +1,88 @@
+import contextlib
+import io
+import math
+
+from algorithm import calculate_grid_placement, optimize_tsp_path
+from geo_utils import create_area_projection
+from tsp_pool import get_tsp_pool
+
+#############################
+# Orientation Settings
+#############################
+
+ORIENTATION_STEP = 10           # Degrees between evenly spaced candidate headings
+ORIENTATION_OBJECTIVES = ("cells", "tour")
+
+#############################
+# Orientation Functions
+#############################
+
+def find_best_orientation(coordinates, altitude, overlap, coverage, objective="cells", candidate_headings=None,
+                          parallel=True):
+    """
+    Find the grid heading (degrees clockwise from north) that gives the fewest grids ("cells")
+    or the shortest flight ("tour").
+
+    Candidates are evenly spaced headings plus the direction of every polygon edge, since aligning the
+    rows with a long edge is usually best for elongated fields. Candidates are evaluated in the shared
+    planner process pool. Returns (heading, evaluations), where evaluations has one dict per heading.
+    """
+    if objective not in ORIENTATION_OBJECTIVES:
+        raise ValueError(f"Unknown orientation objective '{objective}', expected one of {ORIENTATION_OBJECTIVES}")
+    if candidate_headings is None:
+        candidate_headings = orientation_candidates(coordinates)
+    args = [(coordinates, altitude, overlap, coverage, heading, objective) for heading in candidate_headings]
+    if parallel and len(args) > 1:
+        evaluations = list(get_tsp_pool().map(_evaluate_orientation_args, args))
+    else:
+        evaluations = [evaluate_orientation(*arg) for arg in args]
+    evaluations = [evaluation for evaluation in evaluations if evaluation is not None]
+    if not evaluations:
+        raise ValueError("No grids could be placed. Please enlarge the area or reduce minimum coverage.")
+    best = min(evaluations, key=lambda evaluation: _orientation_score(evaluation, objective))
+    return best["rotation"], evaluations
+
+def orientation_candidates(coordinates, step=ORIENTATION_STEP):
+    """
+    Evenly spaced headings in [0, 180) plus the heading of every polygon edge, without duplicates.
+    """
+    headings = {float(angle) for angle in range(0, 180, step)}
+    projection = create_area_projection(coordinates)
+    local_coords = [tuple(point) for point in projection.local_coords([(lon, lat) for lat, lon in coordinates])]
+    for (x1, y1), (x2, y2) in zip(local_coords, local_coords[1:] + local_coords[:1]):
+        if (x1, y1) == (x2, y2):
+            continue
+        # The grid rows run along the image width, which points 90 degrees right of the drone heading
+        edge_angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
+        headings.add(round((-edge_angle) % 180, 6))
+    return sorted(headings)
+
+def evaluate_orientation(coordinates, altitude, overlap, coverage, heading, objective="cells"):
+    """
+    Plan the grid at one heading and return its metrics, or None if no grid can be placed.
+    """
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            grid_data, polygon_area, not_searched_area, extra_area = calculate_grid_placement(
+                coordinates, altitude, overlap, coverage, rotation=heading
+            )
+    except ValueError:
+        return None
+    evaluation = {
+        "rotation": heading,
+        "grid_count": len(grid_data),
+        "not_searched_area": not_searched_area,
+        "extra_area": extra_area,
+    }
+    if objective == "tour":
+        _, _, path_metrics = optimize_tsp_path(grid_data)
+        evaluation["total_distance"] = path_metrics["total_distance"]
+    return evaluation
+
+def _evaluate_orientation_args(args):
+    return evaluate_orientation(*args)
+
+def _orientation_score(evaluation, objective):
+    if objective == "tour":
+        return (evaluation["total_distance"], evaluation["grid_count"], evaluation["rotation"])
+    return (evaluation["grid_count"], evaluation["extra_area"], evaluation["rotation"])
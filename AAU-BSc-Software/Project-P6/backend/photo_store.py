@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+from io import BytesIO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from config import THUMBNAIL_MAX_SIZE, THUMBNAIL_QUALITY
+
+#############################
+# Thumbnails
+#############################
+
+def make_thumbnail(image_bytes, max_size=THUMBNAIL_MAX_SIZE, quality=THUMBNAIL_QUALITY):
+    """
+    JPEG bytes of the image scaled down to fit max_size x max_size pixels (aspect ratio kept).
+    Uses Pillow when available, which decodes JPEGs straight at a reduced scale, else OpenCV.
+    """
+    if Image is not None:
+        with Image.open(BytesIO(image_bytes)) as img:
+            img.draft("RGB", (max_size, max_size))
+            img = img.convert("RGB")
+            img.thumbnail((max_size, max_size))
+            buf = BytesIO()
+            img.save(buf, format="JPEG", quality=quality, optimize=True)
+            return buf.getvalue()
+
+    import cv2
+    import numpy as np
+    img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Could not decode image")
+    height, width = img.shape[:2]
+    factor = min(1.0, max_size / max(height, width))
+    if factor < 1.0:
+        img = cv2.resize(img, (max(1, round(width * factor)), max(1, round(height * factor))),
+                         interpolation=cv2.INTER_AREA)
+    _, encoded = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return encoded.tobytes()
+
+#############################
+# Photo Store
+#############################
+
+def content_id(data):
+    """Short content hash identifying a photo's bytes"""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+class PhotoStore:
+    """
+    Full-resolution photos of the current mission by content id, so clients that were pushed a
+    thumbnail can fetch the photo itself on demand. Only paths are kept; the bytes stay on disk.
+    The store is cleared when the next mission starts; saved missions are served from their folder.
+
+    Filled from the photo worker thread and read from Socket.IO handlers, hence the lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.photos = {}  # content id -> {"path", "filename", "size"}
+
+    def add(self, path, data=None):
+        """Register the photo at path (data are its bytes when already read) and return its content id"""
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        photo_id = content_id(data)
+        with self.lock:
+            self.photos[photo_id] = {"path": path, "filename": os.path.basename(path), "size": len(data)}
+        return photo_id
+
+    def info(self, photo_id):
+        with self.lock:
+            photo = self.photos.get(photo_id)
+            return dict(photo) if photo is not None else None
+
+    def read(self, photo_id):
+        """(filename, bytes) of a registered photo, or None when it is unknown or no longer on disk"""
+        photo = self.info(photo_id)
+        if photo is None:
+            return None
+        try:
+            with open(photo["path"], "rb") as f:
+                return photo["filename"], f.read()
+        except FileNotFoundError:
+            return None
+
+    def clear(self):
+        """Forget the photos of the previous mission"""
+        with self.lock:
+            self.photos.clear()
+
+    def relocate(self, src_dir, dst_dir):
+        """Follow photos moved from src_dir to dst_dir (when a mission is saved)"""
+        src_dir = os.path.normpath(src_dir)
+        with self.lock:
+            for photo in self.photos.values():
+                if os.path.normpath(os.path.dirname(photo["path"])) == src_dir:
+                    photo["path"] = os.path.join(dst_dir, photo["filename"])
@@ -0,0 +1,331 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+
+#############################
+# Plan Settings
+#############################
+
+WIRE_FORMAT = "plan/1"          # Marker of an encoded plan, bumped when the layout changes
+COORDINATE_SCALE = 10 ** 7      # Compact wire coordinates are integer 1e-7 degrees (~1 cm)
+METRIC_DECIMALS = 4             # Decimals kept for coverage, overlap and rotation on the compact wire
+WIRE_ENCODINGS = ("compact", "binary")
+PATH_TYPES = ("start_end", "grid_center", "detour")
+GRID_CENTER = PATH_TYPES.index("grid_center")
+
+# Keys every waypoint of a type carries; paths with other keys are sent as they are
+WAYPOINT_KEYS = {
+    "start_end": {"lat", "lon", "type", "order"},
+    "grid_center": {"lat", "lon", "type", "grid_id", "order", "rotation"},
+    "detour": {"lat", "lon", "type", "order"},
+}
+
+_LAZY = object()
+
+#############################
+# Plan
+#############################
+
+class Plan(MutableMapping):
+    """
+    A plan held as NumPy arrays: grid centers (N, 2) and corners (N, 4, 2) as (lat, lon) in tour order,
+    optional per-grid coverage and overlap, and the waypoints as columns (type code, lat, lon, grid_id,
+    rotation, order). It reads and writes like the plan dictionary of format_plan; "grids" and "path"
+    are only built as dictionaries when a caller asks for them. to_wire() encodes the arrays directly.
+    """
+
+    def __init__(self, centers, corners, waypoints, path_metrics, metadata, coverage=None, overlap=None):
+        self.centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        self.corners = np.asarray(corners, dtype=float).reshape(-1, 4, 2)
+        self.coverage = None if coverage is None else np.asarray(coverage, dtype=float)
+        self.overlap = None if overlap is None else np.asarray(overlap, dtype=float)
+        # Column dictionary of the waypoints, or the plain list when they do not fit the columns
+        self.waypoints = waypoints
+        self._items = {
+            "grid_count": len(self.centers),
+            "grids": _LAZY,
+            "path": _LAZY,
+            "path_metrics": path_metrics,
+            "metadata": metadata,
+        }
+
+    @classmethod
+    def from_grid_data(cls, optimized_grid_data, waypoints, path_metrics, metadata):
+        """
+        Plan from the grid dictionaries and waypoints of the path optimizers.
+        """
+        count = len(optimized_grid_data)
+        centers = np.array([grid["center"] for grid in optimized_grid_data], dtype=float).reshape(count, 2)
+        corners = np.array([grid["corners"] for grid in optimized_grid_data], dtype=float).reshape(count, 4, 2)
+        return cls(
+            centers, corners, waypoint_columns(waypoints), path_metrics, metadata,
+            coverage=_grid_values(optimized_grid_data, "coverage"),
+            overlap=_grid_values(optimized_grid_data, "overlap"),
+        )
+
+    @classmethod
+    def from_dict(cls, plan):
+        """
+        Plan from a plan dictionary (e.g. one cached before plans were array-backed).
+        """
+        grids = plan.get("grids", [])
+        count = len(grids)
+        centers = np.array([(grid["center"]["lat"], grid["center"]["lon"]) for grid in grids], dtype=float)
+        corners = np.array(
+            [[(corner["lat"], corner["lon"]) for corner in grid["corners"]] for grid in grids], dtype=float
+        )
+        result = cls(
+            centers.reshape(count, 2), corners.reshape(count, 4, 2), waypoint_columns(plan.get("path", [])),
+            plan.get("path_metrics", {}), plan.get("metadata", {}), overlap=_grid_values(grids, "overlap"),
+        )
+        for key, value in plan.items():
+            if key not in result._items:
+                result[key] = value
+        return result
+
+    #############################
+    # Dictionary View
+    #############################
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        if value is _LAZY:
+            value = self._items[key] = self._grid_dicts() if key == "grids" else self._waypoint_dicts()
+        return value
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        del self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"Plan(grid_count={len(self.centers)}, keys={list(self._items)})"
+
+    def _grid_dicts(self):
+        grids = [{
+            "center": {"lat": lat, "lon": lon},
+            "corners": [{"lat": corner_lat, "lon": corner_lon} for corner_lat, corner_lon in corners],
+        } for (lat, lon), corners in zip(self.centers.tolist(), self.corners.tolist())]
+        if self.overlap is not None:
+            for grid, overlap in zip(grids, self.overlap.tolist()):
+                grid["overlap"] = overlap
+        return grids
+
+    def _waypoint_dicts(self):
+        if isinstance(self.waypoints, list):
+            return self.waypoints
+        columns = self.waypoints
+        waypoints = []
+        for code, lat, lon, grid_id, order, rotation in zip(
+            columns["type"].tolist(), columns["lat"].tolist(), columns["lon"].tolist(),
+            columns["grid_id"].tolist(), columns["order"].tolist(), columns["rotation"].tolist()
+        ):
+            if code == GRID_CENTER:
+                waypoints.append({
+                    "lat": lat, "lon": lon, "type": PATH_TYPES[code], "grid_id": grid_id, "order": order,
+                    "rotation": rotation
+                })
+            else:
+                waypoints.append({"lat": lat, "lon": lon, "type": PATH_TYPES[code], "order": order})
+        return waypoints
+
+    #############################
+    # Wire Format
+    #############################
+
+    def to_wire(self, binary=False, lossless=False):
+        """
+        Encode the plan as flat arrays instead of one dictionary per grid and waypoint.
+
+        Coordinates are integers of 1e-7 degrees relative to the first grid center, delta-encoded along the
+        tour, and corners are stored as offsets from their center, so consecutive values are small. The
+        grid_center waypoints refer to the grids instead of repeating their coordinates. With binary the
+        arrays are bytes (sent as Socket.IO binary attachments), otherwise lists. lossless keeps the
+        exact float coordinates (used by the plan cache). Decode with from_wire.
+        """
+        if self._items["grids"] is not _LAZY or self._items["path"] is not _LAZY:
+            # Callers may have edited the dictionary views; encode what they hold
+            current = Plan.from_dict(self)
+            if self.coverage is not None and len(self.coverage) == len(current.centers):
+                current.coverage = self.coverage
+            return current._encode(binary, lossless)
+        return self._encode(binary, lossless)
+
+    def _encode(self, binary, lossless):
+        columns = self.waypoints
+        count = len(self.centers)
+        scale = None if lossless else COORDINATE_SCALE
+        wire = {"format": WIRE_FORMAT, "grid_count": count, "scale": scale}
+        if lossless:
+            wire["origin"] = [0, 0]
+            wire["centers"] = _floats(self.centers, binary, None)
+            wire["corners"] = _floats(self.corners, binary, None)
+        else:
+            centers = np.rint(self.centers * scale).astype(np.int64)
+            origin = centers[0] if count else np.zeros(2, dtype=np.int64)
+            corners = np.rint(self.corners * scale).astype(np.int64) - centers[:, None, :]
+            wire["origin"] = origin.tolist()
+            wire["centers"] = _ints(_delta(centers - origin), binary)
+            wire["corners"] = _ints(_delta(corners.reshape(count, 8)), binary)
+        for name in ("coverage", "overlap"):
+            values = getattr(self, name)
+            if values is not None:
+                wire[name] = _floats(values, binary, None if lossless else METRIC_DECIMALS)
+        wire["path"] = self._encode_path(columns, binary, lossless, scale, wire["origin"])
+        wire["path_metrics"] = self._items["path_metrics"]
+        wire["metadata"] = self._items["metadata"]
+        extras = {key: value for key, value in self._items.items() if key not in _PLAN_KEYS}
+        if extras:
+            wire["extras"] = extras
+        return wire
+
+    def _encode_path(self, columns, binary, lossless, scale, origin):
+        if isinstance(columns, list):
+            return {"waypoints": columns}
+        codes = columns["type"]
+        is_grid = codes == GRID_CENTER
+        coordinates = np.column_stack((columns["lat"], columns["lon"]))
+        # grid_center waypoints are normally the grids in tour order
+        from_grids = bool(is_grid.sum() == len(self.centers) and np.array_equal(coordinates[is_grid], self.centers))
+        own = ~is_grid if from_grids else np.ones(len(codes), dtype=bool)
+        path = {"types": list(PATH_TYPES), "type": _array(codes, binary, "u1"), "from_grids": from_grids}
+        if lossless:
+            path["coordinates"] = _floats(coordinates[own], binary, None)
+        else:
+            path["coordinates"] = _ints(np.rint(coordinates[own] * scale).astype(np.int64) - origin, binary)
+        path["grid_id"] = _ints(columns["grid_id"][is_grid], binary)
+        rotation = columns["rotation"][is_grid]
+        if len(rotation) and np.all(rotation == rotation[0]):
+            # One heading for the whole plan is the common case
+            path["rotation"] = float(rotation[0])
+        else:
+            path["rotation"] = _floats(rotation, binary, None if lossless else METRIC_DECIMALS)
+        order = columns["order"]
+        if not np.array_equal(order, np.arange(len(order))):
+            path["order"] = _ints(order, binary)
+        return path
+
+#############################
+# Encoding Functions
+#############################
+
+_PLAN_KEYS = ("grid_count", "grids", "path", "path_metrics", "metadata")
+
+def format_wire(plan, binary=False, lossless=False):
+    """
+    Wire form of a plan, a plan dictionary, or a multi-drone result {"drones": [...], "metadata": ...}.
+    """
+    if "drones" in plan:
+        return {
+            "drones": [format_wire(drone_plan, binary, lossless) for drone_plan in plan["drones"]],
+            "metadata": plan["metadata"],
+        }
+    if not isinstance(plan, Plan):
+        plan = Plan.from_dict(plan)
+    return plan.to_wire(binary=binary, lossless=lossless)
+
+def from_wire(wire):
+    """
+    Decode the output of Plan.to_wire back into a Plan.
+    """
+    count = wire["grid_count"]
+    scale = wire["scale"]
+    origin = np.asarray(wire["origin"], dtype=np.int64 if scale else float)
+    if scale:
+        centers = np.cumsum(_read(wire["centers"], "<i4").reshape(count, 2), axis=0) + origin
+        offsets = np.cumsum(_read(wire["corners"], "<i4").reshape(count, 8), axis=0).reshape(count, 4, 2)
+        corners = (centers[:, None, :] + offsets) / scale
+        centers = centers / scale
+        float_type = "<f4"
+    else:
+        centers = _read(wire["centers"], "<f8").reshape(count, 2)
+        corners = _read(wire["corners"], "<f8").reshape(count, 4, 2)
+        float_type = "<f8"
+    coverage = _read(wire["coverage"], float_type).astype(float) if "coverage" in wire else None
+    overlap = _read(wire["overlap"], float_type).astype(float) if "overlap" in wire else None
+    plan = Plan(
+        centers, corners, _decode_path(wire["path"], centers, scale, origin, float_type),
+        wire["path_metrics"], wire["metadata"], coverage=coverage, overlap=overlap,
+    )
+    for key, value in wire.get("extras", {}).items():
+        plan[key] = value
+    return plan
+
+def _decode_path(path, centers, scale, origin, float_type):
+    if "waypoints" in path:
+        return path["waypoints"]
+    names = path["types"]
+    codes = np.array([PATH_TYPES.index(names[code]) for code in _read(path["type"], "u1").tolist()], dtype=np.uint8)
+    is_grid = codes == GRID_CENTER
+    own = ~is_grid if path["from_grids"] else np.ones(len(codes), dtype=bool)
+    coordinates = np.empty((len(codes), 2))
+    if scale:
+        coordinates[own] = (_read(path["coordinates"], "<i4").reshape(-1, 2) + origin) / scale
+    else:
+        coordinates[own] = _read(path["coordinates"], "<f8").reshape(-1, 2)
+    if path["from_grids"]:
+        coordinates[is_grid] = centers
+    grid_id = np.full(len(codes), -1, dtype=np.int64)
+    grid_id[is_grid] = _read(path["grid_id"], "<i4")
+    rotation = np.full(len(codes), np.nan)
+    rotation[is_grid] = path["rotation"] if np.isscalar(path["rotation"]) else _read(path["rotation"], float_type)
+    order = _read(path["order"], "<i4").astype(np.int64) if "order" in path else np.arange(len(codes))
+    return {
+        "type": codes, "lat": coordinates[:, 0], "lon": coordinates[:, 1],
+        "grid_id": grid_id, "rotation": rotation, "order": order,
+    }
+
+def waypoint_columns(waypoints):
+    """
+    Column arrays of a waypoint list, or the list itself when a waypoint does not fit the columns.
+    """
+    for waypoint in waypoints:
+        if WAYPOINT_KEYS.get(waypoint.get("type")) != waypoint.keys():
+            return waypoints
+    count = len(waypoints)
+    codes = np.array([PATH_TYPES.index(waypoint["type"]) for waypoint in waypoints], dtype=np.uint8)
+    return {
+        "type": codes,
+        "lat": np.array([waypoint["lat"] for waypoint in waypoints], dtype=float).reshape(count),
+        "lon": np.array([waypoint["lon"] for waypoint in waypoints], dtype=float).reshape(count),
+        "grid_id": np.array([waypoint.get("grid_id", -1) for waypoint in waypoints], dtype=np.int64).reshape(count),
+        "rotation": np.array(
+            [waypoint.get("rotation", np.nan) for waypoint in waypoints], dtype=float
+        ).reshape(count),
+        "order": np.array([waypoint["order"] for waypoint in waypoints], dtype=np.int64).reshape(count),
+    }
+
+def _grid_values(grids, key):
+    """Per-grid values of key, or None unless every grid has one."""
+    if not grids or any(key not in grid for grid in grids):
+        return None
+    return np.array([grid[key] for grid in grids], dtype=float)
+
+def _delta(values):
+    """Differences between consecutive rows (the first row is kept)."""
+    return np.diff(values, axis=0, prepend=np.zeros((1,) + values.shape[1:], dtype=values.dtype))
+
+def _array(values, binary, dtype):
+    values = np.ascontiguousarray(values, dtype=dtype)
+    return values.tobytes() if binary else values.ravel().tolist()
+
+def _ints(values, binary):
+    return _array(values, binary, "<i4")
+
+def _floats(values, binary, decimals):
+    """Floats; the compact wire rounds them (JSON) or sends them as float32 (binary)."""
+    if binary:
+        return _array(values, binary, "<f8" if decimals is None else "<f4")
+    return _array(values if decimals is None else np.round(values, decimals), binary, "<f8")
+
+def _read(value, dtype):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=dtype)
+    return np.asarray(value, dtype=dtype)
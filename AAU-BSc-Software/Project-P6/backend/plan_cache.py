@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from plan import WIRE_FORMAT, from_wire
+
+#############################
+# Plan Cache Settings
+#############################
+
+COORDINATE_PRECISION = 6        # Decimal degrees kept in the cache key (~0.1 m)
+PARAMETER_PRECISION = 3         # Decimals kept for altitude, overlap and coverage
+
+#############################
+# Cache Key Functions
+#############################
+
+def canonicalize_coordinates(coordinates, precision=COORDINATE_PRECISION):
+    """
+    Return a canonical tuple of (lat, lon) vertices: rounded, without a closing or repeated vertex,
+    counter-clockwise, and starting at the smallest vertex. Polygons that only differ in starting
+    vertex, winding or sub-precision noise map to the same tuple.
+    """
+    points = []
+    for lat, lon in (_point_tuple(coord) for coord in coordinates):
+        point = (round(lat, precision), round(lon, precision))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    # Shoelace formula with lon as x and lat as y; negative means clockwise
+    signed_area = sum(
+        lon1 * lat2 - lon2 * lat1
+        for (lat1, lon1), (lat2, lon2) in zip(points, points[1:] + points[:1])
+    )
+    if signed_area < 0:
+        points.reverse()
+    start = points.index(min(points)) if points else 0
+    return tuple(points[start:] + points[:start])
+
+def plan_cache_key(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None, **options):
+    """
+    Build a stable cache key from the canonical polygon and all planning parameters.
+    Extra keyword options (e.g. rotation, starts) are included so different plan variants never collide.
+    """
+    key = {
+        "coordinates": canonicalize_coordinates(coordinates),
+        "altitude": round(float(altitude), PARAMETER_PRECISION),
+        "overlap": round(float(overlap), PARAMETER_PRECISION),
+        "coverage": round(float(coverage), PARAMETER_PRECISION),
+        "start_point": _canonical_point(start_point),
+        "drone_start_point": _canonical_point(drone_start_point),
+        "options": {name: options[name] for name in sorted(options)},
+    }
+    encoded = json.dumps(key, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def _point_tuple(point):
+    if isinstance(point, dict):
+        return float(point["lat"]), float(point["lon"])
+    return float(point[0]), float(point[1])
+
+def _canonical_point(point, precision=COORDINATE_PRECISION):
+    if not point:
+        return None
+    lat, lon = _point_tuple(point)
+    return round(lat, precision), round(lon, precision)
+
+#############################
+# Plan Cache
+#############################
+
+class PlanCache:
+    """
+    LRU cache of computed plans, bounded by the size of the serialized plans.
+
+    Plans are stored as JSON so every get() returns a fresh copy the caller may modify. Array-backed
+    Plans are stored in their lossless wire form and come back as Plans. When spill_dir
+    is set, plans are also written there and looked up on a memory miss, so warm plans survive restarts.
+    """
+
+    def __init__(self, max_bytes, spill_dir=None, max_spill_files=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_files = max_spill_files
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def get(self, key):
+        """
+        Return a copy of the cached plan for key, or None on a miss.
+        """
+        with self.lock:
+            encoded = self.entries.get(key)
+            if encoded is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return _decode_plan(encoded)
+            encoded = self._read_spill(key)
+            if encoded is not None:
+                self._store(key, encoded)
+                self.hits += 1
+                self.disk_hits += 1
+                return _decode_plan(encoded)
+            self.misses += 1
+            return None
+
+    def put(self, key, plan):
+        encoded = json.dumps(plan, default=_encode_plan)
+        with self.lock:
+            self._store(key, encoded)
+            self._write_spill(key, encoded)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _store(self, key, encoded):
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        if len(encoded) > self.max_bytes:
+            # Too big to keep in memory; the spill file (if any) still serves it
+            return
+        self.entries[key] = encoded
+        self.size += len(encoded)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"{key}.json")
+
+    def _read_spill(self, key):
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(path, "r") as f:
+                encoded = f.read()
+            os.utime(path)
+            return encoded
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning(f"Could not read cached plan {path}: {e}")
+            return None
+
+    def _write_spill(self, key, encoded):
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key)
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+            if self.max_spill_files:
+                self._prune_spill()
+        except OSError as e:
+            logging.warning(f"Could not write cached plan {path}: {e}")
+
+    def _prune_spill(self):
+        files = [
+            os.path.join(self.spill_dir, name)
+            for name in os.listdir(self.spill_dir) if name.endswith(".json")
+        ]
+        if len(files) <= self.max_spill_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_spill_files]:
+            os.remove(path)
+
+#############################
+# Plan Encoding
+#############################
+
+def _encode_plan(value):
+    if hasattr(value, "to_wire"):
+        # Array-backed Plan
+        return value.to_wire(lossless=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode_plan(encoded):
+    return json.loads(encoded, object_hook=_decode_wire)
+
+def _decode_wire(value):
+    return from_wire(value) if value.get("format") == WIRE_FORMAT else value
@@ -0,0 +1,122 @@
+import numpy as np
+from distance_matrix import haversine_distances
+from flight_time import get_flight_time_model, DEFAULT_ALTITUDE
+from no_fly import insert_detours
+
+#############################
+# Sortie Functions
+#############################
+
+def split_sorties(waypoints, launch_point, sortie_time_budget, altitude=None, model=None, no_fly=None):
+    """
+    Split an optimized tour into return-to-launch sorties that each fit in sortie_time_budget seconds.
+
+    The tour order is kept; only the cut points are chosen. Every sortie takes off at launch_point,
+    flies a consecutive run of the tour and lands at launch_point again. Sortie times come from the
+    calibrated flight time model, and the cuts minimize the total flight time of all sorties with a
+    shortest path over the tour positions (Prins' split), using prefix sums so a candidate sortie is
+    costed in O(1). Returns a list of {"waypoints", "path_metrics"} dicts.
+
+    With no_fly (NoFlyZones) the waypoints are a tour already routed around the zones. The cuts are
+    still made between grids, but legs are costed along the routed tour and the flights to and from
+    launch_point along their detours. Each sortie keeps the detours between its grids, and its
+    transit legs get their own (see insert_detours).
+    """
+    grid_positions = [k for k, waypoint in enumerate(waypoints) if waypoint.get("type") == "grid_center"]
+    if not grid_positions:
+        return []
+    if not launch_point:
+        raise ValueError("A drone start point is required to split the plan into sorties")
+    model = model or get_flight_time_model()
+    altitude = altitude if altitude is not None else DEFAULT_ALTITUDE
+    p = model.parameters
+    if isinstance(launch_point, dict):
+        launch_point = (launch_point["lat"], launch_point["lon"])
+    launch_point = (float(launch_point[0]), float(launch_point[1]))
+    if no_fly is None:
+        points = np.array([(waypoints[k]["lat"], waypoints[k]["lon"]) for k in grid_positions], dtype=float)
+        leg_distances = haversine_distances(points[:-1], points[1:])
+        home_distances = haversine_distances(np.array(launch_point), points)
+        leg_counts, home_legs = np.ones(len(leg_distances)), np.ones(len(home_distances))
+    else:
+        leg_distances, leg_counts, home_distances, home_legs = _routed_legs(
+            waypoints, grid_positions, launch_point, no_fly
+        )
+    # Prefix sums over the tour: time and distance flown from the first grid to grid k
+    time_prefix = np.concatenate((
+        [0.0], np.cumsum(p["leg_time"] * leg_counts + p["travel_rate"] * leg_distances)
+    ))
+    distance_prefix = np.concatenate(([0.0], np.cumsum(leg_distances)))
+    home_times = p["leg_time"] * home_legs + p["travel_rate"] * home_distances
+    overhead = p["takeoff_time"] + (p["ascend_rate"] + p["landing_rate"]) * altitude
+    waypoint_time = p["waypoint_time"]
+
+    def sortie_times(first, last):
+        """Flight times of the sorties flying tour positions first..last (first may be an array)."""
+        return (
+            overhead + home_times[first] + time_prefix[last] - time_prefix[first] + home_times[last]
+            + (last - first + 1) * waypoint_time
+        )
+
+    n = len(grid_positions)
+    if np.any(sortie_times(np.arange(n), np.arange(n)) > sortie_time_budget):
+        raise ValueError("Sortie time budget is too short to photograph a single grid and return")
+    best = np.full(n + 1, np.inf)
+    best[0] = 0.0
+    cut = np.zeros(n + 1, dtype=int)
+    first = 0
+    for last in range(n):
+        # Sorties starting before `first` exceed the budget even without the flights to and from launch
+        while (overhead + time_prefix[last] - time_prefix[first]
+               + (last - first + 1) * waypoint_time > sortie_time_budget):
+            first += 1
+        starts = np.arange(first, last + 1)
+        times = sortie_times(starts, last)
+        totals = np.where(times <= sortie_time_budget, best[starts] + times, np.inf)
+        k = int(np.argmin(totals))
+        best[last + 1] = totals[k]
+        cut[last + 1] = starts[k]
+    # Walk the cuts back from the end of the tour
+    bounds = []
+    end = n
+    while end > 0:
+        bounds.append((cut[end], end - 1))
+        end = cut[end]
+    sorties = []
+    for start, last in reversed(bounds):
+        # The run of the tour from the first to the last grid of the sortie, with the detours between them
+        sortie_waypoints = [dict(waypoint) for waypoint in waypoints[grid_positions[start]:grid_positions[last] + 1]]
+        if no_fly is not None:
+            sortie_waypoints = insert_detours(sortie_waypoints, no_fly, launch_point)
+        for order, waypoint in enumerate(sortie_waypoints):
+            waypoint["order"] = order
+        total_distance = (
+            home_distances[start] + distance_prefix[last] - distance_prefix[start] + home_distances[last]
+        )
+        sorties.append({
+            "waypoints": sortie_waypoints,
+            "path_metrics": {
+                "total_distance": float(total_distance),
+                "grid_count": int(last - start + 1),
+                "estimated_flight_time": float(sortie_times(start, last)),
+            }
+        })
+    return sorties
+
+def _routed_legs(waypoints, grid_positions, launch_point, no_fly):
+    """
+    Distances and leg counts between consecutive grids along the routed waypoints, and of the flights
+    between launch_point and every grid around the zones.
+    """
+    points = no_fly.project([(waypoint["lat"], waypoint["lon"]) for waypoint in waypoints])
+    along = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+    positions = np.asarray(grid_positions)
+    grids = points[positions]
+    launch = no_fly.project([launch_point])[0]
+    home_distances = np.hypot(*(grids - launch).T)
+    home_legs = np.ones(len(grids))
+    for k in np.flatnonzero(~no_fly.visible(launch, grids)[0]):
+        route = np.vstack([launch, *no_fly.detour(launch, grids[k]), grids[k]])
+        home_distances[k] = np.hypot(*np.diff(route, axis=0).T).sum()
+        home_legs[k] = len(route) - 1
+    return np.diff(along[positions]), np.diff(positions).astype(float), home_distances, home_legs
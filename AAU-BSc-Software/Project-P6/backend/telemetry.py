@@ -0,0 +1,212 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from eventlet.hubs import trampoline
+
+#############################
+# Telemetry Settings
+#############################
+
+COALESCE_WINDOW = 0.002         # Seconds the emitter waits after waking so a burst of events is sent once
+DEFAULT_MAX_RATE = 5.0          # Telemetry sends per second and event for a client that did not choose a rate
+
+# Topics a client can subscribe to and the events they carry
+TELEMETRY_TOPICS = {
+    "gps": ("gps_update",),
+    "motion": ("drone_state", "motion_update"),
+    "battery": ("battery_update",),
+    "photos": ("photo_update",),
+    "flight_log": ("flight_log",),
+}
+# Topics where every payload matters; they are sent to a Socket.IO room per topic instead of rate limited
+STREAM_TOPICS = ("photos", "flight_log")
+EVENT_TOPICS = {event: topic for topic, events in TELEMETRY_TOPICS.items() for event in events}
+
+_MISSING = object()
+
+#############################
+# Telemetry Channel
+#############################
+
+class TelemetryChannel:
+    """
+    Hand-off from producer threads (Olympe listener callbacks, the flight and photo workers) to a
+    single eventlet emitter.
+
+    publish(event, payload) keeps only the latest payload per event, so bursts of telemetry coalesce
+    into one emit. enqueue(event, payload) keeps every payload in order, for photos and flight logs.
+    Producers wake the emitter through a self-pipe the eventlet hub watches, which is safe from
+    native threads and means the emitter sleeps until there is something to send.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.stream = deque()
+        self.signalled = False
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        os.set_blocking(self.write_fd, False)
+
+    def publish(self, event, payload):
+        """Replace the pending payload of event."""
+        with self.lock:
+            self.latest[event] = payload
+            self._wake()
+
+    def enqueue(self, event, payload):
+        """Append a payload that must be sent even when newer ones follow."""
+        with self.lock:
+            self.stream.append((event, payload))
+            self._wake()
+
+    def wait(self, timeout=None):
+        """
+        Block the calling greenthread until something was published since the last drain (or the timeout
+        passes, raising eventlet.Timeout). Other greenthreads keep running meanwhile.
+        """
+        trampoline(self.read_fd, read=True, timeout=timeout)
+
+    def drain(self):
+        """
+        Take everything pending: the latest payload per published event, then the enqueued payloads,
+        as a list of (event, payload) in emit order.
+        """
+        with self.lock:
+            if self.signalled:
+                self.signalled = False
+                try:
+                    os.read(self.read_fd, 64)
+                except BlockingIOError:
+                    pass
+            pending = list(self.latest.items()) + list(self.stream)
+            self.latest.clear()
+            self.stream.clear()
+        return pending
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+    def _wake(self):
+        # One byte per drain is enough; later producers find the emitter already woken
+        if not self.signalled:
+            self.signalled = True
+            os.write(self.write_fd, b"\0")
+
+#############################
+# Telemetry Subscribers
+#############################
+
+def topic_room(topic):
+    return f"telemetry:{topic}"
+
+class Subscriber:
+    """
+    Telemetry settings of one client and what was sent to it.
+    """
+
+    def __init__(self, sid, topics, max_rate, delta):
+        self.sid = sid
+        self.topics = set(topics)
+        self.max_rate = max_rate
+        self.delta = delta
+        self.sent = {}          # event -> last payload sent (in full)
+        self.sent_at = {}       # event -> clock time of that send
+        self.pending = {}       # event -> newest payload waiting for the rate limit
+        self.flush_at = None    # clock time of the scheduled flush of pending payloads
+
+    def settings(self):
+        return {"topics": sorted(self.topics), "max_rate": self.max_rate, "delta": self.delta}
+
+class TelemetryHub:
+    """
+    Fan telemetry out per client instead of broadcasting every change to everyone.
+
+    Each subscriber receives a telemetry event at most max_rate times per second, always its latest
+    value: payloads arriving within the interval replace the pending one, which is sent when the
+    interval is over. Unchanged payloads are not sent again, and with delta only the fields that
+    changed since the subscriber's last send are. Stream topics (photos, flight logs) go to a room per
+    topic, so a client that did not subscribe costs nothing.
+
+    emit(event, payload, to) sends to a sid or room, schedule(delay, callback, *args) runs a callback
+    later (eventlet.spawn_after). Both run on the eventlet hub, like deliver().
+    """
+
+    def __init__(self, emit, schedule, max_rate=DEFAULT_MAX_RATE, max_allowed_rate=None, clock=time.monotonic):
+        self.emit = emit
+        self.schedule = schedule
+        self.max_rate = max_rate
+        self.max_allowed_rate = max_allowed_rate
+        self.clock = clock
+        self.subscribers = {}
+
+    def subscribe(self, sid, topics=None, max_rate=None, delta=False):
+        """
+        Set the telemetry a client receives (all topics at the default rate unless given) and return its
+        Subscriber. Raises ValueError for unknown topics or a rate out of range.
+        """
+        topics = list(TELEMETRY_TOPICS) if topics is None else list(topics)
+        unknown = [topic for topic in topics if topic not in TELEMETRY_TOPICS]
+        if unknown:
+            raise ValueError(f"Unknown telemetry topics {unknown}, expected some of {list(TELEMETRY_TOPICS)}")
+        max_rate = self.max_rate if max_rate is None else float(max_rate)
+        if not max_rate > 0 or (self.max_allowed_rate is not None and max_rate > self.max_allowed_rate):
+            raise ValueError(f"Telemetry rate must be between 0 and {self.max_allowed_rate} per second")
+        subscriber = Subscriber(sid, topics, max_rate, bool(delta))
+        previous = self.subscribers.get(sid)
+        if previous is not None:
+            # Keep what the client already has, so deltas continue from it
+            subscriber.sent, subscriber.sent_at = previous.sent, previous.sent_at
+        self.subscribers[sid] = subscriber
+        return subscriber
+
+    def unsubscribe(self, sid):
+        self.subscribers.pop(sid, None)
+
+    def deliver(self, event, payload):
+        """Send one published event to the clients subscribed to its topic."""
+        topic = EVENT_TOPICS.get(event)
+        if topic is None:
+            self.emit(event, payload, None)
+            return
+        if topic in STREAM_TOPICS:
+            self.emit(event, payload, topic_room(topic))
+            return
+        for subscriber in list(self.subscribers.values()):
+            if topic in subscriber.topics:
+                subscriber.pending[event] = payload
+                self._flush(subscriber)
+
+    def _flush(self, subscriber):
+        now = self.clock()
+        interval = 1.0 / subscriber.max_rate
+        next_due = math.inf
+        for event in list(subscriber.pending):
+            due = subscriber.sent_at.get(event, -math.inf) + interval
+            if due <= now:
+                self._send(subscriber, event, subscriber.pending.pop(event), now)
+            else:
+                next_due = min(next_due, due)
+        if next_due < math.inf and (subscriber.flush_at is None or next_due < subscriber.flush_at):
+            subscriber.flush_at = next_due
+            self.schedule(next_due - now, self._scheduled_flush, subscriber)
+
+    def _scheduled_flush(self, subscriber):
+        subscriber.flush_at = None
+        if self.subscribers.get(subscriber.sid) is subscriber:
+            self._flush(subscriber)
+
+    def _send(self, subscriber, event, payload, now):
+        last = subscriber.sent.get(event)
+        if payload == last:
+            return
+        body = payload
+        if subscriber.delta and last is not None and isinstance(payload, dict):
+            body = {key: value for key, value in payload.items() if last.get(key, _MISSING) != value}
+        subscriber.sent[event] = payload
+        subscriber.sent_at[event] = now
+        self.emit(event, body, subscriber.sid)
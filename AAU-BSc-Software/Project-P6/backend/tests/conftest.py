@@ -6,6 +6,8 @@ from unittest.mock import MagicMock, patch
 # Add the project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
+from backend.tsp_pool import get_tsp_pool, warm_up_tsp_pool, shutdown_tsp_pool
+
 @pytest.fixture
 def sample_fixture():
     return "sample data"
@@ -30,4 +32,16 @@ def sample_coordinates():
         (57.0128, 9.9925),  # Southeast corner
         (57.0148, 9.9925),  # Northeast corner
         (57.0148, 9.9905)   # Northwest corner
-    ]
\ No newline at end of file
+    ]
+
+@pytest.fixture
+def field_coordinates():
+    """Sample coordinates for an irregular five-sided field in Aalborg"""
+    return [(57.0128, 9.9905), (57.0128, 9.9985), (57.0178, 9.9995), (57.0188, 9.9925), (57.0158, 9.9905)]
+
+@pytest.fixture
+def tsp_pool():
+    """Warm TSP worker pool with two workers, shut down after the test"""
+    warm_up_tsp_pool(2)
+    yield get_tsp_pool()
+    shutdown_tsp_pool()
@@ -6,7 +6,13 @@ from unittest.mock import patch, MagicMock
 # Add the project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
 
-from backend.algorithm import optimize_tsp_path, calculate_tour_distance
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from backend.algorithm import optimize_tsp_path, calculate_tour_distance, generate_candidate_cells, calculate_cell_coverage
+from backend.algorithm import calculate_coverage_metrics, sweep_order, optimize_sweep_path, polygon_convexity
+from backend.algorithm import calculate_zone_overlap
 
 def test_optimize_tsp_path_single_grid():
     # Arrange
@@ -56,3 +62,149 @@ def test_calculate_tour_distance():
     # Assert
     # Should be: distance(0->1) + distance(1->2) + distance(2->0) = 100 + 150 + 200 = 450
     assert total_distance == 450
+
+def test_generate_candidate_cells_row_major():
+    # Arrange
+    minx, miny, num_x, num_y = 0.0, 0.0, 3, 2
+    
+    # Act
+    centers, corners = generate_candidate_cells(minx, miny, num_x, num_y, 10.0, 5.0, 20.0, 10.0)
+    
+    # Assert
+    assert centers.shape == (6, 2)
+    assert corners.shape == (6, 4, 2)
+    # First row is laid out along x before moving up one step in y
+    assert tuple(centers[1]) == (20.0, 5.0)
+    assert tuple(centers[3]) == (10.0, 10.0)
+    assert [tuple(c) for c in corners[0]] == [(0.0, 0.0), (20.0, 0.0), (20.0, 10.0), (0.0, 10.0)]
+
+def test_calculate_cell_coverage_matches_per_cell_intersection():
+    # Arrange
+    polygon = Polygon([(0, 0), (30, 0), (0, 30)])
+    _, corners = generate_candidate_cells(0.0, 0.0, 4, 4, 8.0, 8.0, 10.0, 10.0)
+    cells = shapely.polygons(corners)
+    
+    # Act
+    intersects, intersection_areas, grid_areas = calculate_cell_coverage(polygon, cells)
+    
+    # Assert
+    for i, corner in enumerate(corners):
+        grid_polygon = Polygon(corner)
+        assert intersects[i] == polygon.intersects(grid_polygon)
+        assert intersection_areas[i] == polygon.intersection(grid_polygon).area
+        assert grid_areas[i] == grid_polygon.area
+
+def test_optimize_tsp_path_time_budget_streams_progress():
+    # Arrange
+    grid_data = [{"center": (57.0 + 0.0002 * (i % 10), 10.0 + 0.0003 * (i // 10)), "corners": [], "coverage": 1.0}
+                 for i in range(60)]
+    progress = []
+    
+    # Act
+    optimized_grid_data, waypoints, path_metrics = optimize_tsp_path(
+        grid_data, time_budget=0.2, progress_callback=progress.append
+    )
+    
+    # Assert
+    assert len(optimized_grid_data) == 60
+    assert progress
+    assert {"total_distance", "grid_count", "iteration", "elapsed"} <= set(progress[-1])
+    assert path_metrics["total_distance"] == pytest.approx(progress[-1]["total_distance"])
+
+def test_calculate_coverage_metrics_matches_union_of_cells():
+    # Arrange
+    polygon = Polygon([(0, 0), (95, 10), (80, 70), (5, 55)])
+    rows, cols = np.divmod(np.arange(20), 5)
+    _, corners = generate_candidate_cells(0, 0, 5, 4, 20, 15, 25, 19)
+    union = shapely.union_all(shapely.polygons(corners))
+    
+    # Act
+    covered_area, extra_area, overlap_area, _ = calculate_coverage_metrics(polygon, 0, 0, rows, cols, 20, 15, 25, 19)
+    
+    # Assert
+    assert covered_area == pytest.approx(union.intersection(polygon).area)
+    assert extra_area == pytest.approx(union.area - union.intersection(polygon).area)
+    assert overlap_area == pytest.approx(20 * 25 * 19 - union.area)
+
+def test_calculate_coverage_metrics_excludes_no_fly_zones():
+    # Arrange
+    polygon = Polygon([(0, 0), (95, 10), (80, 70), (5, 55)])
+    zones = np.array([Polygon([(20, 20), (40, 20), (40, 40), (20, 40)]), Polygon([(85, 0), (120, 0), (120, 30)])])
+    rows, cols = np.divmod(np.arange(20), 5)
+    _, corners = generate_candidate_cells(0, 0, 5, 4, 20, 15, 25, 19)
+    search_area = polygon.difference(shapely.union_all(zones))
+    union = shapely.union_all(shapely.polygons(corners))
+
+    # Act
+    covered_area, _, _, _ = calculate_coverage_metrics(polygon, 0, 0, rows, cols, 20, 15, 25, 19, zones=zones)
+
+    # Assert
+    assert covered_area == pytest.approx(union.intersection(search_area).area)
+
+def test_calculate_zone_overlap_matches_per_cell_difference():
+    # Arrange
+    polygon = Polygon([(0, 0), (30, 0), (0, 30)], [[(2, 2), (6, 2), (6, 6), (2, 6)]])
+    zones = np.array([Polygon([(10, 0), (14, 0), (14, 40), (10, 40)]), Polygon([(-5, 20), (5, 20), (5, 25)])])
+    _, corners = generate_candidate_cells(0.0, 0.0, 4, 4, 8.0, 8.0, 10.0, 10.0)
+    cells = shapely.polygons(corners)
+    search_area = polygon.difference(shapely.union_all(zones))
+
+    # Act
+    _, intersection_areas, _ = calculate_cell_coverage(polygon, cells)
+    overlap = calculate_zone_overlap(polygon, zones, cells)
+
+    # Assert
+    for i, corner in enumerate(corners):
+        assert intersection_areas[i] - overlap[i] == pytest.approx(search_area.intersection(Polygon(corner)).area)
+
+def test_calculate_coverage_metrics_cell_overlap_raster():
+    # Arrange
+    polygon = Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
+    rows, cols = np.divmod(np.arange(9), 3)
+    
+    # Act
+    _, _, _, cell_overlap = calculate_coverage_metrics(polygon, 0, 0, rows, cols, 8, 8, 10, 10)
+    
+    # Assert
+    # Corner cells overlap a 2 m strip on two sides, the center cell on all four
+    assert cell_overlap[0] == pytest.approx(1 - 0.8 * 0.8)
+    assert cell_overlap[4] == pytest.approx(1 - 0.6 * 0.6)
+
+def test_sweep_order_alternates_direction_and_skips_empty_rows():
+    # Arrange
+    rows = np.array([0, 0, 0, 2, 2, 3])
+    cols = np.array([0, 1, 2, 0, 1, 1])
+    
+    # Act
+    order = sweep_order(rows, cols)
+    reversed_order = sweep_order(rows, cols, descending=True, reversed_first=True)
+    
+    # Assert
+    assert order == [0, 1, 2, 4, 3, 5]
+    assert reversed_order == [5, 3, 4, 2, 1, 0]
+
+def test_optimize_sweep_path_visits_every_grid_once():
+    # Arrange
+    grid_data = [
+        {"center": (57.0 + row * 0.0002, 9.9 + col * 0.0003), "row": row, "col": col}
+        for row in range(4) for col in range(5)
+    ]
+    
+    # Act
+    optimized_grid_data, waypoints, path_metrics = optimize_sweep_path(grid_data, start_point=(57.0, 9.9))
+    
+    # Assert
+    assert sorted(id(grid) for grid in optimized_grid_data) == sorted(id(grid) for grid in grid_data)
+    assert waypoints[0]["type"] == "start_end" and waypoints[-1]["type"] == "start_end"
+    assert optimized_grid_data[0] is grid_data[0]
+    assert path_metrics["grid_count"] == 20
+
+def test_polygon_convexity():
+    # Arrange
+    square = [(57.0, 9.9), (57.0, 9.91), (57.01, 9.91), (57.01, 9.9)]
+    l_shape = [(57.0, 9.9), (57.0, 9.91), (57.002, 9.91), (57.002, 9.902), (57.01, 9.902), (57.01, 9.9)]
+    
+    # Act / Assert
+    assert polygon_convexity(square) == pytest.approx(1.0)
+    assert polygon_convexity(l_shape) < 0.9
+
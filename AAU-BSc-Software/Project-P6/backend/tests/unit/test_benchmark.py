@@ -0,0 +1,49 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.benchmark import generate_corpus, run_case, compare_to_baseline, CORPUS_SHAPES
+
+def test_corpus_is_reproducible_for_any_subset():
+    # Act
+    corpus = generate_corpus(cells=(10, 100))
+    holes_only = generate_corpus(shapes=("holes",), cells=(100,))
+
+    # Assert
+    assert len(corpus) == len(CORPUS_SHAPES) * 2 * 3
+    assert generate_corpus(cells=(10, 100)) == corpus
+    assert holes_only == [case for case in corpus if case["shape"] == "holes" and case["target_cells"] == 100]
+    assert all(len(case["holes"]) == 3 for case in holes_only)
+
+def test_run_case_places_about_the_target_number_of_cells():
+    # Arrange
+    case = next(case for case in generate_corpus(shapes=("concave",), cells=(100,)) if case["altitude"] == 25)
+
+    # Act
+    result = run_case(case)
+
+    # Assert
+    assert 80 <= result["cell_count"] <= 120
+    assert result["tour_length"] > 0
+    assert result["peak_memory"] > 0
+    assert result["wall_time"] == pytest.approx(result["placement_time"] + result["tsp_time"])
+
+def test_compare_to_baseline_flags_regressions_beyond_tolerance():
+    # Arrange
+    reference = {"cell_count": 100, "tour_length": 1000.0, "placement_time": 1.0, "tsp_time": 2.0,
+                 "peak_memory": 1000, "wall_time": 3.0}
+    baseline = {"cases": {"case": reference, "large": dict(reference, peak_memory=None)}}
+    noise = dict(reference, tsp_time=2.3, tour_length=1005.0, peak_memory=1100)
+    slower = dict(reference, cell_count=99, tsp_time=3.0, peak_memory=2000, tour_length=1100.0)
+
+    # Act
+    quiet = compare_to_baseline({"case": noise, "large": dict(noise, peak_memory=None), "new": slower}, baseline)
+    flagged = compare_to_baseline({"case": slower}, baseline)
+
+    # Assert
+    assert quiet == []
+    assert len(flagged) == 4
+    assert any("tsp_time" in regression for regression in flagged)
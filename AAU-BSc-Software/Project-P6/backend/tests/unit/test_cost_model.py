@@ -0,0 +1,63 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+import numpy as np
+
+from backend.cost_model import FlightCostModel, angle_difference, axial_angle_difference
+from backend.algorithm import optimize_tsp_path
+
+def test_edge_costs_are_symmetric_stop_to_stop_times():
+    # Arrange
+    model = FlightCostModel(cruise_speed=2.0, acceleration=1.0, yaw_rate=45.0, wind_speed=1.0, wind_direction=90)
+    points = np.array([[0, 0], [100, 0], [0, 1], [30, 40]])
+
+    # Act
+    costs = model.edge_costs(points)
+
+    # Assert
+    assert np.allclose(costs, costs.T)
+    assert np.all(np.diag(costs) == 0)
+    # No wind along a north-south leg: 1 m is a triangular profile, plus the constant 180 degrees of yaw
+    assert costs[0, 2] == pytest.approx(2 * np.sqrt(1.0) + 4.0)
+    # Along the wind the mean of 3 m/s and 1 m/s stop-to-stop times
+    expected = ((100 / 3 + 3) + (100 / 1 + 1)) / 2 + 4.0
+    assert costs[0, 1] == pytest.approx(expected)
+
+def test_axial_yaw_time_prefers_legs_along_the_photo_axis():
+    # Arrange
+    model = FlightCostModel(yaw_rate=45.0, axial_photo_heading=True)
+
+    # Act
+    along = model.yaw_time(np.array([0.0, 180.0]), photo_heading=0)
+    across = model.yaw_time(np.array([90.0, 270.0]), photo_heading=0)
+
+    # Assert
+    assert np.allclose(along, 0)
+    assert np.allclose(across, 4.0)
+
+def test_angle_differences_wrap_around():
+    # Act / Assert
+    assert angle_difference(350, 10) == pytest.approx(20)
+    assert angle_difference(0, 180) == pytest.approx(180)
+    assert axial_angle_difference(170, 0) == pytest.approx(10)
+    assert axial_angle_difference(95, 0) == pytest.approx(85)
+
+def test_optimize_tsp_path_with_cost_model_reports_travel_time():
+    # Arrange
+    grid_data = [
+        {"center": (57.0 + row * 0.0002, 9.9 + col * 0.0003), "rotation": 90}
+        for row in range(3) for col in range(4)
+    ]
+    model = FlightCostModel(axial_photo_heading=True)
+
+    # Act
+    optimized_grid_data, waypoints, path_metrics = optimize_tsp_path(grid_data, cost_model=model)
+
+    # Assert
+    assert len(optimized_grid_data) == 12
+    assert path_metrics["travel_time"] > 12 * model.photo_hold
+    assert all(waypoint["rotation"] in (90, 270) for waypoint in waypoints)
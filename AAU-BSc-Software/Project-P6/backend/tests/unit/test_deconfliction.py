@@ -0,0 +1,96 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.deconfliction import (
+    build_trajectory, conflicting_delays, earliest_clear_delay, deconflict_plans, LAYER_SEPARATION
+)
+from backend.config import MAX_ALTITUDE
+from backend.flight_time import FlightTimeModel
+from backend.geo_utils import create_local_projection
+
+to_local, to_wgs84 = create_local_projection(57.0, 10.0)
+
+def _plan(points):
+    """Plan through local points, photographing at every point but the first and last."""
+    path = []
+    for k, (x, y) in enumerate(points):
+        lon, lat = to_wgs84(x, y)
+        kind = "start_end" if k in (0, len(points) - 1) else "grid_center"
+        path.append({"lat": float(lat), "lon": float(lon), "type": kind, "order": k})
+    return {"path": path, "metadata": {"altitude": 20}}
+
+# Two drones crossing the same point from different directions at the same time
+CROSSING = [[(0, 0), (0, 100), (0, 200), (0, 0)], [(-100, 100), (0, 100), (100, 100), (-100, 100)]]
+
+def test_conflicting_delays_match_sampled_distances():
+    # Arrange
+    model = FlightTimeModel()
+    rng = np.random.default_rng(4)
+    fixed = build_trajectory(rng.uniform(0, 150, (8, 2)), [True] * 8, 20, model)
+    moving = build_trajectory(rng.uniform(0, 150, (8, 2)), [True] * 8, 20, model)
+    times = np.arange(0, fixed.duration, 0.05)
+
+    # Act
+    intervals = conflicting_delays(fixed, moving, 10)
+
+    # Assert
+    for delay in np.linspace(-moving.duration, fixed.duration, 120):
+        flown = times[(times >= delay) & (times <= moving.duration + delay)]
+        if not len(flown):
+            continue
+        closest = np.hypot(*(fixed.position(flown) - moving.position(flown - delay)).T).min()
+        inside = np.any((intervals[:, 0] < delay) & (intervals[:, 1] > delay))
+        if closest < 9.9:
+            assert inside
+        if closest > 10.5:
+            assert not inside
+
+def test_earliest_clear_delay():
+    # Act / Assert
+    assert earliest_clear_delay(np.empty((0, 2))) == 0.0
+    assert earliest_clear_delay(np.array([[-5.0, 3.0], [2.0, 8.0], [10.0, 12.0]])) == 8.0
+    assert earliest_clear_delay(np.array([[-5.0, -1.0], [4.0, 8.0]])) == 0.0
+
+def test_delay_mode_separates_crossing_drones():
+    # Arrange
+    plans = [_plan(points) for points in CROSSING]
+    model = FlightTimeModel()
+
+    # Act
+    result = deconflict_plans(plans, mode="delay", min_separation=10, model=model)
+
+    # Assert
+    assert result["conflicts"] == 1
+    assert sorted(result["delays"])[0] == 0.0 and max(result["delays"]) > 0
+    trajectories = [build_trajectory(points, [False, True, True, False], 20, model) for points in CROSSING]
+    delays = result["delays"]
+    times = np.arange(max(delays), min(t.duration + d for t, d in zip(trajectories, delays)), 0.05)
+    positions = [t.position(times - d) for t, d in zip(trajectories, delays)]
+    assert np.hypot(*(positions[0] - positions[1]).T).min() >= 10 - 1e-6
+
+def test_altitude_mode_layers_conflicting_drones():
+    # Arrange
+    plans = [_plan(CROSSING[0]), _plan(CROSSING[1]), _plan([(500, 0), (500, 100), (500, 0)])]
+
+    # Act
+    result = deconflict_plans(plans, mode="altitude", min_separation=10, model=FlightTimeModel())
+
+    # Assert
+    assert result["delays"] == [0.0, 0.0, 0.0]
+    assert result["altitudes"][0] != result["altitudes"][1]
+    assert result["altitudes"][2] == 20
+
+def test_altitude_mode_rejects_layers_above_the_altitude_limit():
+    # Arrange
+    plans = [_plan(points) for points in CROSSING]
+    for plan in plans:
+        plan["metadata"]["altitude"] = MAX_ALTITUDE - LAYER_SEPARATION / 2
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="altitude layers"):
+        deconflict_plans(plans, mode="altitude", min_separation=10, model=FlightTimeModel())
@@ -0,0 +1,67 @@
+import pytest
+import math
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.distance_matrix import build_distance_matrix, haversine_distances, find_nearest_index, nearest_neighbor_tour
+
+CENTERS = [(57.0128, 9.9905), (57.0138, 9.9905), (57.0138, 9.9925), (57.0148, 9.9915)]
+
+def _scalar_haversine(p1, p2):
+    lat1, lon1, lat2, lon2 = map(math.radians, [p1[0], p1[1], p2[0], p2[1]])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371000 * 2 * math.asin(math.sqrt(a))
+
+def test_haversine_matrix_matches_scalar_formula():
+    # Act
+    matrix = build_distance_matrix(CENTERS, method="haversine")
+    
+    # Assert
+    assert matrix.shape == (4, 4)
+    for i, p1 in enumerate(CENTERS):
+        for j, p2 in enumerate(CENTERS):
+            assert matrix[i, j] == pytest.approx(_scalar_haversine(p1, p2), abs=1e-6)
+
+def test_local_matrix_close_to_haversine():
+    # Act
+    local = build_distance_matrix(CENTERS)
+    great_circle = build_distance_matrix(CENTERS, method="haversine")
+    
+    # Assert
+    assert np.allclose(local, local.T)
+    assert np.all(np.diag(local) == 0)
+    assert np.allclose(local, great_circle, rtol=0.005)
+
+def test_build_distance_matrix_compact_dtype_and_invalid_method():
+    # Act
+    matrix = build_distance_matrix(CENTERS, dtype=np.float32)
+    
+    # Assert
+    assert matrix.dtype == np.float32
+    with pytest.raises(ValueError):
+        build_distance_matrix(CENTERS, method="manhattan")
+
+def test_find_nearest_index():
+    # Act / Assert
+    assert find_nearest_index(CENTERS, (57.01475, 9.9914)) == 3
+    assert find_nearest_index(CENTERS, (57.0127, 9.9904), method="haversine") == 0
+    assert haversine_distances((57.0128, 9.9905), (57.0128, 9.9905)) == 0
+
+def test_nearest_neighbor_tour():
+    # Arrange
+    distances = np.array([
+        [0, 1, 5, 2],
+        [1, 0, 3, 6],
+        [5, 3, 0, 4],
+        [2, 6, 4, 0]
+    ], dtype=float)
+    
+    # Act
+    tour = nearest_neighbor_tour(distances, start_idx=0)
+    
+    # Assert
+    assert tour == [0, 1, 2, 3]
@@ -0,0 +1,96 @@
+import pytest
+import sys
+import os
+import json
+import datetime
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.flight_time import (
+    FlightTimeModel, DEFAULT_PARAMETERS, calibrate_flight_time_model, extract_phase_samples
+)
+
+def _mission_log(leg_seconds_per_meter=0.2, leg_overhead=5.0, hold=8.0, altitude=20.0):
+    """Synthetic log: takeoff, ascend, three waypoints 0.0003 and 0.0006 degrees of latitude apart, land."""
+    now = datetime.datetime(2025, 5, 27, 12, 0, 0)
+    log = []
+
+    def add(action, seconds, **kwargs):
+        nonlocal now
+        log.append({"action": action, "timestamp": now.isoformat(), **kwargs})
+        now += datetime.timedelta(seconds=seconds)
+
+    add("start_mission", 0)
+    add("takeoff", 3)
+    add("ascend", 0.3 * altitude, altitude=altitude)
+    home = (57.0, 10.0)
+    position = home
+    for i, lat in enumerate((57.0003, 57.0009, 57.0012)):
+        meters = (lat - position[0]) * 111195
+        add("move_to_waypoint", leg_overhead + leg_seconds_per_meter * meters, waypoint_num=i + 1, lat=lat, lon=10.0)
+        add("rotate_drone", 5, waypoint_num=i + 1)
+        add("take_photo", 2, waypoint_num=i + 1)
+        add("rotate_to_next", hold - 7, waypoint_num=i + 1, heading=0.0)
+        position = (lat, 10.0)
+    meters = (position[0] - home[0]) * 111195
+    add("return_to_drone_start_point", leg_overhead + leg_seconds_per_meter * meters, lat=home[0], lon=home[1])
+    add("land", 0.8 * altitude)
+    add("complete", 0, success=True)
+    return log
+
+def test_extract_phase_samples():
+    # Act
+    samples = extract_phase_samples(_mission_log())
+
+    # Assert
+    phases = [phase for phase, _, _ in samples]
+    assert phases.count("travel") == 4
+    assert phases.count("waypoint") == 3
+    assert ("takeoff", (1.0,), 3.0) in samples
+    assert ("landing", (20.0,), 16.0) in samples
+
+def test_model_fits_per_phase_durations():
+    # Arrange
+    model = FlightTimeModel()
+
+    # Act
+    model.add_mission("a", _mission_log())
+    model.fit()
+
+    # Assert
+    assert model.parameters["leg_time"] == pytest.approx(5.0, abs=1e-3)
+    assert model.parameters["travel_rate"] == pytest.approx(0.2, abs=1e-5)
+    assert model.parameters["waypoint_time"] == pytest.approx(8.0)
+    assert model.parameters["ascend_rate"] == pytest.approx(0.3)
+    assert model.estimate(100, 2, 30) == pytest.approx(3 + 0.3 * 30 + 2 * 13 + 0.2 * 100 + 0.8 * 30, abs=1e-2)
+
+def test_uncalibrated_model_matches_benchmark_estimate():
+    # Act
+    estimate = FlightTimeModel().estimate(1000, 10, 20)
+
+    # Assert
+    assert FlightTimeModel().parameters == DEFAULT_PARAMETERS
+    assert estimate == pytest.approx(6 + 10 + 200 + 500 + 10)
+
+def test_calibration_only_reads_new_missions(tmp_path):
+    # Arrange
+    missions_dir = tmp_path / "missions"
+    model_path = str(tmp_path / "model.json")
+    for name in ("m1", "m2"):
+        (missions_dir / name).mkdir(parents=True)
+        (missions_dir / name / "log.json").write_text(json.dumps(_mission_log()))
+
+    # Act
+    first = calibrate_flight_time_model(str(missions_dir), model_path)
+    # A corrupt log in an already fitted mission must not be read again
+    (missions_dir / "m1" / "log.json").write_text("not json")
+    (missions_dir / "m3").mkdir()
+    (missions_dir / "m3" / "log.json").write_text(json.dumps(_mission_log(hold=10.0)))
+    second = calibrate_flight_time_model(str(missions_dir), model_path)
+
+    # Assert
+    assert first.missions == {"m1", "m2"}
+    assert second.missions == {"m1", "m2", "m3"}
+    assert second.statistics["waypoint"]["samples"] == 9
+    assert second.parameters["waypoint_time"] == pytest.approx((8.0 * 6 + 10.0 * 3) / 9)
@@ -5,7 +5,11 @@ import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
 
-from backend.geo_utils import create_local_projection, calculate_grid_size
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from backend.geo_utils import create_local_projection, create_area_projection, calculate_grid_size
 
 def test_create_local_projection():
     center_lat = 57.0128
@@ -42,3 +46,46 @@ def test_calculate_grid_size():
         assert height > altitude * 0.3
         
         assert 1.2 < (width / height) < 1.5
+
+def test_projection_accepts_arrays_and_shapely_transform():
+    # Arrange
+    projection = create_local_projection(57.0128, 9.9905)
+    lons = np.array([9.9905, 9.9915, 9.9925])
+    lats = np.array([57.0128, 57.0138, 57.0118])
+
+    # Act
+    xs, ys = projection.to_local(lons, lats)
+    polygon = shapely.transform(Polygon(zip(lons, lats)), projection.local_coords)
+
+    # Assert
+    for lon, lat, x, y in zip(lons, lats, xs, ys):
+        assert projection.to_local(lon, lat) == pytest.approx((x, y))
+    assert np.allclose(shapely.get_coordinates(polygon)[:3], np.column_stack((xs, ys)))
+    assert np.allclose(projection.wgs84_coords(projection.local_coords(np.column_stack((lons, lats)))),
+                       np.column_stack((lons, lats)))
+
+def test_accurate_projection_round_trip_and_scale():
+    # Arrange
+    projection = create_local_projection(57.0, 10.0, accurate=True)
+    lons = np.array([10.0, 10.5, 11.0, 9.2])
+    lats = np.array([57.0, 57.3, 56.5, 57.6])
+
+    # Act
+    xs, ys = projection.to_local(lons, lats)
+    back_lons, back_lats = projection.to_wgs84(xs, ys)
+
+    # Assert
+    assert projection.to_local(10.0, 57.0) == pytest.approx((0.0, 0.0), abs=1e-6)
+    assert np.allclose(back_lons, lons, atol=1e-9) and np.allclose(back_lats, lats, atol=1e-9)
+    # One degree of latitude on the meridian through the center is 111.36 km at 57N (meridional radius of curvature)
+    assert projection.to_local(10.0, 57.5)[1] - projection.to_local(10.0, 56.5)[1] == pytest.approx(111360, abs=1)
+
+def test_create_area_projection_uses_accurate_mode_for_large_areas():
+    # Act
+    small = create_area_projection([(57.0, 10.0), (57.01, 10.0), (57.01, 10.01)])
+    large = create_area_projection([(57.0, 10.0), (57.5, 10.0), (57.5, 11.0)])
+
+    # Assert
+    assert not small.accurate
+    assert large.accurate
+    assert small.center_lat == pytest.approx((57.0 + 57.01 + 57.01) / 3)
@@ -0,0 +1,101 @@
+import pytest
+import sys
+import os
+import contextlib
+import io
+import numpy as np
+import shapely
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.incremental_planner import PlannerSession
+from backend.algorithm import calculate_grid_placement
+from backend.no_fly import get_no_fly_zones
+
+FIELD = [(57.0128, 9.9905), (57.0128, 9.9985), (57.0168, 9.9985), (57.0168, 9.9905)]
+
+def _center_set(grids):
+    return sorted((round(grid["center"]["lat"], 9), round(grid["center"]["lon"], 9)) for grid in grids)
+
+def test_initial_plan_matches_full_grid_placement():
+    # Arrange
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid_data, _, _, _ = calculate_grid_placement(FIELD, 30, 20, 0.5)
+    expected = sorted((round(lat, 9), round(lon, 9)) for lat, lon in (grid["center"] for grid in grid_data))
+
+    # Act
+    session = PlannerSession(FIELD, 30, 20, 0.5, start_point=FIELD[0])
+
+    # Assert
+    assert session.result["grid_count"] == len(grid_data)
+    assert _center_set(session.result["grids"]) == expected
+    assert session.result["metadata"]["incremental"] is False
+
+def test_vertex_edit_only_recomputes_nearby_cells():
+    # Arrange
+    session = PlannerSession(FIELD, 30, 20, 0.5, start_point=FIELD[0])
+    total_cells = len(session.cells)
+    initial_count = session.result["grid_count"]
+    edited = list(FIELD)
+    edited[2] = (57.0172, 9.9990)
+
+    # Act
+    result = session.update(edited)
+
+    # Assert
+    assert result["metadata"]["incremental"] is True
+    assert 0 < result["metadata"]["recomputed_cells"] < total_cells / 2
+    assert result["grid_count"] > initial_count
+
+def test_update_keeps_tour_a_permutation_of_selected_cells():
+    # Arrange
+    session = PlannerSession(FIELD, 30, 20, 0.5, start_point=FIELD[0])
+    shrunk = list(FIELD)
+    shrunk[1] = (57.0128, 9.9950)
+
+    # Act
+    result = session.update(shrunk)
+
+    # Assert
+    assert len(session.tour) == len(set(session.tour)) == result["grid_count"]
+    assert result["path"][0]["type"] == "start_end"
+    assert len(result["path"]) == result["grid_count"] + 2
+
+def test_update_with_unchanged_polygon_recomputes_nothing():
+    # Arrange
+    session = PlannerSession(FIELD, 30, 20, 0.5)
+
+    # Act
+    result = session.update(FIELD)
+
+    # Assert
+    assert result["metadata"]["recomputed_cells"] == 0
+    assert result["grid_count"] == session.result["grid_count"]
+
+def test_holes_and_zones_match_full_grid_placement_and_stay_routed_after_edits():
+    # Arrange
+    hole = [(57.0140, 9.9920), (57.0140, 9.9930), (57.0145, 9.9930), (57.0145, 9.9920)]
+    zone = [(57.0128, 9.9944), (57.0128, 9.9946), (57.0160, 9.9946), (57.0160, 9.9944)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid_data, polygon_area, _, _ = calculate_grid_placement(
+            FIELD, 30, 20, 0.5, holes=[hole], exclusion_zones=[zone]
+        )
+    expected = sorted((round(lat, 9), round(lon, 9)) for lat, lon in (grid["center"] for grid in grid_data))
+    edited = list(FIELD)
+    edited[2] = (57.0172, 9.9990)
+
+    # Act
+    session = PlannerSession(FIELD, 30, 20, 0.5, start_point=FIELD[0], holes=[hole], exclusion_zones=[zone])
+    initial = session.result
+    result = session.update(edited)
+
+    # Assert
+    assert _center_set(initial["grids"]) == expected
+    assert initial["metadata"]["polygon_area"] == pytest.approx(polygon_area)
+    no_fly = get_no_fly_zones([zone])
+    for plan in (initial, result):
+        points = no_fly.project([(waypoint["lat"], waypoint["lon"]) for waypoint in plan["path"]])
+        legs = shapely.linestrings(np.stack([points[:-1], points[1:]], axis=1))
+        assert not shapely.intersects(no_fly.zones[:, None], legs).any()
+        assert plan["path_metrics"]["detour_count"] > 0
@@ -0,0 +1,94 @@
+import pytest
+import sys
+import os
+import time
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.local_search import improve_tour, build_neighbor_lists, _TourSearch, LIST_MATRIX_MAX_CITIES
+from backend.algorithm import calculate_tour_distance
+
+def _distance_matrix(points):
+    points = np.asarray(points, dtype=float)
+    return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+
+def test_improve_tour_removes_crossing():
+    # Arrange - square visited in a crossing order
+    distances = _distance_matrix([(0, 0), (10, 0), (10, 10), (0, 10)])
+    tour = [0, 2, 1, 3]
+    
+    # Act
+    improved = improve_tour(tour, distances)
+    
+    # Assert
+    assert improved[0] == 0
+    assert sorted(improved) == [0, 1, 2, 3]
+    assert calculate_tour_distance(improved, distances) == pytest.approx(40)
+
+def test_improve_tour_is_two_opt_optimal():
+    # Arrange
+    rng = np.random.default_rng(42)
+    distances = _distance_matrix(rng.random((150, 2)) * 1000)
+    tour = list(rng.permutation(150))
+    
+    # Act
+    improved = improve_tour(tour, distances)
+    
+    # Assert
+    n = len(improved)
+    assert improved[0] == tour[0]
+    assert sorted(improved) == list(range(n))
+    assert calculate_tour_distance(improved, distances) < calculate_tour_distance(tour, distances)
+    for i in range(n - 2):
+        for j in range(i + 2, n if i > 0 else n - 1):
+            a, b, c, d = improved[i], improved[i + 1], improved[j], improved[(j + 1) % n]
+            delta = distances[a, c] + distances[b, d] - distances[a, b] - distances[c, d]
+            assert delta > -1e-6
+
+def test_build_neighbor_lists_sorted_and_excludes_self():
+    # Arrange
+    distances = _distance_matrix([(0, 0), (1, 0), (3, 0), (6, 0)])
+    
+    # Act
+    neighbors = build_neighbor_lists(distances, neighbor_count=2)
+    
+    # Assert
+    assert neighbors.tolist() == [[1, 2], [0, 2], [1, 0], [2, 1]]
+
+def test_improve_tour_anytime_respects_deadline_and_reports_progress():
+    # Arrange
+    rng = np.random.default_rng(7)
+    distances = _distance_matrix(rng.random((300, 2)) * 1000)
+    tour = list(range(300))
+    progress = []
+    
+    # Act
+    started = time.perf_counter()
+    improved = improve_tour(tour, distances, deadline=started + 0.3,
+                            on_improve=lambda length, iteration: progress.append((length, iteration)))
+    elapsed = time.perf_counter() - started
+    
+    # Assert
+    assert sorted(improved) == list(range(300))
+    assert elapsed < 1.0
+    assert progress
+    lengths = [length for length, _ in progress]
+    assert lengths == sorted(lengths, reverse=True)
+    assert calculate_tour_distance(improved, distances) == pytest.approx(lengths[-1])
+
+def test_improve_tour_searches_large_compact_matrices_in_place():
+    # Arrange - a lattice (many tied distances) above the list-copy limit, stored as float32
+    rows, cols = np.divmod(np.arange(LIST_MATRIX_MAX_CITIES + 100), 50)
+    distances = _distance_matrix(np.column_stack((cols * 17.3, rows * 12.9))).astype(np.float32)
+    tour = list(range(len(distances)))
+    search = _TourSearch(tour, distances, 10, 3)
+
+    # Act
+    improved = improve_tour(tour, distances, kicks=20)
+
+    # Assert
+    assert search.dist is distances
+    assert sorted(improved) == tour
+    assert calculate_tour_distance(improved, distances) <= calculate_tour_distance(tour, distances)
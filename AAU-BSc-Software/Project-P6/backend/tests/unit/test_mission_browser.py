@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+import json
+from io import BytesIO
+from PIL import Image
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.mission_browser import MissionBrowser, ThumbnailCache
+
+def _jpeg(color, width=640, height=480):
+    buf = BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+@pytest.fixture
+def browser(tmp_path):
+    mission = tmp_path / "missions" / "2025-05-01T10-00-00"
+    mission.mkdir(parents=True)
+    for name in ("10.jpg", "2.jpg", "1.jpg", "2_detected.jpg"):
+        (mission / name).write_bytes(_jpeg((10 * len(name), 80, 80)))
+    (mission / "log.json").write_text(json.dumps([{"action": "takeoff"}]))
+    (mission / "mission.json").write_text(json.dumps({"altitude": 25}))
+    return MissionBrowser(str(tmp_path / "missions"), ThumbnailCache(str(tmp_path / "cache"), max_size=64),
+                          page_size=2)
+
+def test_manifest_lists_photos_in_flight_order_and_follows_file_changes(browser):
+    # Arrange
+    mission_path = browser.mission_path("2025-05-01T10-00-00")
+    first = browser.manifest("2025-05-01T10-00-00")
+
+    # Act
+    with open(os.path.join(mission_path, "log.json"), "w") as f:
+        json.dump([{"action": "takeoff"}, {"action": "land"}], f)
+    os.utime(os.path.join(mission_path, "log.json"), ns=(0, 10 ** 9))
+    second = browser.manifest("2025-05-01T10-00-00")
+
+    # Assert
+    assert [photo["filename"] for photo in first["photos"]] == ["1.jpg", "2.jpg", "10.jpg"]
+    assert [photo["detected_filename"] for photo in first["photos"]] == [None, "2_detected.jpg", None]
+    assert first["pages"] == 2 and first["mission"] == {"altitude": 25}
+    assert browser.manifest("2025-05-01T10-00-00") is second
+    assert len(second["log"]) == 2
+
+def test_thumbnail_cache_reuses_thumbnails_until_the_photo_changes(tmp_path):
+    # Arrange
+    cache = ThumbnailCache(str(tmp_path / "cache"), max_size=64)
+    photo = tmp_path / "1.jpg"
+    photo.write_bytes(_jpeg((200, 0, 0)))
+    first = cache.get(str(photo))
+    cached_file = os.path.join(cache.cache_dir, os.listdir(cache.cache_dir)[0])
+
+    # Act
+    cached = cache.get(str(photo))
+    photo.write_bytes(_jpeg((0, 0, 200), width=320))
+    os.utime(photo, ns=(0, os.stat(cached_file).st_mtime_ns + 10 ** 9))
+    replaced = cache.get(str(photo))
+
+    # Assert
+    assert cached == first
+    with Image.open(BytesIO(first)) as img:
+        assert img.size == (64, 48)
+    with Image.open(BytesIO(replaced)) as img:
+        assert img.size == (43, 64)
+    assert os.listdir(cache.cache_dir) == [os.path.basename(cached_file)]
+
+def test_thumbnail_pages_and_photo_ranges_only_serve_mission_photos(browser):
+    # Arrange
+    mission = "2025-05-01T10-00-00"
+    photo = open(os.path.join(browser.mission_path(mission), "2_detected.jpg"), "rb").read()
+
+    # Act
+    page = browser.thumbnail_page(mission, 1)
+    parts, offset = [], 0
+    while offset < len(photo):
+        part = browser.photo_range(mission, "2_detected.jpg", offset, 1000)
+        parts.append(part["data"])
+        offset += len(part["data"])
+
+    # Assert
+    assert [(item["index"], item["filename"]) for item in page["thumbnails"]] == [(2, "10.jpg")]
+    assert page["thumbnails"][0]["thumbnail"][:2] == b"\xff\xd8"
+    assert b"".join(parts) == photo
+    with pytest.raises(ValueError):
+        browser.photo_range(mission, "log.json")
+    with pytest.raises(ValueError):
+        browser.manifest("../missions")
@@ -0,0 +1,94 @@
+import pytest
+import sys
+import os
+import json
+import shutil
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.mission_catalog import MissionCatalog
+
+def _mission(missions_dir, name, started_at, waypoints, detected, drone="10.202.0.1"):
+    path = missions_dir / name
+    path.mkdir(parents=True)
+    for index in range(1, len(waypoints) + 1):
+        (path / f"{index}.jpg").write_bytes(b"\xff\xd8photo")
+        if index in detected:
+            (path / f"{index}_detected.jpg").write_bytes(b"\xff\xd8annotated")
+    (path / "log.json").write_text(json.dumps([
+        {"action": "start_mission", "timestamp": f"{started_at}T10:00:00"},
+        {"action": "take_photo", "timestamp": f"{started_at}T10:01:00", "waypoint_num": 1},
+        {"action": "take_photo", "timestamp": f"{started_at}T10:02:00", "waypoint_num": 2},
+        {"action": "complete", "timestamp": f"{started_at}T10:05:00", "success": True},
+    ]))
+    (path / "mission.json").write_text(json.dumps({
+        "waypoints": [{"lat": lat, "lon": lon, "type": "grid_center"} for lat, lon in waypoints],
+        "altitude": "20",
+        "drone": drone,
+    }))
+    return path
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = MissionCatalog(str(tmp_path / "missions.sqlite3"))
+    yield catalog
+    catalog.close()
+
+def test_add_mission_indexes_metadata_log_summary_and_located_photos(tmp_path, catalog):
+    # Arrange
+    path = _mission(tmp_path / "missions", "2025-05-27T10-05-00", "2025-05-27", [(57.0, 10.0), (57.001, 10.0)],
+                    detected={2})
+
+    # Act
+    catalog.add_mission(str(path))
+    missions = catalog.find_missions()
+    photos = catalog.find_photos()
+
+    # Assert
+    assert len(missions) == 1
+    mission = missions[0]
+    assert mission["started_at"] == "2025-05-27T10:00:00"
+    assert (mission["success"], mission["duration"], mission["altitude"]) == (1, 300.0, 20.0)
+    assert (mission["photo_count"], mission["detection_count"]) == (2, 1)
+    assert mission["actions"] == {"start_mission": 1, "take_photo": 2, "complete": 1}
+    assert [(photo["filename"], photo["detected"], photo["lat"]) for photo in photos] == \
+        [("1.jpg", 0, 57.0), ("2.jpg", 1, 57.001)]
+
+def test_searches_filter_by_area_date_detections_and_drone(tmp_path, catalog):
+    # Arrange
+    missions_dir = tmp_path / "missions"
+    catalog.add_mission(str(_mission(missions_dir, "may", "2025-05-01", [(57.0, 10.0), (57.1, 10.1)], detected={1, 2})))
+    catalog.add_mission(str(_mission(missions_dir, "june", "2025-06-01", [(57.0, 10.0), (57.1, 10.1)],
+                                     detected={1}, drone="192.168.53.1")))
+    around_first_waypoint = [(56.99, 9.99), (56.99, 10.01), (57.01, 10.01), (57.01, 9.99)]
+
+    # Act
+    detections = catalog.find_photos(detected=True, polygon=around_first_waypoint, since="2025-05-15")
+    in_area = catalog.find_photos(polygon=around_first_waypoint)
+
+    # Assert
+    assert [(photo["mission"], photo["filename"]) for photo in detections] == [("june", "1.jpg")]
+    assert [photo["mission"] for photo in in_area] == ["june", "may"]
+    assert [mission["name"] for mission in catalog.find_missions(min_detections=2)] == ["may"]
+    assert [(mission["name"], mission["actions"]["take_photo"])
+            for mission in catalog.find_missions(drone="192.168.53.1")] == [("june", 2)]
+    assert catalog.find_missions(polygon=[(50.0, 5.0), (50.0, 5.1), (50.1, 5.1)]) == []
+
+def test_sync_indexes_new_and_changed_missions_and_drops_removed_ones(tmp_path, catalog):
+    # Arrange
+    missions_dir = tmp_path / "missions"
+    _mission(missions_dir, "first", "2025-05-01", [(57.0, 10.0)], detected=set())
+    second = _mission(missions_dir, "second", "2025-05-02", [(57.0, 10.0)], detected=set())
+    assert catalog.sync(str(missions_dir)) == 2
+
+    # Act
+    unchanged = catalog.sync(str(missions_dir))
+    shutil.rmtree(second)
+    catalog.sync(str(missions_dir))
+
+    # Assert
+    assert unchanged == 0
+    assert catalog.mission_names() == ["first"]
+    assert len(catalog.find_photos(polygon=[(56.9, 9.9), (56.9, 10.1), (57.1, 10.1), (57.1, 9.9)])) == 1
+    assert catalog.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.multi_drone import plan_multi_drone, balanced_capacities, capacitated_kmeans
+from backend.algorithm import calculate_grid_placement
+from backend.no_fly import get_no_fly_zones
+
+def test_balanced_capacities_equalize_flight_time():
+    # Act
+    capacities = balanced_capacities(100, np.array([10.0, 10.0, 20.0]), np.array([0.0, 100.0, 0.0]))
+
+    # Assert
+    assert capacities.sum() == 100
+    # The far drone and the slow drone get fewer grids
+    assert capacities[0] > capacities[1]
+    assert capacities[0] > capacities[2]
+    times = capacities * np.array([10.0, 10.0, 20.0]) + np.array([0.0, 100.0, 0.0])
+    assert times.max() - times.min() <= 20
+
+def test_capacitated_kmeans_respects_capacities():
+    # Arrange
+    points = np.random.default_rng(1).uniform(0, 100, (90, 2))
+
+    # Act
+    labels, _ = capacitated_kmeans(points, points[:3], np.array([50, 25, 15]))
+
+    # Assert
+    assert np.bincount(labels, minlength=3).tolist() == [50, 25, 15]
+
+def test_plan_multi_drone_splits_all_grids_with_balanced_flights(tsp_pool, field_coordinates):
+    # Act
+    result = plan_multi_drone(field_coordinates, 20, 20, 0.3, 3, [(57.0120, 9.9900)])
+
+    # Assert
+    plans = result["drones"]
+    assert len(plans) == 3
+    grid_ids = sorted(
+        waypoint["grid_id"] for plan in plans for waypoint in plan["path"] if waypoint["type"] == "grid_center"
+    )
+    assert grid_ids == list(range(len(grid_ids)))
+    times = [plan["path_metrics"]["estimated_flight_time"] for plan in plans]
+    delays = [plan["metadata"]["departure_delay"] for plan in plans]
+    assert result["metadata"]["makespan"] == max(time + delay for time, delay in zip(times, delays))
+    # Sharing one launch point, the drones must not take off at the same time
+    assert len(set(delays)) == 3
+    assert max(times) < 1.15 * min(times)
+    assert all(plan["path"][0]["type"] == "start_end" for plan in plans)
+
+def test_plan_multi_drone_routes_every_drone_around_exclusion_zones(tsp_pool, field_coordinates):
+    # Arrange
+    launch_point = (57.0120, 9.9900)
+    zone = [(57.0135, 9.9910), (57.0135, 9.9960), (57.0140, 9.9960), (57.0140, 9.9910)]
+    hole = [(57.0160, 9.9940), (57.0160, 9.9955), (57.0170, 9.9955), (57.0170, 9.9940)]
+
+    # Act
+    result = plan_multi_drone(field_coordinates, 20, 20, 0.3, 2, [launch_point], holes=[hole],
+                              exclusion_zones=[zone], sortie_time_budget=1200)
+    grid_data, _, _, _ = calculate_grid_placement(field_coordinates, 20, 20, 0.3, holes=[hole],
+                                                  exclusion_zones=[zone])
+
+    # Assert
+    plans = result["drones"]
+    assert sum(plan["grid_count"] for plan in plans) == len(grid_data)
+    no_fly = get_no_fly_zones([zone])
+    for plan in plans:
+        points = no_fly.project([(waypoint["lat"], waypoint["lon"]) for waypoint in plan["path"]])
+        assert all(no_fly.visible(a, b)[0, 0] for a, b in zip(points[:-1], points[1:]))
+        assert plan["sorties"]
+    assert any(plan["path_metrics"]["detour_count"] for plan in plans)
+
+def test_plan_multi_drone_needs_a_start_point_per_drone(field_coordinates):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        plan_multi_drone(field_coordinates, 20, 20, 0.3, 3, [(57.0120, 9.9900), (57.0130, 9.9900)])
@@ -0,0 +1,99 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+import numpy as np
+import shapely
+
+from backend.no_fly import NoFlyZones, get_no_fly_zones, insert_detours, ZONE_CLEARANCE
+from backend.geo_utils import create_local_projection
+
+to_local, to_wgs84 = create_local_projection(57.0, 10.0)
+
+def _lat_lon(x, y):
+    lon, lat = to_wgs84(x, y)
+    return float(lat), float(lon)
+
+def _square(x, y, size):
+    return [_lat_lon(x, y), _lat_lon(x + size, y), _lat_lon(x + size, y + size), _lat_lon(x, y + size)]
+
+ZONES = [_square(300, 300, 50), _square(600, 200, 30)]
+
+def test_visible_matches_exact_intersection_test():
+    # Arrange
+    no_fly = NoFlyZones(ZONES)
+    points = no_fly.project([_lat_lon(x, y) for x, y in np.random.default_rng(0).uniform(0, 900, (150, 2))])
+
+    # Act
+    visible = no_fly.visible(points, points)
+
+    # Assert
+    legs = shapely.linestrings(np.stack((np.repeat(points, len(points), 0), np.tile(points, (len(points), 1))), axis=1))
+    blocked = np.zeros(len(legs), dtype=bool)
+    for zone in no_fly.blocking:
+        blocked |= shapely.intersects(zone, legs)
+    assert np.array_equal(visible, ~blocked.reshape(len(points), len(points)))
+    assert not visible.all()
+
+def test_routed_distances_price_the_detour():
+    # Arrange
+    no_fly = NoFlyZones(ZONES)
+    centers = [_lat_lon(250, 325), _lat_lon(400, 325), _lat_lon(250, 100)]
+    points = no_fly.project(centers)
+    straight = np.hypot(*(points[:, None] - points[None]).transpose(2, 0, 1))
+
+    # Act
+    routed = no_fly.routed_distances(centers, straight)
+
+    # Assert
+    assert routed[0, 1] > straight[0, 1]
+    assert routed[0, 1] == routed[1, 0]
+    assert routed[0, 2] == straight[0, 2]
+
+def test_insert_detours_keeps_every_leg_clear():
+    # Arrange
+    no_fly = NoFlyZones(ZONES)
+    waypoints = [
+        {"lat": lat, "lon": lon, "type": "grid_center", "grid_id": i, "order": i}
+        for i, (lat, lon) in enumerate([_lat_lon(250, 325), _lat_lon(400, 325), _lat_lon(250, 100)])
+    ]
+
+    # Act
+    routed = insert_detours(waypoints, no_fly)
+
+    # Assert
+    points = no_fly.project([(waypoint["lat"], waypoint["lon"]) for waypoint in routed])
+    assert all(no_fly.visible(a, b)[0, 0] for a, b in zip(points[:-1], points[1:]))
+    assert [waypoint["grid_id"] for waypoint in routed if waypoint["type"] == "grid_center"] == [0, 1, 2]
+    assert any(waypoint["type"] == "detour" for waypoint in routed)
+    assert [waypoint["order"] for waypoint in routed] == list(range(len(routed)))
+
+def test_insert_detours_routes_the_legs_to_and_from_the_launch_point():
+    # Arrange
+    no_fly = NoFlyZones(ZONES)
+    launch_point = _lat_lon(250, 325)
+    lat, lon = _lat_lon(400, 325)
+    waypoints = [{"lat": lat, "lon": lon, "type": "grid_center", "grid_id": 0, "order": 0}]
+
+    # Act
+    routed = insert_detours(waypoints, no_fly, launch_point)
+
+    # Assert
+    points = no_fly.project([launch_point] + [(waypoint["lat"], waypoint["lon"]) for waypoint in routed] + [launch_point])
+    assert all(no_fly.visible(a, b)[0, 0] for a, b in zip(points[:-1], points[1:]))
+    assert routed[0]["type"] == routed[-1]["type"] == "detour"
+    assert [waypoint["order"] for waypoint in routed] == list(range(len(routed)))
+    assert insert_detours(waypoints, no_fly) == waypoints
+
+def test_get_no_fly_zones_reuses_site_graph():
+    # Act
+    first = get_no_fly_zones(ZONES)
+    # Same zones in another order and starting vertex
+    second = get_no_fly_zones([ZONES[1], ZONES[0][1:] + ZONES[0][:1]])
+
+    # Assert
+    assert first is second
+    assert get_no_fly_zones(ZONES, ZONE_CLEARANCE * 2) is not first
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.orientation import find_best_orientation, orientation_candidates, evaluate_orientation
+from backend.algorithm import grid_based_algorithm
+from backend.tsp_pool import shutdown_tsp_pool
+
+# Long, thin field running south-west to north-east
+DIAGONAL_FIELD = [
+    (57.0100, 9.9900),
+    (57.0104, 9.9893),
+    (57.0154, 9.9973),
+    (57.0150, 9.9980)
+]
+
+def test_orientation_candidates_include_edge_headings():
+    # Act
+    headings = orientation_candidates(DIAGONAL_FIELD, step=45)
+    
+    # Assert
+    assert {0.0, 45.0, 90.0, 135.0} <= set(headings)
+    assert len(headings) > 4
+    assert all(0 <= heading < 180 for heading in headings)
+
+def test_find_best_orientation_beats_axis_aligned_grid():
+    # Act
+    heading, evaluations = find_best_orientation(DIAGONAL_FIELD, 20, 10, 0.3, parallel=False)
+    
+    # Assert
+    axis_aligned = evaluate_orientation(DIAGONAL_FIELD, 20, 10, 0.3, 0)
+    best = next(evaluation for evaluation in evaluations if evaluation["rotation"] == heading)
+    assert best["grid_count"] < axis_aligned["grid_count"]
+    assert best["grid_count"] == min(evaluation["grid_count"] for evaluation in evaluations)
+
+def test_find_best_orientation_tour_objective_in_pool():
+    # Act
+    try:
+        heading, evaluations = find_best_orientation(DIAGONAL_FIELD, 20, 10, 0.3, objective="tour",
+                                                     candidate_headings=[0, 35, 90])
+    finally:
+        shutdown_tsp_pool()
+    
+    # Assert
+    assert len(evaluations) == 3
+    assert heading == min(evaluations, key=lambda evaluation: evaluation["total_distance"])["rotation"]
+
+def test_find_best_orientation_invalid_objective():
+    with pytest.raises(ValueError):
+        find_best_orientation(DIAGONAL_FIELD, 20, 10, 0.3, objective="battery")
+
+def test_grid_based_algorithm_auto_rotation_in_metadata_and_waypoints():
+    # Act
+    result = grid_based_algorithm(DIAGONAL_FIELD, 20, 10, 0.3, rotation=30)
+    
+    # Assert
+    assert result["metadata"]["rotation"] == 30
+    assert all(waypoint["rotation"] == 30 for waypoint in result["path"])
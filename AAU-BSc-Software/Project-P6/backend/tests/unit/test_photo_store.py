@@ -0,0 +1,76 @@
+import pytest
+import sys
+import os
+import shutil
+from io import BytesIO
+from PIL import Image
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.photo_store import PhotoStore, make_thumbnail, content_id
+
+def _jpeg(width, height, color=(200, 30, 30)):
+    buf = BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+def test_make_thumbnail_fits_the_max_size_and_keeps_the_aspect_ratio():
+    # Arrange
+    photo = _jpeg(4000, 3000)
+
+    # Act
+    thumbnail = make_thumbnail(photo, max_size=320)
+
+    # Assert
+    with Image.open(BytesIO(thumbnail)) as img:
+        assert img.format == "JPEG"
+        assert img.size == (320, 240)
+    assert len(thumbnail) < len(photo)
+
+def test_store_serves_registered_photos_after_they_are_moved(tmp_path):
+    # Arrange
+    store = PhotoStore()
+    photos_dir, mission_dir = tmp_path / "photos", tmp_path / "mission"
+    photos_dir.mkdir()
+    mission_dir.mkdir()
+    photo = _jpeg(64, 48)
+    (photos_dir / "1.jpg").write_bytes(photo)
+    photo_id = store.add(str(photos_dir / "1.jpg"))
+
+    # Act
+    shutil.move(str(photos_dir / "1.jpg"), str(mission_dir / "1.jpg"))
+    store.relocate(str(photos_dir), str(mission_dir))
+
+    # Assert
+    assert photo_id == content_id(photo)
+    assert store.read(photo_id) == ("1.jpg", photo)
+    assert store.info(photo_id)["size"] == len(photo)
+
+def test_store_returns_none_for_unknown_or_deleted_photos(tmp_path):
+    # Arrange
+    store = PhotoStore()
+    path = tmp_path / "2_detected.jpg"
+    path.write_bytes(_jpeg(64, 48))
+    photo_id = store.add(str(path), path.read_bytes())
+
+    # Act
+    path.unlink()
+
+    # Assert
+    assert store.read("0000000000000000") is None
+    assert store.read(photo_id) is None
+
+def test_clear_forgets_the_previous_mission(tmp_path):
+    # Arrange
+    store = PhotoStore()
+    path = tmp_path / "1.jpg"
+    path.write_bytes(_jpeg(64, 48))
+    photo_id = store.add(str(path))
+
+    # Act
+    store.clear()
+
+    # Assert
+    assert store.photos == {}
+    assert store.read(photo_id) is None
@@ -0,0 +1,121 @@
+import pytest
+import sys
+import os
+import json
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.plan import Plan, from_wire, format_wire
+from backend.plan_cache import PlanCache
+
+START = (57.0120, 9.9900)
+
+def _grid_data(count):
+    """Grids on a 10 m lattice in tour order, as from the path optimizers."""
+    grids = []
+    for k in range(count):
+        lat, lon = 57.0128 + (k // 10) * 1e-4, 9.9905 + (k % 10) * 1.6e-4
+        grids.append({
+            "center": (lat, lon),
+            "corners": [(lat - 5e-5, lon - 8e-5), (lat - 5e-5, lon + 8e-5), (lat + 5e-5, lon + 8e-5),
+                        (lat + 5e-5, lon - 8e-5)],
+            "coverage": 1.0 - k / (2 * count),
+            "rotation": 0,
+        })
+    return grids
+
+def _waypoints(grids):
+    waypoints = [{"lat": START[0], "lon": START[1], "type": "start_end", "order": 0}]
+    for k, grid in enumerate(grids):
+        waypoints.append({
+            "lat": grid["center"][0], "lon": grid["center"][1], "type": "grid_center", "grid_id": k,
+            "order": k + 1, "rotation": 0
+        })
+    waypoints.append({"lat": START[0], "lon": START[1], "type": "start_end", "order": len(waypoints)})
+    return waypoints
+
+def _plan(count=100):
+    grids = _grid_data(count)
+    return Plan.from_grid_data(grids, _waypoints(grids), {"total_distance": 1.0, "grid_count": count},
+                               {"altitude": 20})
+
+def test_plan_reads_like_the_plan_dictionary():
+    # Arrange
+    grids = _grid_data(3)
+    waypoints = _waypoints(grids)
+
+    # Act
+    plan = Plan.from_grid_data(grids, waypoints, {"total_distance": 1.0}, {"altitude": 20})
+
+    # Assert
+    assert plan["grid_count"] == 3
+    assert plan["grids"][1] == {
+        "center": {"lat": grids[1]["center"][0], "lon": grids[1]["center"][1]},
+        "corners": [{"lat": lat, "lon": lon} for lat, lon in grids[1]["corners"]],
+    }
+    assert plan["path"] == waypoints
+    plan["sorties"] = []
+    assert list(plan) == ["grid_count", "grids", "path", "path_metrics", "metadata", "sorties"]
+
+def test_compact_wire_round_trip_is_centimeter_accurate_and_small():
+    # Arrange
+    plan = _plan(1000)
+    legacy = json.dumps(dict(_plan(1000)))
+
+    # Act
+    encoded = json.dumps(plan.to_wire(), separators=(",", ":"))
+    decoded = from_wire(json.loads(encoded))
+
+    # Assert
+    assert len(encoded) * 5 < len(legacy)
+    assert np.abs(decoded.centers - plan.centers).max() < 1e-7
+    assert np.abs(decoded.corners - plan.corners).max() < 1e-7
+    assert [waypoint["type"] for waypoint in decoded["path"]] == [waypoint["type"] for waypoint in plan["path"]]
+    assert decoded["path"][0]["lat"] == pytest.approx(START[0], abs=1e-7)
+    assert decoded["path_metrics"] == plan["path_metrics"]
+
+def test_binary_and_lossless_wire_round_trips():
+    # Arrange
+    plan = _plan()
+
+    # Act
+    binary = plan.to_wire(binary=True)
+    lossless = from_wire(json.loads(json.dumps(plan.to_wire(lossless=True))))
+
+    # Assert
+    assert isinstance(binary["centers"], bytes)
+    assert np.allclose(from_wire(binary).centers, plan.centers, atol=1e-7)
+    assert dict(lossless) == dict(plan)
+    assert np.array_equal(lossless.coverage, plan.coverage)
+
+def test_wire_keeps_paths_that_do_not_fit_the_columns_and_edited_views():
+    # Arrange
+    grids = _grid_data(2)
+    waypoints = _waypoints(grids)
+    waypoints[1]["note"] = "check"
+    plan = Plan.from_grid_data(grids, waypoints, {}, {})
+
+    # Act
+    edited = _plan(5)
+    edited["path"] = edited["path"][1:-1]
+    wire = format_wire({"drones": [plan, dict(edited)], "metadata": {"makespan": 1}})
+
+    # Assert
+    assert from_wire(wire["drones"][0])["path"][1]["note"] == "check"
+    assert [waypoint["type"] for waypoint in from_wire(wire["drones"][1])["path"]] == ["grid_center"] * 5
+
+def test_plan_cache_returns_array_backed_plans():
+    # Arrange
+    cache = PlanCache(max_bytes=10 ** 6)
+    plan = _plan()
+    plan["sorties"] = [{"waypoints": []}]
+
+    # Act
+    cache.put("plan", {"drones": [plan], "metadata": {}})
+    cached = cache.get("plan")
+
+    # Assert
+    assert np.array_equal(cached["drones"][0].centers, plan.centers)
+    assert dict(cached["drones"][0]) == dict(plan)
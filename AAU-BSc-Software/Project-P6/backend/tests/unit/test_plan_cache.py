@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.plan_cache import PlanCache, canonicalize_coordinates, plan_cache_key
+
+SQUARE = [(57.0128, 9.9905), (57.0128, 9.9925), (57.0148, 9.9925), (57.0148, 9.9905)]
+
+def test_canonicalize_coordinates_ignores_start_winding_and_noise():
+    # Arrange
+    rotated = SQUARE[2:] + SQUARE[:2]
+    reversed_winding = list(reversed(SQUARE))
+    closed_and_noisy = [(lat + 1e-9, lon - 1e-9) for lat, lon in SQUARE] + [SQUARE[0]]
+    
+    # Act
+    canonical = canonicalize_coordinates(SQUARE)
+    
+    # Assert
+    assert canonicalize_coordinates(rotated) == canonical
+    assert canonicalize_coordinates(reversed_winding) == canonical
+    assert canonicalize_coordinates(closed_and_noisy) == canonical
+    assert len(canonical) == 4
+
+def test_plan_cache_key_depends_on_parameters():
+    # Act
+    key = plan_cache_key(SQUARE, 20, 30, 0.8, start_point=[57.0128, 9.9905])
+    
+    # Assert
+    assert key == plan_cache_key(list(reversed(SQUARE)), 20.0, 30, 0.8, start_point={"lat": 57.0128, "lon": 9.9905})
+    assert key != plan_cache_key(SQUARE, 25, 30, 0.8, start_point=[57.0128, 9.9905])
+    assert key != plan_cache_key(SQUARE, 20, 30, 0.8, start_point=[57.0128, 9.9905], rotation="auto")
+
+def test_plan_cache_lru_eviction_and_counters():
+    # Arrange
+    cache = PlanCache(max_bytes=70)
+    
+    # Act
+    cache.put("a", {"grid": "a" * 20})
+    cache.put("b", {"grid": "b" * 20})
+    assert cache.get("a") is not None
+    cache.put("c", {"grid": "c" * 20})
+    
+    # Assert - "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == {"grid": "a" * 20}
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["bytes"] <= 70
+
+def test_plan_cache_returns_copies():
+    # Arrange
+    cache = PlanCache(max_bytes=1000)
+    cache.put("plan", {"path": [1, 2, 3]})
+    
+    # Act
+    cache.get("plan").pop("path")
+    
+    # Assert
+    assert cache.get("plan") == {"path": [1, 2, 3]}
+
+def test_plan_cache_spill_survives_restart(tmp_path):
+    # Arrange
+    PlanCache(max_bytes=1000, spill_dir=str(tmp_path)).put("plan", {"grid_count": 4})
+    
+    # Act
+    restarted = PlanCache(max_bytes=1000, spill_dir=str(tmp_path))
+    plan = restarted.get("plan")
+    
+    # Assert
+    assert plan == {"grid_count": 4}
+    assert restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,96 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.sorties import split_sorties
+from backend.flight_time import FlightTimeModel
+from backend.no_fly import NoFlyZones, insert_detours
+from backend.geo_utils import create_local_projection
+
+LAUNCH = (57.0, 10.0)
+
+def _tour(count=20):
+    """A start/end point plus a line of grid waypoints about 33 m apart heading north."""
+    waypoints = [{"lat": LAUNCH[0], "lon": LAUNCH[1], "type": "start_end", "order": 0}]
+    waypoints += [
+        {"lat": LAUNCH[0] + 0.0003 * (i + 1), "lon": LAUNCH[1], "type": "grid_center", "grid_id": i, "order": i + 1}
+        for i in range(count)
+    ]
+    waypoints.append({"lat": LAUNCH[0], "lon": LAUNCH[1], "type": "start_end", "order": count + 1})
+    return waypoints
+
+def test_large_budget_gives_a_single_sortie():
+    # Act
+    sorties = split_sorties(_tour(), LAUNCH, 10000, altitude=20, model=FlightTimeModel())
+
+    # Assert
+    assert len(sorties) == 1
+    assert sorties[0]["path_metrics"]["grid_count"] == 20
+    # Out along the line and straight back: twice the distance to the last grid
+    assert sorties[0]["path_metrics"]["total_distance"] == pytest.approx(2 * 20 * 0.0003 * 111195, rel=1e-3)
+
+def test_sorties_respect_budget_and_keep_tour_order():
+    # Arrange
+    budget = 900
+
+    # Act
+    sorties = split_sorties(_tour(), {"lat": LAUNCH[0], "lon": LAUNCH[1]}, budget, altitude=20, model=FlightTimeModel())
+
+    # Assert
+    assert len(sorties) > 1
+    assert all(sortie["path_metrics"]["estimated_flight_time"] <= budget for sortie in sorties)
+    grid_ids = [waypoint["grid_id"] for sortie in sorties for waypoint in sortie["waypoints"]]
+    assert grid_ids == list(range(20))
+    assert all(waypoint["type"] == "grid_center" for sortie in sorties for waypoint in sortie["waypoints"])
+
+def test_budget_below_single_grid_raises():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        split_sorties(_tour(), LAUNCH, 30, altitude=20, model=FlightTimeModel())
+
+def test_missing_launch_point_raises():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        split_sorties(_tour(), None, 1000)
+
+def test_sorties_keep_the_tour_detours_and_route_their_transit_legs_around_zones():
+    # Arrange: grids in a line north of the launch point, a zone between them and the launch point and
+    # one across the line
+    to_local, to_wgs84 = create_local_projection(*LAUNCH)
+
+    def lat_lon(x, y):
+        lon, lat = to_wgs84(x, y)
+        return float(lat), float(lon)
+
+    def rectangle(x, y, width, height):
+        return [lat_lon(x, y), lat_lon(x + width, y), lat_lon(x + width, y + height), lat_lon(x, y + height)]
+
+    no_fly = NoFlyZones([rectangle(-40, 60, 80, 80), rectangle(-40, 490, 80, 20)])
+    tour = [
+        {"lat": lat, "lon": lon, "type": "grid_center", "grid_id": i, "order": i}
+        for i, (lat, lon) in enumerate(lat_lon(0, 200 + 40 * k) for k in range(15))
+    ]
+    routed = insert_detours(tour, no_fly)
+    budget = 1000
+
+    # Act
+    sorties = split_sorties(routed, LAUNCH, budget, altitude=20, model=FlightTimeModel(), no_fly=no_fly)
+
+    # Assert
+    assert len(sorties) > 1
+    for sortie in sorties:
+        route = [LAUNCH] + [(waypoint["lat"], waypoint["lon"]) for waypoint in sortie["waypoints"]] + [LAUNCH]
+        points = no_fly.project(route)
+        assert all(no_fly.visible(a, b)[0, 0] for a, b in zip(points[:-1], points[1:]))
+        assert sortie["waypoints"][0]["type"] == sortie["waypoints"][-1]["type"] == "detour"
+        assert sortie["path_metrics"]["total_distance"] == pytest.approx(
+            np.hypot(*np.diff(points, axis=0).T).sum(), rel=1e-6
+        )
+        assert sortie["path_metrics"]["estimated_flight_time"] <= budget
+    grid_ids = [waypoint["grid_id"] for sortie in sorties for waypoint in sortie["waypoints"]
+                if waypoint["type"] == "grid_center"]
+    assert grid_ids == list(range(15))
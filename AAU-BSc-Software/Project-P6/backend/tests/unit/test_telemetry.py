@@ -0,0 +1,132 @@
+import pytest
+import sys
+import os
+import threading
+import time
+import eventlet
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.telemetry import TelemetryChannel, TelemetryHub
+
+@pytest.fixture
+def channel():
+    channel = TelemetryChannel()
+    yield channel
+    channel.close()
+
+def test_publish_coalesces_to_the_latest_payload_and_enqueue_keeps_order(channel):
+    # Arrange
+    for percent in (80, 79, 78):
+        channel.publish('battery_update', {"battery_percent": percent})
+    channel.enqueue('flight_log', {"action": "takeoff"})
+    channel.enqueue('flight_log', {"action": "move_to_waypoint"})
+
+    # Act
+    pending = channel.drain()
+
+    # Assert
+    assert pending == [
+        ('battery_update', {"battery_percent": 78}),
+        ('flight_log', {"action": "takeoff"}),
+        ('flight_log', {"action": "move_to_waypoint"}),
+    ]
+    assert channel.drain() == []
+
+def test_wait_wakes_immediately_on_publish_from_a_native_thread(channel):
+    # Arrange
+    published = []
+
+    def producer():
+        time.sleep(0.05)
+        published.append(time.perf_counter())
+        channel.publish('gps_update', {"latitude": 57.0})
+
+    # Act
+    threading.Thread(target=producer).start()
+    channel.wait(timeout=5)
+    woken = time.perf_counter()
+
+    # Assert
+    assert woken - published[0] < 0.02
+    assert channel.drain() == [('gps_update', {"latitude": 57.0})]
+
+def test_wait_sleeps_while_idle(channel):
+    # Arrange
+    channel.publish('gps_update', {"latitude": 57.0})
+    channel.drain()
+
+    # Act / Assert - nothing new was published, so the emitter is not woken
+    with pytest.raises(eventlet.Timeout):
+        channel.wait(timeout=0.05)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _hub():
+    sent, scheduled, clock = [], [], FakeClock()
+    hub = TelemetryHub(
+        emit=lambda event, payload, to: sent.append((event, payload, to)),
+        schedule=lambda delay, callback, *args: scheduled.append((clock.now + delay, callback, args)),
+        max_rate=2, max_allowed_rate=10, clock=clock
+    )
+    return hub, sent, scheduled, clock
+
+def test_hub_rate_limits_each_client_and_sends_the_latest_value():
+    # Arrange
+    hub, sent, scheduled, clock = _hub()
+    hub.subscribe("slow", max_rate=2)
+    hub.subscribe("fast", max_rate=10)
+
+    # Act - a 10 Hz burst of positions for 0.3 s
+    for step in range(4):
+        clock.now = step * 0.1
+        hub.deliver('gps_update', {"latitude": 57.0 + step, "longitude": 9.9})
+    clock.now, callback, args = scheduled[0]
+    callback(*args)
+
+    # Assert
+    slow = [payload["latitude"] for event, payload, to in sent if to == "slow"]
+    fast = [payload["latitude"] for event, payload, to in sent if to == "fast"]
+    assert slow == [57.0, 60.0]
+    assert fast == [57.0, 58.0, 59.0, 60.0]
+
+def test_hub_sends_deltas_and_skips_unchanged_payloads():
+    # Arrange
+    hub, sent, scheduled, clock = _hub()
+    hub.subscribe("client", topics=["gps", "battery"], delta=True)
+
+    # Act
+    hub.deliver('gps_update', {"latitude": 57.0, "longitude": 9.9, "altitude": 20.0})
+    clock.now = 1.0
+    hub.deliver('gps_update', {"latitude": 57.1, "longitude": 9.9, "altitude": 20.0})
+    clock.now = 2.0
+    hub.deliver('gps_update', {"latitude": 57.1, "longitude": 9.9, "altitude": 20.0})
+    hub.deliver('motion_update', {"motion_state": "moving"})
+
+    # Assert
+    assert sent == [
+        ('gps_update', {"latitude": 57.0, "longitude": 9.9, "altitude": 20.0}, "client"),
+        ('gps_update', {"latitude": 57.1}, "client"),
+    ]
+
+def test_hub_sends_stream_topics_to_their_room_and_validates_subscriptions():
+    # Arrange
+    hub, sent, scheduled, clock = _hub()
+
+    # Act
+    hub.deliver('photo_update', {"index": 0})
+    hub.deliver('flight_log', {"action": "takeoff"})
+
+    # Assert
+    assert sent == [('photo_update', {"index": 0}, "telemetry:photos"),
+                    ('flight_log', {"action": "takeoff"}, "telemetry:flight_log")]
+    with pytest.raises(ValueError):
+        hub.subscribe("client", topics=["video"])
+    with pytest.raises(ValueError):
+        hub.subscribe("client", max_rate=50)
@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.tiling import plan_tiled, stitch_tiles, _open_tour
+from backend.algorithm import calculate_grid_placement
+from backend.no_fly import get_no_fly_zones
+
+def test_tiled_plan_selects_the_monolithic_grids(tsp_pool, field_coordinates):
+    # Arrange
+    tiles = []
+
+    # Act
+    plan = plan_tiled(field_coordinates, 20, 20, 0.3, start_point=(57.0120, 9.9900), rotation=15,
+                      tile_cells=6, on_tile=tiles.append)
+    grid_data, _, not_searched_area, _ = calculate_grid_placement(field_coordinates, 20, 20, 0.3, rotation=15)
+
+    # Assert
+    def centers(grids):
+        return sorted((round(lat, 9), round(lon, 9)) for lat, lon in grids)
+    assert centers((grid["center"]["lat"], grid["center"]["lon"]) for grid in plan["grids"]) == \
+        centers(grid["center"] for grid in grid_data)
+    assert plan["metadata"]["not_searched_area"] == pytest.approx(not_searched_area)
+    grid_ids = [waypoint["grid_id"] for waypoint in plan["path"] if waypoint["type"] == "grid_center"]
+    assert sorted(grid_ids) == list(range(plan["grid_count"]))
+    assert plan["metadata"]["tile_count"] > 1
+    assert len(tiles) == plan["metadata"]["tile_count"]
+    assert sum(tile["grid_count"] for tile in tiles) == plan["grid_count"]
+
+def test_tiled_plan_leaves_out_holes_and_routes_around_exclusion_zones(tsp_pool, field_coordinates):
+    # Arrange
+    hole = [(57.0140, 9.9930), (57.0140, 9.9945), (57.0150, 9.9945), (57.0150, 9.9930)]
+    zone = [(57.0160, 9.9950), (57.0160, 9.9965), (57.0170, 9.9965), (57.0170, 9.9950)]
+
+    # Act
+    plan = plan_tiled(field_coordinates, 20, 20, 0.3, drone_start_point=(57.0120, 9.9900), rotation=15,
+                      tile_cells=6, holes=[hole], exclusion_zones=[zone], sortie_time_budget=1200)
+    grid_data, polygon_area, _, _ = calculate_grid_placement(field_coordinates, 20, 20, 0.3, rotation=15,
+                                                             holes=[hole], exclusion_zones=[zone])
+
+    # Assert
+    def centers(grids):
+        return sorted((round(lat, 9), round(lon, 9)) for lat, lon in grids)
+    assert centers((grid["center"]["lat"], grid["center"]["lon"]) for grid in plan["grids"]) == \
+        centers(grid["center"] for grid in grid_data)
+    assert plan["metadata"]["polygon_area"] == pytest.approx(polygon_area)
+    no_fly = get_no_fly_zones([zone])
+    points = no_fly.project([(57.0120, 9.9900)] + [(waypoint["lat"], waypoint["lon"]) for waypoint in plan["path"]])
+    assert all(no_fly.visible(a, b)[0, 0] for a, b in zip(points[:-1], points[1:]))
+    assert plan["sorties"]
+
+def test_tiled_plan_without_grids_raises(tsp_pool, field_coordinates):
+    # Act / Assert
+    with pytest.raises(ValueError, match="No grids could be placed"):
+        plan_tiled(field_coordinates, 20, 20, 1.0, rotation=15, tile_cells=6,
+                   exclusion_zones=[field_coordinates])
+
+def test_stitch_tiles_joins_neighbouring_sub_tours():
+    # Arrange: two 4 x 4 blocks of unit cells side by side, each with a serpentine sub-tour
+    lattice = (0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+    rows, cols = np.divmod(np.arange(16), 4)
+    serpentine = [0, 1, 2, 3, 7, 6, 5, 4, 8, 9, 10, 11, 15, 14, 13, 12]
+    loop = [0, 4, 8, 12, 13, 9, 5, 1, 2, 6, 10, 14, 15, 11, 7, 3]
+    results = [
+        {"rows": rows, "cols": cols, "coverage": np.ones(16), "tour": loop},
+        {"rows": rows, "cols": cols + 4, "coverage": np.ones(16), "tour": serpentine},
+    ]
+
+    # Act
+    _, stitched_cols, _, tour = stitch_tiles(results, lattice, start=np.array([-1.0, 0.5]))
+
+    # Assert
+    assert sorted(tour) == list(range(32))
+    # Starts in the tile next to the start and only crosses between tiles twice
+    assert stitched_cols[tour[0]] < 4
+    assert sum((stitched_cols[a] < 4) != (stitched_cols[b] < 4) for a, b in zip(tour, tour[1:] + tour[:1])) == 2
+
+def test_open_tour_cuts_the_edge_facing_the_neighbours():
+    # Arrange: a square sub-tour with the previous tile to the left and the next one below
+    points = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)])
+
+    # Act
+    path = _open_tour([0, 1, 2, 3], points, previous=np.array([-5.0, 1.0]), following=np.array([0.0, -5.0]))
+
+    # Assert
+    assert path == [3, 2, 1, 0]
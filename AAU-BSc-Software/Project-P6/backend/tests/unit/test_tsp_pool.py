@@ -0,0 +1,56 @@
+import pytest
+import random
+import sys
+import os
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from backend.tsp_pool import (
+    multi_start_tour, solve_start, randomized_nearest_neighbor_tour, random_insertion_tour, get_tsp_pool
+)
+from backend.algorithm import calculate_tour_distance
+
+@pytest.fixture
+def distances():
+    rng = np.random.default_rng(3)
+    points = rng.random((40, 2)) * 500
+    return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+
+def test_randomized_constructions_are_tours_from_start(distances):
+    # Act
+    rng = random.Random(1)
+    tours = [randomized_nearest_neighbor_tour(distances, 5, rng), random_insertion_tour(distances, 5, rng)]
+    
+    # Assert
+    for tour in tours:
+        assert tour[0] == 5
+        assert sorted(tour) == list(range(40))
+
+def test_solve_start_returns_tour_length(distances):
+    # Act
+    tour, length = solve_start(distances, 0, seed=2)
+    
+    # Assert
+    assert tour[0] == 0
+    assert length == pytest.approx(calculate_tour_distance(tour, distances))
+
+def test_multi_start_tour_keeps_shortest(distances, tsp_pool):
+    # Arrange
+    results = []
+    
+    # Act
+    tour = multi_start_tour(distances, start_idx=3, starts=4, on_result=lambda length, done: results.append((length, done)))
+    
+    # Assert
+    assert tour[0] == 3
+    assert sorted(tour) == list(range(40))
+    assert [done for _, done in results] == [1, 2, 3, 4]
+    assert calculate_tour_distance(tour, distances) == pytest.approx(results[-1][0])
+    single_start_length = solve_start(distances, 3, seed=0)[1]
+    assert results[-1][0] <= single_start_length + 1e-6
+
+def test_warm_pool_is_reused(tsp_pool):
+    # Act / Assert
+    assert get_tsp_pool() is tsp_pool
@@ -0,0 +1,283 @@
+import datetime
+import math
+from concurrent.futures import as_completed
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from shapely.affinity import rotate
+
+from algorithm import (
+    calculate_cell_geometry, calculate_cell_coverage, calculate_coverage_metrics, calculate_flyable_cells,
+    rotate_points, build_tour_output, format_plan, project_ring, project_rings, route_around_zones
+)
+from geo_utils import create_area_projection, calculate_grid_size
+from local_search import improve_tour, PointDistances
+from distance_matrix import local_distance_matrix, nearest_neighbor_tour
+from tsp_pool import get_tsp_pool
+from sorties import split_sorties
+from no_fly import get_no_fly_zones
+
+#############################
+# Tiling Settings
+#############################
+
+TILE_CELLS = 40                 # Lattice cells along each side of a tile (at most TILE_CELLS^2 grids per sub-tour)
+REPAIR_WINDOW = 10              # Tour positions on each side of a tile junction reopened by the repair pass
+
+#############################
+# Tiled Planner
+#############################
+
+def plan_tiled(coordinates, altitude, overlap, coverage, start_point=None, drone_start_point=None, rotation=0,
+               tile_cells=TILE_CELLS, on_tile=None, sortie_time_budget=None, holes=None, exclusion_zones=None):
+    """
+    Plan a large area as square tiles of the grid lattice, solved in parallel in the shared process pool.
+
+    Every tile selects its own cells and solves its own closed sub-tour. The tiles are then ordered by a
+    small TSP over their centroids, each sub-tour is opened at the edge that best connects the previous
+    tile to the next one, and a local search around every junction repairs the seams. The lattice is the
+    one calculate_grid_placement lays out, so the same grids are selected as by a monolithic plan.
+    on_tile(tile_plan) receives each tile's grids and sub-tour as soon as that tile is solved.
+    holes, exclusion_zones and sortie_time_budget are handled as by grid_based_algorithm: the tiles are
+    clipped to the polygon without holes and zones, and the stitched tour is routed around the zones.
+    Returns a plan in the format of grid_based_algorithm.
+    """
+    projection = create_area_projection(coordinates)
+    polygon = Polygon(
+        project_ring(coordinates, projection), [project_ring(hole, projection) for hole in holes or []]
+    )
+    zones = shapely.get_parts(shapely.union_all(project_rings(exclusion_zones or [], projection)))
+    if rotation:
+        # Work in the grid frame, where the camera footprint is axis-aligned
+        polygon = rotate(polygon, rotation, origin=(0, 0))
+        zones = shapely.transform(zones, lambda points: rotate_points(points, rotation))
+    # The area the tiles search: the polygon without its holes and the no-fly zones
+    search_area = shapely.difference(polygon, shapely.union_all(zones)) if len(zones) else polygon
+    polygon_area = search_area.area
+    minx, miny, maxx, maxy = polygon.bounds
+    grid_width, grid_height = calculate_grid_size(altitude)
+    step_x = grid_width * (1 - overlap / 100)
+    step_y = grid_height * (1 - overlap / 100)
+    num_x = math.ceil((maxx - minx) / step_x)
+    num_y = math.ceil((maxy - miny) / step_y)
+    lattice = (minx, miny, step_x, step_y, grid_width, grid_height)
+    tiles = _tile_ranges(search_area, lattice, num_x, num_y, tile_cells)
+    polygon_wkb = shapely.to_wkb(search_area)
+    zones_wkb = shapely.to_wkb(shapely.MultiPolygon(list(zones))) if len(zones) else None
+    pool = get_tsp_pool()
+    futures = {
+        pool.submit(plan_tile, polygon_wkb, lattice, row_range, col_range, coverage, zones_wkb): tile_id
+        for tile_id, (row_range, col_range) in enumerate(tiles)
+    }
+    results = [None] * len(tiles)
+    for completed, future in enumerate(as_completed(futures), start=1):
+        tile_id = futures[future]
+        results[tile_id] = future.result()
+        if on_tile:
+            on_tile(_format_tile(results[tile_id], lattice, projection, rotation, {
+                "tile_id": tile_id,
+                "completed": completed,
+                "tile_count": len(tiles),
+            }))
+    results = [result for result in results if len(result["rows"])]
+    tsp_start = start_point if start_point else drone_start_point
+    local_start = None
+    if tsp_start:
+        local_start = project_ring([tsp_start], projection)
+        if rotation:
+            local_start = rotate_points(local_start, rotation)
+        local_start = local_start[0]
+    rows, cols, coverages, tour = stitch_tiles(results, lattice, local_start)
+    if not tour:
+        raise ValueError("No grids could be placed. Please enlarge the area or reduce minimum coverage.")
+    centers, corners = calculate_cell_geometry(minx, miny, rows, cols, step_x, step_y, grid_width, grid_height)
+    grid_data = _grid_data(centers, corners, coverages, rows, cols, projection, rotation)
+    covered_area, extra_area, _, _ = calculate_coverage_metrics(
+        polygon, minx, miny, rows, cols, step_x, step_y, grid_width, grid_height, zones=zones
+    )
+    optimized_grid_data, waypoints, path_metrics = build_tour_output(
+        grid_data, tour, PointDistances(centers), tsp_start, altitude
+    )
+    no_fly = get_no_fly_zones(exclusion_zones) if len(zones) else None
+    if no_fly is not None:
+        # The tiles are solved with straight distances, so the detours are added to the metrics
+        waypoints = route_around_zones(
+            waypoints, path_metrics, no_fly, None if start_point else drone_start_point, altitude, reprice=True
+        )
+    plan = format_plan(optimized_grid_data, waypoints, path_metrics, {
+        "altitude": altitude,
+        "overlap_percent": overlap,
+        "rotation": rotation,
+        "path_mode": "tiled",
+        "tile_count": len(tiles),
+        "start_point": start_point,
+        "drone_start_point": drone_start_point,
+        "created_at": datetime.datetime.now().isoformat(),
+        "polygon_area": polygon_area,
+        "not_searched_area": polygon_area - covered_area,
+        "extra_area": extra_area,
+    })
+    if sortie_time_budget is not None:
+        plan["sorties"] = split_sorties(
+            waypoints, drone_start_point if drone_start_point else start_point, sortie_time_budget, altitude,
+            no_fly=no_fly
+        )
+    return plan
+
+def plan_tile(polygon_wkb, lattice, row_range, col_range, coverage, zones_wkb=None):
+    """
+    Worker task: select the cells of one tile and solve their closed sub-tour.
+    With zones_wkb (the no-fly zones), cells whose center is within ZONE_CLEARANCE of a zone are left out.
+    Returns the selected rows, cols and coverages, and the tour as indices into them.
+    """
+    origin_x, origin_y, step_x, step_y, grid_width, grid_height = lattice
+    rows, cols = np.meshgrid(np.arange(*row_range), np.arange(*col_range), indexing="ij")
+    rows, cols = rows.ravel(), cols.ravel()
+    centers, corners = calculate_cell_geometry(
+        origin_x, origin_y, rows, cols, step_x, step_y, grid_width, grid_height
+    )
+    # Only the part of the polygon under this tile is intersected with its cells
+    polygon = shapely.clip_by_rect(
+        shapely.from_wkb(polygon_wkb), corners[:, :, 0].min(), corners[:, :, 1].min(),
+        corners[:, :, 0].max(), corners[:, :, 1].max()
+    )
+    intersects, intersection_areas, grid_areas = calculate_cell_coverage(polygon, shapely.polygons(corners))
+    cov = intersection_areas / grid_areas
+    flyable = np.ones(len(centers), dtype=bool)
+    if zones_wkb is not None:
+        flyable = calculate_flyable_cells(shapely.get_parts(shapely.from_wkb(zones_wkb)), centers)
+    selected = np.flatnonzero(intersects & flyable & (cov >= coverage))
+    tour = list(range(len(selected)))
+    if len(selected) > 3:
+        distances = local_distance_matrix(centers[selected])
+        tour = improve_tour(nearest_neighbor_tour(distances, 0), distances)
+    return {"rows": rows[selected], "cols": cols[selected], "coverage": cov[selected], "tour": tour}
+
+def stitch_tiles(results, lattice, start=None, repair_window=REPAIR_WINDOW):
+    """
+    Join the closed sub-tours of the tiles into one tour over all their cells.
+
+    Tiles are visited in the order of a TSP over their centroids, starting with the tile closest to
+    start. Each sub-tour is opened at the edge whose removal best connects the exit of the previous tile
+    to this tile's entry and this tile's exit to the next tile. Finally the cities within repair_window
+    tour positions of a junction are reopened for local search, so the cost of the repair does not
+    grow with the number of cells. Returns (rows, cols, coverage, tour).
+    """
+    if not results:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0), []
+    origin_x, origin_y, step_x, step_y, grid_width, grid_height = lattice
+    rows = np.concatenate([result["rows"] for result in results])
+    cols = np.concatenate([result["cols"] for result in results])
+    coverages = np.concatenate([result["coverage"] for result in results])
+    points, _ = calculate_cell_geometry(origin_x, origin_y, rows, cols, step_x, step_y, grid_width, grid_height)
+    offsets = np.cumsum([0] + [len(result["rows"]) for result in results])
+    tiles = [offsets[k] + np.asarray(result["tour"], dtype=int) for k, result in enumerate(results)]
+    centroids = np.array([points[tile].mean(axis=0) for tile in tiles])
+    # Cheap inter-tile ordering over the tile centroids
+    first = int(np.argmin(np.hypot(*(centroids - start).T))) if start is not None else 0
+    order = [first]
+    if len(tiles) > 1:
+        centroid_distances = local_distance_matrix(centroids)
+        order = improve_tour(nearest_neighbor_tour(centroid_distances, first), centroid_distances)
+    tour = []
+    junctions = []
+    previous = start if start is not None else centroids[order[-1]]
+    for position, tile_id in enumerate(order):
+        following = centroids[order[position + 1]] if position + 1 < len(order) else (
+            points[tour[0]] if tour else previous
+        )
+        path = _open_tour(tiles[tile_id], points, previous, following)
+        junctions.append(len(tour))
+        tour.extend(path)
+        previous = points[path[-1]]
+    if len(tiles) > 1:
+        # Boundary repair: local search restricted to the cities around the seams
+        tour_positions = np.asarray(junctions)[:, None] + np.arange(-repair_window, repair_window)[None, :]
+        active = {tour[position % len(tour)] for position in tour_positions.ravel()}
+        tour = improve_tour(tour, PointDistances(points), kicks=0, active=active, verify=False)
+    return rows, cols, coverages, tour
+
+def _open_tour(cycle, points, previous, following):
+    """
+    Open a closed sub-tour into a path: remove the edge (i, i+1) that minimizes the cost of entering from
+    previous and leaving towards following, in either direction around the cycle.
+    """
+    cycle = np.asarray(cycle, dtype=int)
+    if len(cycle) == 1:
+        return cycle.tolist()
+    current = points[cycle]
+    successor = np.roll(current, -1, axis=0)
+    removed = np.hypot(*(current - successor).T)
+    into_current = np.hypot(*(current - previous).T)
+    into_successor = np.hypot(*(successor - previous).T)
+    out_of_current = np.hypot(*(current - following).T)
+    out_of_successor = np.hypot(*(successor - following).T)
+    # Forward: enter at i+1, go around, leave at i. Backward: enter at i, go around the other way, leave at i+1
+    forward = into_successor + out_of_current - removed
+    backward = into_current + out_of_successor - removed
+    edge = int(np.argmin(np.minimum(forward, backward)))
+    path = np.roll(cycle, -(edge + 1))
+    if backward[edge] < forward[edge]:
+        path = path[::-1]
+    return path.tolist()
+
+def _tile_ranges(polygon, lattice, num_x, num_y, tile_cells):
+    """
+    (row_range, col_range) of every tile of the lattice that touches the polygon.
+    """
+    origin_x, origin_y, step_x, step_y, grid_width, grid_height = lattice
+    row_starts = np.arange(0, num_y, tile_cells)
+    col_starts = np.arange(0, num_x, tile_cells)
+    row_starts, col_starts = np.meshgrid(row_starts, col_starts, indexing="ij")
+    row_starts, col_starts = row_starts.ravel(), col_starts.ravel()
+    row_ends = np.minimum(row_starts + tile_cells, num_y)
+    col_ends = np.minimum(col_starts + tile_cells, num_x)
+    boxes = shapely.box(
+        origin_x + col_starts * step_x, origin_y + row_starts * step_y,
+        origin_x + (col_ends - 1) * step_x + grid_width, origin_y + (row_ends - 1) * step_y + grid_height
+    )
+    touching = shapely.intersects(polygon, boxes)
+    return [
+        ((int(row_starts[k]), int(row_ends[k])), (int(col_starts[k]), int(col_ends[k])))
+        for k in np.flatnonzero(touching)
+    ]
+
+def _grid_data(centers, corners, coverages, rows, cols, projection, rotation):
+    """
+    Grid dictionaries (as from calculate_grid_placement) for grid-frame cells.
+    """
+    if rotation:
+        # Rotate the grids back from the grid frame to the local projection
+        centers = rotate_points(centers, -rotation)
+        corners = rotate_points(corners, -rotation)
+    center_lon, center_lat = projection.to_wgs84(centers[:, 0], centers[:, 1])
+    corner_lon, corner_lat = projection.to_wgs84(corners[:, :, 0], corners[:, :, 1])
+    return [{
+        "center": center,
+        "corners": list(zip(corner_lats, corner_lons)),
+        "coverage": grid_coverage,
+        "rotation": rotation,
+        "row": row,
+        "col": col
+    } for center, corner_lats, corner_lons, grid_coverage, row, col in zip(
+        zip(center_lat.tolist(), center_lon.tolist()),
+        corner_lat.tolist(),
+        corner_lon.tolist(),
+        coverages.tolist(),
+        rows.tolist(),
+        cols.tolist()
+    )]
+
+def _format_tile(result, lattice, projection, rotation, metadata):
+    """
+    Streamed plan of a single tile: its grids and closed sub-tour in the plan format.
+    """
+    centers, corners = calculate_cell_geometry(*lattice[:2], result["rows"], result["cols"], *lattice[2:])
+    grid_data = _grid_data(centers, corners, result["coverage"], result["rows"], result["cols"], projection, rotation)
+    if not grid_data:
+        return format_plan([], [], {}, metadata)
+    optimized_grid_data, waypoints, path_metrics = build_tour_output(
+        grid_data, result["tour"], PointDistances(centers)
+    )
+    return format_plan(optimized_grid_data, waypoints, path_metrics, metadata)
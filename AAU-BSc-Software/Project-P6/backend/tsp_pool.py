@@ -0,0 +1,142 @@
+import atexit
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from local_search import improve_tour
+from distance_matrix import nearest_neighbor_tour
+
+#############################
+# Process Pool Settings
+#############################
+
+DEFAULT_POOL_WORKERS = os.cpu_count() or 1
+DEFAULT_START_COUNT = 8         # Independent constructions per multi-start solve
+RANDOMIZED_NN_CHOICES = 3       # Closest unvisited points a randomized nearest-neighbour step picks from
+WARM_UP_HOLD = 0.1              # Seconds each warm-up task holds its worker so every worker gets started
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+#############################
+# Pool Management Functions
+#############################
+
+def get_tsp_pool(max_workers=None):
+    """
+    Return the shared planner process pool, creating it on first use.
+    Workers are forked where possible: spawn would re-import the server module (and its YOLO model) in
+    every worker. Call warm_up_tsp_pool() at start-up, before drone threads exist, so the fork is clean.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = max_workers or DEFAULT_POOL_WORKERS
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=multiprocessing.get_context(start_method))
+        return _pool
+
+def warm_up_tsp_pool(max_workers=None):
+    """
+    Start every worker process and import the solver modules so the first plan does not pay spawn cost.
+    """
+    pool = get_tsp_pool(max_workers)
+    for future in [pool.submit(_warm_up_worker) for _ in range(_pool_workers)]:
+        future.result()
+
+def shutdown_tsp_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+atexit.register(shutdown_tsp_pool)
+
+#############################
+# Multi-start Functions
+#############################
+
+def multi_start_tour(distances, start_idx=0, starts=DEFAULT_START_COUNT, deadline=None, on_result=None, seed=0):
+    """
+    Run `starts` independent constructions + local search in the process pool and keep the shortest tour.
+
+    Start 0 uses the plain nearest-neighbour construction, the others use randomized nearest-neighbour
+    or random-order cheapest insertion with different seeds. deadline is a time.perf_counter() timestamp
+    shared by all starts. on_result(best_length, completed_starts) is called as each start finishes.
+    Every returned tour begins at start_idx.
+    """
+    matrix = np.asarray(distances)
+    remaining = deadline - time.perf_counter() if deadline is not None else None
+    wall_deadline = time.time() + remaining if remaining is not None else None
+    pool = get_tsp_pool()
+    futures = [pool.submit(solve_start, matrix, start_idx, seed + k, wall_deadline) for k in range(starts)]
+    best_tour, best_length = None, float("inf")
+    for completed, future in enumerate(as_completed(futures), start=1):
+        tour, length = future.result()
+        if length < best_length:
+            best_tour, best_length = tour, length
+        if on_result:
+            on_result(best_length, completed)
+    return best_tour
+
+def solve_start(distances, start_idx, seed, wall_deadline=None):
+    """
+    Build and improve one tour. Runs inside a pool worker; returns (tour, length).
+    """
+    deadline = None
+    if wall_deadline is not None:
+        deadline = time.perf_counter() + max(wall_deadline - time.time(), 0)
+    rng = random.Random(seed)
+    if seed == 0:
+        tour = nearest_neighbor_tour(distances, start_idx)
+    elif seed % 2:
+        tour = randomized_nearest_neighbor_tour(distances, start_idx, rng)
+    else:
+        tour = random_insertion_tour(distances, start_idx, rng)
+    tour = improve_tour(tour, distances, seed=seed, deadline=deadline)
+    tour_array = np.asarray(tour)
+    length = float(distances[tour_array, np.roll(tour_array, -1)].sum(dtype=float))
+    return tour, length
+
+def randomized_nearest_neighbor_tour(distances, start_idx, rng, choices=RANDOMIZED_NN_CHOICES):
+    """
+    Nearest-neighbour construction that moves to a random one of the closest unvisited points.
+    """
+    n = len(distances)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start_idx]
+    visited[start_idx] = True
+    current = start_idx
+    for remaining in range(n - 1, 0, -1):
+        row = np.where(visited, np.inf, distances[current])
+        k = min(choices, remaining)
+        closest = np.argpartition(row, k - 1)[:k]
+        current = int(rng.choice(closest.tolist()))
+        visited[current] = True
+        tour.append(current)
+    return tour
+
+def random_insertion_tour(distances, start_idx, rng):
+    """
+    Insert points in random order, each at the position that lengthens the tour the least.
+    """
+    order = [i for i in range(len(distances)) if i != start_idx]
+    rng.shuffle(order)
+    tour = [start_idx, order[0]]
+    for city in order[1:]:
+        tour_array = np.asarray(tour)
+        nxt = np.roll(tour_array, -1)
+        added = distances[tour_array, city] + distances[city, nxt] - distances[tour_array, nxt]
+        position = int(np.argmin(added)) + 1
+        tour.insert(position, city)
+    return tour
+
+def _warm_up_worker():
+    time.sleep(WARM_UP_HOLD)
+    return os.getpid()
@@ -2,7 +2,7 @@ import { useState, useRef, useEffect } from "react";
 import "leaflet/dist/leaflet.css";
 import "leaflet-draw/dist/leaflet.draw.css";
 import MapComponent from "./components/MapComponent";
-import { useSocket } from "./context/SocketContext";
+import { useSocket, photoUrl } from "./context/SocketContext";
 import MissionsFolder from "./components/missions/MissionsFolder";
 import SelectedMission from "./components/missions/SelectedMission";
 import ControlsAndInfo from "./components/ControlsAndInfo/ControlsAndInfo";
@@ -85,7 +85,7 @@ function App() {
     gpsSignal,
     motionState,
     socket,
-    latestPhotoBase64,
+    latestPhotoUrl,
     latestPhotoDetected,
     emitEvent,
   } = useSocket();
@@ -165,45 +165,34 @@ function App() {
     console.log("App.jsx: flightLogs state changed:", flightLogs);
   }, [flightLogs]);
 
-  const latestPicture = latestPhotoBase64
-    ? `data:image/jpeg;base64,${latestPhotoBase64}`
-    : null;
+  const latestPicture = latestPhotoUrl;
 
   useEffect(() => {
-    if (latestPhotoBase64) {
+    if (latestPhotoUrl) {
       console.log("Updating image");
     }
-  }, [latestPhotoBase64]);
+  }, [latestPhotoUrl]);
 
   useEffect(() => {
     if (!socket) return;
 
     function handlePhotoUpdate(data) {
-      if (Array.isArray(data)) {
-        data.forEach((photo) => {
-          if (
-            typeof photo.index === "number" &&
-            photo.photo_base64 &&
-            photo.photo_base64.length > 0
-          ) {
-            setPhotoMap((prev) => ({
-              ...prev,
-              [photo.index]: photo,
-            }));
-          }
-        });
-      } else if (
-        data &&
-        typeof data === "object" &&
-        typeof data.index === "number" &&
-        data.photo_base64 &&
-        data.photo_base64.length > 0
-      ) {
-        setPhotoMap((prev) => ({
-          ...prev,
-          [data.index]: data,
-        }));
-      }
+      const photos = Array.isArray(data) ? data : [data];
+      photos.forEach((photo) => {
+        if (
+          photo &&
+          typeof photo === "object" &&
+          typeof photo.index === "number" &&
+          photo.thumbnail
+        ) {
+          // Keep the thumbnail as an object URL; the full photo is fetched by content_id when opened
+          const { thumbnail, ...rest } = photo;
+          setPhotoMap((prev) => ({
+            ...prev,
+            [photo.index]: { ...rest, thumbnail_url: photoUrl(thumbnail) },
+          }));
+        }
+      });
     }
 
     socket.on("photo_update", handlePhotoUpdate);
@@ -241,7 +230,8 @@ function App() {
     }
     setMissionDataLoading(true);
     setMissionDataError(null);
-    emitEvent("get_completed_mission_data", { mission: selectedMission })
+    // Photo list, log and mission parameters; thumbnails and photos are fetched lazily
+    emitEvent("get_completed_mission_manifest", { mission: selectedMission })
       .then((res) => {
         setMissionData(res);
       })
@@ -288,6 +278,9 @@ function App() {
     // Only increase the drone trail reset key to clear the trail but not the drone marker
     setDroneTrailResetKey((prev) => prev + 1);
     // Clear the photo map to remove old photos
+    Object.values(photoMap).forEach((photo) =>
+      URL.revokeObjectURL(photo.thumbnail_url)
+    );
     setPhotoMap({});
     if (mapRef.current && typeof mapRef.current.clearAll === "function") {
       // Call clearAll but make sure drone position is preserved
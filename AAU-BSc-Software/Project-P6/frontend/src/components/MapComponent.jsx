@@ -8,6 +8,7 @@ import {
 import L from "leaflet";
 import "leaflet-draw";
 import DroneTracker from "./DroneTracker";
+import { useSocket } from "../context/SocketContext";
 import {
   Box,
   Button,
@@ -169,6 +170,8 @@ const MapComponent = forwardRef(
     // Modal state for grid image preview
     const [modalOpen, setModalOpen] = useState(false);
     const [modalImg, setModalImg] = useState(null);
+    const modalPhotoUrlRef = useRef(null); // Full-resolution photo fetched for the modal
+    const { fetchPhoto } = useSocket();
 
     useImperativeHandle(ref, () => ({
       fitBounds: (bounds) => {
@@ -530,7 +533,7 @@ const MapComponent = forwardRef(
             corner.lon,
           ]);
           // If a photo exists for this grid index, overlay the photo as an ImageOverlay
-          if (photoMap && photoMap[index] && photoMap[index].photo_base64) {
+          if (photoMap && photoMap[index] && photoMap[index].thumbnail_url) {
             const detected = !!photoMap[index].detected;
             const borderColor = detected ? "#4caf50" : "#f44336";
             // Compute bounds for the grid (SW and NE corners)
@@ -560,7 +563,7 @@ const MapComponent = forwardRef(
 
             // Add the image overlay (set pane here, do NOT call setPane)
             const imgOverlay = L.imageOverlay(
-              `data:image/jpeg;base64,${photoMap[index].photo_base64}`,
+              photoMap[index].thumbnail_url,
               bounds,
               {
                 opacity: 1,
@@ -572,7 +575,8 @@ const MapComponent = forwardRef(
             // Add click handler to open modal
             imgOverlay.on("click", () =>
               handleGridImageClick({
-                base64: photoMap[index].photo_base64,
+                url: photoMap[index].thumbnail_url,
+                content_id: photoMap[index].content_id,
                 filename: photoMap[index].filename,
                 detected: !!photoMap[index].detected,
               })
@@ -589,8 +593,8 @@ const MapComponent = forwardRef(
             // Add popup to the border rectangle (so clicking border or image works)
             borderRect.bindPopup(
               `<div style="text-align:center">
-                <img src="data:image/jpeg;base64,${
-                  photoMap[index].photo_base64
+                <img src="${
+                  photoMap[index].thumbnail_url
                 }" style="width:100%;max-width:800px;object-fit:cover;border-radius:4px;" />
                 <div style="font-size:11px;color:#555;margin-top:4px;">
                   Detected: ${detected ? "Yes" : "No"}
@@ -855,10 +859,26 @@ const MapComponent = forwardRef(
     const handleGridImageClick = (imgData) => {
       setModalImg(imgData);
       setModalOpen(true);
+      // Show the thumbnail right away and swap in the full photo once it arrives
+      fetchPhoto(imgData.content_id)
+        .then((url) => {
+          if (modalPhotoUrlRef.current) URL.revokeObjectURL(modalPhotoUrlRef.current);
+          modalPhotoUrlRef.current = url;
+          setModalImg((current) =>
+            current && current.content_id === imgData.content_id
+              ? { ...current, url }
+              : current
+          );
+        })
+        .catch((error) => console.error("Could not fetch photo:", error));
     };
     const handleModalClose = () => {
       setModalOpen(false);
       setModalImg(null);
+      if (modalPhotoUrlRef.current) {
+        URL.revokeObjectURL(modalPhotoUrlRef.current);
+        modalPhotoUrlRef.current = null;
+      }
     };
 
     return (
@@ -1112,7 +1132,7 @@ const MapComponent = forwardRef(
             {modalImg && (
               <>
                 <img
-                  src={`data:image/jpeg;base64,${modalImg.base64}`}
+                  src={modalImg.url}
                   alt={modalImg.filename}
                   style={{
                     maxWidth: "80vw",
@@ -15,6 +15,7 @@ import DescriptionIcon from "@mui/icons-material/Description";
 import InsertDriveFileIcon from "@mui/icons-material/InsertDriveFile";
 import CheckCircleIcon from "@mui/icons-material/CheckCircle";
 import MissionMap from "./MissionMap";
+import { useSocket, photoUrl } from "../../context/SocketContext";
 
 function formatLogTimestamp(ts) {
   if (!ts) return "";
@@ -30,27 +31,64 @@ function formatLogTimestamp(ts) {
   );
 }
 
-function MissionImages({ images }) {
+function MissionImages({ mission, photos, pageSize }) {
+  const { emitEvent, fetchMissionPhoto } = useSocket();
   const [open, setOpen] = React.useState(false);
   const [modalIdx, setModalIdx] = React.useState(null);
+  const [modalUrl, setModalUrl] = React.useState(null);
+  const [thumbnails, setThumbnails] = React.useState({}); // photo index -> object URL
+  const [pagesLoaded, setPagesLoaded] = React.useState(0);
+  const [pageLoading, setPageLoading] = React.useState(false);
+  const missionRef = React.useRef(mission);
+  const thumbnailUrlsRef = React.useRef([]);
+  const sentinelRef = React.useRef(null);
+  const pages = Math.ceil(photos.length / pageSize);
 
-  // Only originals (not _detected)
-  const originals = images.filter(
-    (img) => img.filename && !img.filename.includes("_detected")
-  );
-  // Sort originals by number in filename
-  const sortedOriginals = [...originals].sort((a, b) => {
-    const getNum = (img) => {
-      const match = img.filename.match(/(\d+)(?=[^0-9]*\.jpg$)/i);
-      return match ? parseInt(match[1], 10) : 0;
+  // Start over for another mission and free the previous thumbnails
+  React.useEffect(() => {
+    missionRef.current = mission;
+    setThumbnails({});
+    setPagesLoaded(0);
+    return () => {
+      thumbnailUrlsRef.current.forEach((url) => URL.revokeObjectURL(url));
+      thumbnailUrlsRef.current = [];
     };
-    return getNum(a) - getNum(b);
-  });
-  // Find detected version for a filename
-  const getDetected = (filename) => {
-    const detectedName = filename.replace(/\.jpg$/i, "_detected.jpg");
-    return images.find((img) => img.filename === detectedName);
-  };
+  }, [mission]);
+
+  const loadNextPage = React.useCallback(() => {
+    if (pageLoading || pagesLoaded >= pages) return;
+    setPageLoading(true);
+    emitEvent("get_completed_mission_thumbnails", {
+      mission,
+      page: pagesLoaded,
+      page_size: pageSize,
+    })
+      .then((res) => {
+        if (missionRef.current !== mission) return;
+        const urls = {};
+        res.thumbnails.forEach((item) => {
+          if (item.thumbnail) {
+            urls[item.index] = photoUrl(item.thumbnail);
+            thumbnailUrlsRef.current.push(urls[item.index]);
+          }
+        });
+        setThumbnails((prev) => ({ ...prev, ...urls }));
+        setPagesLoaded((loaded) => loaded + 1);
+      })
+      .catch((err) => console.error("Could not load thumbnails:", err))
+      .finally(() => setPageLoading(false));
+  }, [emitEvent, mission, pageSize, pages, pagesLoaded, pageLoading]);
+
+  // Load the next page of thumbnails while the end of the grid is in view
+  React.useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!sentinel) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) loadNextPage();
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [loadNextPage]);
 
   // Open modal for image at idx
   const handleOpen = (idx) => {
@@ -62,16 +100,35 @@ function MissionImages({ images }) {
   // Modal navigation
   const handlePrev = () => setModalIdx((idx) => (idx > 0 ? idx - 1 : idx));
   const handleNext = () =>
-    setModalIdx((idx) => (idx < sortedOriginals.length - 1 ? idx + 1 : idx));
+    setModalIdx((idx) => (idx < photos.length - 1 ? idx + 1 : idx));
 
-  // Current image in modal (show detected if exists)
-  const modalOriginal = modalIdx !== null ? sortedOriginals[modalIdx] : null;
-  const modalImg =
-    modalOriginal &&
-    modalOriginal.filename &&
-    getDetected(modalOriginal.filename)
-      ? getDetected(modalOriginal.filename)
-      : modalOriginal;
+  // Current photo in modal (show detected if exists)
+  const modalPhoto = modalIdx !== null ? photos[modalIdx] : null;
+  const modalFilename = modalPhoto
+    ? modalPhoto.detected_filename || modalPhoto.filename
+    : null;
+
+  // Show the thumbnail in the modal until the full photo has arrived
+  React.useEffect(() => {
+    if (!open || !modalFilename) return;
+    let cancelled = false;
+    let url = null;
+    setModalUrl(null);
+    fetchMissionPhoto(mission, modalFilename)
+      .then((fetched) => {
+        if (cancelled) {
+          URL.revokeObjectURL(fetched);
+        } else {
+          url = fetched;
+          setModalUrl(fetched);
+        }
+      })
+      .catch((err) => console.error("Could not fetch photo:", err));
+    return () => {
+      cancelled = true;
+      if (url) URL.revokeObjectURL(url);
+    };
+  }, [open, mission, modalFilename, fetchMissionPhoto]);
 
   return (
     <>
@@ -87,12 +144,13 @@ function MissionImages({ images }) {
           alignItems: "flex-start",
         }}
       >
-        {sortedOriginals.length > 0 ? (
-          sortedOriginals.map((img, idx) => {
-            const detected = getDetected(img.filename);
+        {photos.length > 0 ? (
+          photos.map((photo, idx) => {
+            const detected = !!photo.detected_filename;
+            const thumbnail = thumbnails[photo.index];
             return (
               <Paper
-                key={img.filename || idx}
+                key={photo.filename || idx}
                 elevation={1}
                 sx={{
                   p: 1,
@@ -114,11 +172,11 @@ function MissionImages({ images }) {
                 }}
                 onClick={() => handleOpen(idx)}
               >
-                {img.base64 ? (
+                {thumbnail ? (
                   <Box
                     component="img"
-                    src={`data:image/jpeg;base64,${img.base64}`}
-                    alt={img.filename}
+                    src={thumbnail}
+                    alt={photo.filename}
                     sx={{
                       width: "100%",
                       height: 120,
@@ -146,7 +204,7 @@ function MissionImages({ images }) {
                     textAlign: "center",
                   }}
                 >
-                  {img.filename}
+                  {photo.filename}
                 </Typography>
                 {detected && (
                   <Box
@@ -169,11 +227,6 @@ function MissionImages({ images }) {
                     Detected
                   </Box>
                 )}
-                {img.error && (
-                  <Typography variant="caption" color="error" sx={{ mt: 0.5 }}>
-                    {img.error}
-                  </Typography>
-                )}
               </Paper>
             );
           })
@@ -183,6 +236,13 @@ function MissionImages({ images }) {
           </Typography>
         )}
       </Box>
+      {/* Reaching this loads the next page of thumbnails */}
+      <Box
+        ref={sentinelRef}
+        sx={{ display: "flex", justifyContent: "center", minHeight: 8, mt: 2 }}
+      >
+        {pageLoading && <CircularProgress size={24} />}
+      </Box>
       <Modal open={open} onClose={handleClose}>
         <Box
           sx={{
@@ -224,55 +284,51 @@ function MissionImages({ images }) {
                 alignItems: "center",
               }}
             >
-              {modalImg && modalImg.base64 && (
+              {modalPhoto && (modalUrl || thumbnails[modalPhoto.index]) && (
                 <img
-                  src={`data:image/jpeg;base64,${modalImg.base64}`}
-                  alt={modalImg.filename}
+                  src={modalUrl || thumbnails[modalPhoto.index]}
+                  alt={modalFilename}
                   style={{
                     maxWidth: "80vw",
                     maxHeight: "80vh",
                     borderRadius: 8,
                     marginBottom: 8,
                     border:
-                      modalOriginal &&
-                      modalOriginal.filename &&
-                      getDetected(modalOriginal.filename)
+                      modalPhoto && modalPhoto.detected_filename
                         ? "4px solid #e53935"
                         : "1px solid #e0e0e0",
                     boxSizing: "border-box",
                   }}
                 />
               )}
-              <Typography variant="caption">{modalImg?.filename}</Typography>
-              {modalOriginal &&
-                modalOriginal.filename &&
-                getDetected(modalOriginal.filename) && (
-                  <Box
-                    sx={{
-                      mt: 1,
-                      bgcolor: "#e53935",
-                      color: "white",
-                      px: 2,
-                      py: 0.5,
-                      borderRadius: 1,
-                      fontWeight: 600,
-                      fontSize: 14,
-                      letterSpacing: 0.5,
-                    }}
-                  >
-                    Detected version shown
-                  </Box>
-                )}
+              <Typography variant="caption">{modalFilename}</Typography>
+              {modalPhoto && modalPhoto.detected_filename && (
+                <Box
+                  sx={{
+                    mt: 1,
+                    bgcolor: "#e53935",
+                    color: "white",
+                    px: 2,
+                    py: 0.5,
+                    borderRadius: 1,
+                    fontWeight: 600,
+                    fontSize: 14,
+                    letterSpacing: 0.5,
+                  }}
+                >
+                  Detected version shown
+                </Box>
+              )}
             </Box>
             {/* Right arrow */}
             <Button
               onClick={handleNext}
-              disabled={modalIdx === sortedOriginals.length - 1}
+              disabled={modalIdx === photos.length - 1}
               sx={{
                 minWidth: 0,
                 px: 1,
                 visibility:
-                  modalIdx === sortedOriginals.length - 1
+                  modalIdx === photos.length - 1
                     ? "hidden"
                     : "visible",
               }}
@@ -322,10 +378,14 @@ export default function SelectedMission({
               >
                 <ImageIcon color="primary" sx={{ mr: 1 }} />
                 <Typography variant="h6" sx={{ fontWeight: 600 }}>
-                  Images ({missionData.images?.length || 0})
+                  Images ({missionData.photos?.length || 0})
                 </Typography>
               </Paper>
-              <MissionImages images={missionData.images || []} />
+              <MissionImages
+                mission={missionData.mission_name}
+                photos={missionData.photos || []}
+                pageSize={missionData.page_size}
+              />
             </Grid>
             {/* Log */}
             <Grid item xs={12} md={5}>
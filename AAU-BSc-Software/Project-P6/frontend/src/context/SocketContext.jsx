@@ -11,6 +11,11 @@ const SocketContext = createContext(undefined);
 
 const SOCKET_URL = import.meta.env.VITE_SOCKET_URL || "http://localhost:5000";
 
+// Photos arrive as binary attachments (ArrayBuffer); show them through object URLs
+export function photoUrl(bytes) {
+  return URL.createObjectURL(new Blob([bytes], { type: "image/jpeg" }));
+}
+
 export function SocketProvider({ children }) {
   const socketRef = useRef(null);
   const [connected, setConnected] = useState(false);
@@ -19,7 +24,7 @@ export function SocketProvider({ children }) {
   const [gpsSignal, setGpsSignal] = useState(null);
   const [motionState, setMotionState] = useState(null);
   const [batteryPercent, setBatteryPercent] = useState(null);
-  const [latestPhotoBase64, setLatestPhotoBase64] = useState(null);
+  const [latestPhotoUrl, setLatestPhotoUrl] = useState(null);
   const [latestPhotoDetected, setLatestPhotoDetected] = useState(false);
 
   useEffect(() => {
@@ -117,22 +122,23 @@ export function SocketProvider({ children }) {
       // Accept both array and single object for robustness
       let photo = null;
       if (Array.isArray(data)) {
-        if (data.length > 0 && data[0].photo_base64) {
+        if (data.length > 0 && data[0].thumbnail) {
           console.log("Updating image (array)");
           photo = data[0];
         }
-      } else if (data && typeof data === "object" && data.photo_base64) {
+      } else if (data && typeof data === "object" && data.thumbnail) {
         console.log("Updating image (object)");
         photo = data;
       } else {
-        console.log(
-          "photo_update received but no valid photo_base64 found",
-          data
-        );
+        console.log("photo_update received but no thumbnail found", data);
       }
 
-      if (photo && photo.photo_base64) {
-        setLatestPhotoBase64(photo.photo_base64);
+      if (photo && photo.thumbnail) {
+        const url = photoUrl(photo.thumbnail);
+        setLatestPhotoUrl((previous) => {
+          if (previous) URL.revokeObjectURL(previous);
+          return url;
+        });
         setLatestPhotoDetected(!!photo.detected);
       }
     }
@@ -216,6 +222,35 @@ export function SocketProvider({ children }) {
     async () => emitEvent("disconnect_drone", {}),
     [emitEvent]
   );
+  // Full-resolution photo of a photo_update as an object URL (revoke it when done)
+  const fetchPhoto = React.useCallback(
+    async (contentId) => {
+      const response = await emitEvent("get_photo", { content_id: contentId });
+      return photoUrl(response.photo);
+    },
+    [emitEvent]
+  );
+  // Full-resolution photo of a completed mission, fetched range by range, as an object URL
+  const fetchMissionPhoto = React.useCallback(
+    async (mission, filename) => {
+      const parts = [];
+      let offset = 0;
+      let size = Infinity;
+      while (offset < size) {
+        const part = await emitEvent("get_completed_mission_photo", {
+          mission,
+          filename,
+          offset,
+        });
+        if (part.data.byteLength === 0) break;
+        parts.push(part.data);
+        size = part.size;
+        offset += part.data.byteLength;
+      }
+      return URL.createObjectURL(new Blob(parts, { type: "image/jpeg" }));
+    },
+    [emitEvent]
+  );
 
   const contextValue = React.useMemo(
     () => ({
@@ -226,13 +261,15 @@ export function SocketProvider({ children }) {
       gpsSignal,
       motionState,
       batteryPercent,
-      latestPhotoBase64,
+      latestPhotoUrl,
       latestPhotoDetected,
       emitEvent,
       calculateGrid,
       executeFlight,
       connectDrone,
       disconnectDrone,
+      fetchPhoto,
+      fetchMissionPhoto,
     }),
     [
       connected,
@@ -241,13 +278,15 @@ export function SocketProvider({ children }) {
       gpsSignal,
       motionState,
       batteryPercent,
-      latestPhotoBase64,
+      latestPhotoUrl,
       latestPhotoDetected,
       emitEvent,
       calculateGrid,
       executeFlight,
       connectDrone,
       disconnectDrone,
+      fetchPhoto,
+      fetchMissionPhoto,
     ]
   );
 